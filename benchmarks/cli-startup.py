@@ -0,0 +1,57 @@
+"""
+Startup time of the `kpop-shorts` CLI per subcommand, against a bare
+interpreter and the import cost of the heavy optional dependencies the
+subcommands load lazily.
+
+    python benchmarks/cli-startup.py [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("python (bare interpreter)", ["-c", "pass"]),
+    ("kpop-shorts --help", ["-m", "kpop_shorts", "--help"]),
+    ("kpop-shorts split --help", ["-m", "kpop_shorts", "split", "--help"]),
+    ("kpop-shorts compare --help", ["-m", "kpop_shorts", "compare", "--help"]),
+    ("import kpop_shorts.spliter", ["-c", "import kpop_shorts.cli, kpop_shorts.spliter"]),
+    ("import kpop_shorts.comparer", ["-c", "import kpop_shorts.cli, kpop_shorts.comparer"]),
+    ("import pandas (old spliter/comparer)", ["-c", "import pandas"]),
+    ("import bs4", ["-c", "import bs4"]),
+    ("import pytubefix", ["-c", "import pytubefix"]),
+    ("import requests", ["-c", "import requests"])
+]
+
+def time_command(args, runs: int):
+    """Median wall time in ms, or None if the command fails (e.g. module not installed)"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, *args], cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            return None
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    baseline = None
+    for name, command in CASES:
+        median = time_command(command, args.runs)
+        if median is None:
+            print(f"{name:<40} not installed")
+            continue
+        if baseline is None:
+            baseline = median
+        print(f"{name:<40}{median:8.1f} ms  (+{median - baseline:.1f} ms over bare python)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Collaboration graph: full build vs incremental update after a fetch, state
+load time, and the cost of centrality and community detection.
+
+    python benchmarks/collab-graph.py [DATASET] [--new N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kpop_shorts.graph import CollaborationGraph, Roster, node_metrics
+from kpop_shorts.model import load_dataset
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dataset", nargs="?", default=os.path.join(ROOT, "data-processed", "v1-kpop-challenge-shorts.json"))
+    parser.add_argument("--groups", default=os.path.join(ROOT, "data-original", "kpop-group.csv"))
+    parser.add_argument("--idols", default=os.path.join(ROOT, "data-original", "kpop-idol.csv"))
+    parser.add_argument("--new", type=int, default=200, help="Shorts left out of the first build")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    roster = Roster(args.groups, args.idols)
+    print(f"roster: {len(roster)} nodes in {(time.perf_counter() - start) * 1000:.1f} ms")
+    shorts = [(name, short) for name, group in load_dataset(args.dataset).items() for short in group.shorts]
+
+    start = time.perf_counter()
+    full = CollaborationGraph(roster)
+    added, _, _ = full.ingest(shorts)
+    print(f"full build: {len(shorts)} shorts ({added} with collaborations) in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        partial = CollaborationGraph(roster)
+        partial.ingest(shorts[:-args.new])
+        partial.save(tmp)
+        start = time.perf_counter()
+        partial = CollaborationGraph.load(tmp, roster)
+        print(f"load state: {(time.perf_counter() - start) * 1000:.1f} ms")
+        start = time.perf_counter()
+        added, updated, _ = partial.ingest(shorts)
+        print(f"incremental update: {added} new, {updated} re-counted in {(time.perf_counter() - start) * 1000:.1f} ms")
+        assert (partial.counts != full.counts).nnz == 0 and (partial.views != full.views).nnz == 0
+
+        # The oldest shorts drop out of the dataset: an update must match a fresh build without them
+        remaining = shorts[args.new:]
+        start = time.perf_counter()
+        _, _, removed = partial.ingest(remaining)
+        print(f"removal update: {removed} retracted in {(time.perf_counter() - start) * 1000:.1f} ms")
+        fresh = CollaborationGraph(roster)
+        fresh.ingest(remaining)
+        assert (partial.counts != fresh.counts).nnz == 0 and (partial.views != fresh.views).nnz == 0
+
+    start = time.perf_counter()
+    metrics = node_metrics(full)
+    print(f"metrics: {metrics['edges']} edges, {metrics['communities']} communities "
+          f"(modularity {metrics['modularity']:.3f}) in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Comment harvesting against a local stand-in for the commentThreads API:
+wall time per worker count under a simulated API latency, then an
+incremental re-run that should only cost one request per video.
+
+    python benchmarks/comment-harvest.py [--videos N] [--latency SECONDS]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def comment_count(video_id: str) -> int:
+    return zlib.crc32(video_id.encode()) % 7 * 60 + 5
+
+def fake_thread(video_id: str, index: int, total: int):
+    """Thread `index` of a video, newest first: index 0 is the latest comment"""
+    published = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1_700_000_000 + (total - index) * 60))
+    snippet = {"authorDisplayName": f"user{index}", "authorChannelId": {"value": f"UC{index:022d}"},
+               "textOriginal": f"comment {index} on {video_id}", "likeCount": index % 13,
+               "publishedAt": published, "updatedAt": published}
+    return {"id": f"{video_id}.{index}", "snippet": {"topLevelComment": {"id": f"{video_id}.{index}", "snippet": snippet},
+                                                     "totalReplyCount": 0}}
+
+def make_handler(latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            video_id = query["videoId"]
+            total = comment_count(video_id)
+            start = int(query.get("pageToken", 0))
+            end = min(start + int(query.get("maxResults", 20)), total)
+            body = {"items": [fake_thread(video_id, i, total) for i in range(start, end)]}
+            if end < total:
+                body["nextPageToken"] = str(end)
+            time.sleep(latency)
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated API latency per request")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["YOUTUBE_API_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+
+    from kpop_shorts.comments import CommentHarvester, open_store
+    from kpop_shorts.metrics import REGISTRY
+    from kpop_shorts.youtube import LIMITER
+
+    LIMITER.set_rate(0)  # The stand-in API has no rate limit to respect
+
+    targets = [(f"v{i}", "GROUP") for i in range(args.videos)]
+    expected = sum(comment_count(video_id) for video_id, _ in targets)
+    print(f"{args.videos} videos, {expected} comment threads, {args.latency * 1000:.0f} ms per request")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in (1, 4, 8, 16):
+            store = open_store(os.path.join(tmp, f"comments-{workers}.sqlite"))
+            harvester = CommentHarvester(store, "test-key", max_per_video=1000)
+            before = REGISTRY.totals()["requests"]
+            start = time.perf_counter()
+            summary = harvester.run(targets, workers)
+            elapsed = time.perf_counter() - start
+            sent = REGISTRY.totals()["requests"] - before
+            print(f"workers={workers:<3} {elapsed:7.2f} s  {sent:5d} requests  {summary['threads']} threads")
+
+            start = time.perf_counter()
+            summary = harvester.run(targets, workers)
+            sent = REGISTRY.totals()["requests"] - before - sent
+            print(f"  incremental re-run {time.perf_counter() - start:7.2f} s  {sent:5d} requests  {summary['threads']} new threads")
+            store.close()
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Entity resolution: how many name comparisons the trigram-blocked index
+makes, and how long resolving takes, as the number of groups grows,
+against comparing every name with every alias.
+
+    python benchmarks/entity-resolution.py [--sizes 1000 10000 50000] [--queries N]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kpop_shorts.entities import GROUP, EntityIndex, group_id
+
+# Romanized-Korean-looking syllables: onset, vowel, optional coda
+SYLLABLES = [onset + vowel + coda for onset in ["", "b", "ch", "d", "g", "h", "j", "k", "m", "n", "p", "r", "s", "t", "y", "z"]
+             for vowel in ["a", "e", "i", "o", "u", "ae", "eo", "eu", "ye", "yo"] for coda in ["", "n", "ng", "l", "m", "k"]]
+
+def synthetic_names(count: int, rng: random.Random):
+    names = set()
+    while len(names) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+        names.add(name.upper() if rng.random() < 0.3 else name.capitalize())
+    return sorted(names)
+
+def misspell(name: str, rng: random.Random) -> str:
+    """The kind of variant seen in hashtags and channel titles: case, spacing, a typo"""
+    chars = list(name.lower())
+    position = rng.randrange(len(chars))
+    edit = rng.choice(["swap", "drop", "replace", "space"])
+    if edit == "swap" and position < len(chars) - 1:
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    elif edit == "drop" and len(chars) > 4:
+        del chars[position]
+    elif edit == "replace":
+        chars[position] = rng.choice(string.ascii_lowercase)
+    else:
+        chars.insert(position, " ")
+    return "".join(chars)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        names = synthetic_names(size, rng)
+        start = time.perf_counter()
+        index = EntityIndex()
+        for name in names:
+            index.add(group_id(name), GROUP, name)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        queries = [(name, misspell(name, rng)) for name in rng.sample(names, min(args.queries, len(names)))]
+        index.comparisons = 0
+        correct = unresolved = 0
+        start = time.perf_counter()
+        for name, query in queries:
+            match = index.resolve(query)
+            if match is None:
+                unresolved += 1
+            elif match.entity_id == group_id(name):
+                correct += 1
+        resolve_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        wrong = len(queries) - correct - unresolved
+        print(f"{size:>7} groups: build {build_ms:8.1f} ms, resolve {resolve_ms:6.3f} ms/name, "
+              f"{index.comparisons / len(queries):7.1f} comparisons/name vs {size} all-pairs; "
+              f"{correct} right, {wrong} wrong, {unresolved} unresolved of {len(queries)}")
+
+if __name__ == "__main__":
+    main()
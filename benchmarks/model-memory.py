@@ -0,0 +1,82 @@
+"""
+Compare the memory retained by a loaded shorts dataset when it is kept as
+plain dicts (json.load) versus the kpop_shorts.model Short/Group classes.
+
+Each variant runs in a fresh interpreter so the measurements don't share
+allocator state.
+
+    python benchmarks/model-memory.py [dataset.json ...]
+"""
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_PATHS = [
+    "data-processed/v0-kpop-challenge-shorts.json",
+    "data-processed/v1-kpop-challenge-shorts.json"
+]
+
+def current_rss() -> int:
+    """Resident set size in bytes (Linux), or 0 if unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+def measure(mode: str, path: str) -> dict:
+    from kpop_shorts.model import load_dataset
+
+    gc.collect()
+    rss_before = current_rss()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    if mode == "dict":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        data = load_dataset(path)
+
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = current_rss()
+
+    return {
+        "mode": mode,
+        "groups": len(data),
+        "seconds": elapsed,
+        "retained_bytes": retained,
+        "peak_bytes": peak,
+        "rss_delta_bytes": rss_after - rss_before
+    }
+
+def run_isolated(mode: str, path: str) -> dict:
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--measure", mode, path])
+    return json.loads(output)
+
+def main(paths):
+    for path in paths:
+        print(f"{path} ({os.path.getsize(path) / 1e6:.1f} MB on disk)")
+        results = {mode: run_isolated(mode, path) for mode in ("dict", "model")}
+        for mode, r in results.items():
+            print(f"  {mode:<6} retained {r['retained_bytes'] / 1e6:7.2f} MB  "
+                  f"peak {r['peak_bytes'] / 1e6:7.2f} MB  "
+                  f"rss +{r['rss_delta_bytes'] / 1e6:7.2f} MB  "
+                  f"load {r['seconds'] * 1000:7.1f} ms")
+        saved = 1 - results["model"]["retained_bytes"] / results["dict"]["retained_bytes"]
+        print(f"  model retains {saved:.1%} less memory than plain dicts\n")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--measure":
+        print(json.dumps(measure(sys.argv[2], sys.argv[3])))
+    else:
+        main(sys.argv[1:] or DEFAULT_PATHS)
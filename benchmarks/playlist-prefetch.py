@@ -0,0 +1,100 @@
+"""
+Channel crawl wall time with playlist page prefetch on and off, against a
+local stand-in for the playlistItems and videos APIs with simulated
+latency. Also checks that each run requests the same pages, so stopping
+at min_date still ends pagination at the date boundary.
+The client's pause between detail requests is set to 0, so the timings
+show only API latency.
+
+    python benchmarks/playlist-prefetch.py [--shorts N] [--page-latency S] [--details-latency S]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+NEWEST = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+def published(index: int) -> datetime:
+    """Upload time of the index-th newest short: one a day"""
+    return NEWEST - timedelta(days=index)
+
+def make_handler(total: int, page_latency: float, details_latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if url.path.endswith("/playlistItems"):
+                start = int(query.get("pageToken", 0))
+                end = min(start + int(query.get("maxResults", 50)), total)
+                body = {"items": [{
+                    "contentDetails": {"videoId": f"v{i:05d}"},
+                    "snippet": {"title": f"short {i}", "channelTitle": "GROUP",
+                                "publishedAt": published(i).strftime("%Y-%m-%dT%H:%M:%SZ")}
+                } for i in range(start, end)]}
+                if end < total:
+                    body["nextPageToken"] = str(end)
+                time.sleep(page_latency)
+            else:
+                body = {"items": [{"statistics": {"viewCount": "1000", "likeCount": "10", "commentCount": "1"},
+                                   "contentDetails": {"duration": "PT30S"},
+                                   "snippet": {"description": "#kpop #challenge"}}]}
+                time.sleep(details_latency)
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shorts", type=int, default=400, help="Shorts in the stand-in playlist")
+    parser.add_argument("--cutoff", type=int, default=300, help="min_date falls after this many shorts")
+    parser.add_argument("--page-latency", type=float, default=0.15)
+    parser.add_argument("--details-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.shorts, args.page_latency, args.details_latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["YOUTUBE_API_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+
+    from kpop_shorts import fetcher
+    from kpop_shorts.metrics import REGISTRY
+
+    fetcher.LIMITER.set_rate(0)  # The stand-in API has no rate limit to respect
+    min_date = published(args.cutoff) + timedelta(hours=12)
+    print(f"{args.shorts} shorts, min_date after {args.cutoff} of them; "
+          f"{args.page_latency * 1000:.0f} ms per page, {args.details_latency * 1000:.0f} ms per video")
+
+    baseline = None
+    for prefetch in (0, 1, 2, 4):
+        pages_before = REGISTRY.endpoint("playlistItems").requests
+        start = time.perf_counter()
+        shorts = fetcher.get_shorts_from_playlist("UUSHstandin", min_date, prefetch)
+        elapsed = time.perf_counter() - start
+        pages = REGISTRY.endpoint("playlistItems").requests - pages_before
+        baseline = baseline or elapsed
+        print(f"prefetch={prefetch}  {elapsed:6.2f} s  ({baseline / elapsed:4.2f}x)  {pages} pages  {len(shorts)} shorts")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
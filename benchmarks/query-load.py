@@ -0,0 +1,130 @@
+"""
+Load test for `kpop-shorts serve`: starts the server in a subprocess on a
+dataset, replays a mix of group / hashtag / date-range / sorted and paged
+queries from concurrent keep-alive clients, and reports throughput and
+latency percentiles with the response cache on and off.
+
+    python benchmarks/query-load.py [DATASET] [--seconds S] [--clients N]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kpop_shorts.model import load_dataset
+
+def build_queries(dataset_path: str, count: int, seed: int = 0):
+    """Query strings drawn from the dataset's own groups, hashtags and dates"""
+    dataset = load_dataset(dataset_path)
+    rng = random.Random(seed)
+    groups = list(dataset)
+    hashtags = sorted({tag for group in dataset.values() for short in group.shorts for tag in short.hashtags})
+    years = sorted({short.upload_time[:4] for group in dataset.values() for short in group.shorts})
+
+    queries = []
+    for _ in range(count):
+        params = {"dataset": "shorts", "sort": rng.choice(["-views", "-likes", "-comments", "-upload_time", "views"])}
+        kind = rng.random()
+        if kind < 0.4:
+            params["group"] = rng.choice(groups)
+        elif kind < 0.6:
+            params["hashtag"] = rng.choice(hashtags)
+        elif kind < 0.8:
+            year = rng.choice(years)
+            params["from"], params["to"] = f"{year}-01-01", f"{year}-06-30"
+            if rng.random() < 0.5:
+                params["group"] = rng.choice(groups)
+        params["limit"] = rng.choice([10, 20, 50])
+        params["offset"] = rng.choice([0, 0, 0, 20, 100])
+        queries.append("/shorts?" + urlencode(params))
+    return queries
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(dataset_path: str, cache_size: int):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "kpop_shorts", "serve", "--port", str(port), "--dataset", f"shorts={dataset_path}",
+         "--cache-size", str(cache_size), "--log-level", "WARNING"],
+        cwd=ROOT, stdout=subprocess.DEVNULL
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/datasets")
+            if json.loads(connection.getresponse().read()):
+                return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+def run_load(port: int, queries, seconds: float, clients: int):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+
+    def client(worker: int):
+        rng = random.Random(worker)
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        local = []
+        while time.perf_counter() < stop_at:
+            path = rng.choice(queries)
+            start = time.perf_counter()
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response_body = response.read()
+            local.append(time.perf_counter() - start)
+            if response.status != 200 or not response_body:
+                with lock:
+                    errors[0] += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dataset", nargs="?", default=os.path.join(ROOT, "data-processed", "v1-kpop-challenge-shorts.json"))
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=500, help="Distinct queries in the mix")
+    args = parser.parse_args()
+
+    queries = build_queries(args.dataset, args.queries)
+    for label, cache_size in (("cache on", 1024), ("cache off", 0)):
+        process, port = start_server(args.dataset, cache_size)
+        try:
+            latencies, errors = run_load(port, queries, args.seconds, args.clients)
+        finally:
+            process.terminate()
+            process.wait()
+        latencies.sort()
+        quantile = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+        print(f"{label:<10} {len(latencies) / args.seconds:8.0f} req/s  p50 {quantile(0.5):6.2f} ms  "
+              f"p95 {quantile(0.95):6.2f} ms  p99 {quantile(0.99):6.2f} ms  mean {statistics.mean(latencies) * 1000:6.2f} ms  "
+              f"errors {errors}")
+
+if __name__ == "__main__":
+    main()
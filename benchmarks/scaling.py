@@ -0,0 +1,195 @@
+"""
+Scaling of the post-processing stages on synthetic datasets: time and
+peak memory of `hashtags`, `split`, `wiki fix` and the group coverage
+check as the number of groups grows, so superlinear behaviour shows up
+before real crawls get that big.
+
+    python benchmarks/scaling.py [--groups 75 750 7500] [--output results.json] [--baseline results.json]
+
+Datasets come from kpop_shorts.synthetic with a fixed seed and are kept in
+--workdir between runs. Each stage runs in a fresh interpreter; peak memory
+is the growth of the peak resident set over the interpreter's size once
+the stage is set up (Linux). With --baseline, a stage more than --tolerance slower than
+in the baseline at the same size, or growing faster than --max-exponent
+(time ~ size^exponent) between sizes, is reported and the exit status is 1.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STAGES = ["hashtags", "split", "wiki-fix", "compare", "compare-resolved"]
+
+def current_rss() -> int:
+    """Resident set size in bytes (Linux), or 0 if unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+def reset_peak_rss():
+    """Start the peak resident set (VmHWM) over from the current size (Linux 4.0+)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def peak_rss() -> int:
+    """Peak resident set size in bytes since the last reset_peak_rss()"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def prepare(workdir: str, groups: int, seed: int) -> dict:
+    """Synthetic dataset, group CSV and wiki intros for `groups` groups, generated once per workdir"""
+    directory = os.path.join(workdir, f"seed{seed}-groups{groups}")
+    files = {name: os.path.join(directory, name) for name in ("shorts.json", "groups.csv", "wiki.json", "keys.json")}
+    if not all(os.path.exists(path) for path in files.values()):
+        from kpop_shorts.config import get_config
+        from kpop_shorts.model import save_dataset
+        from kpop_shorts.serialization import write_json
+        from kpop_shorts.synthetic import Generator, Profile
+
+        config = get_config()
+        os.makedirs(directory, exist_ok=True)
+        generator = Generator(Profile.fit(config.sample_shorts, config.sample_wiki), seed)
+        dataset = generator.dataset(groups, variant_rate=0.05)
+        save_dataset(dataset, files["shorts.json"])
+        generator.group_csv(groups, files["groups.csv"])
+        write_json(generator.wiki(groups), files["wiki.json"], pretty=True)
+        write_json({"keys": sorted(dataset), "shorts": sum(group.shorts_count for group in dataset.values())}, files["keys.json"])
+    with open(files["keys.json"], encoding="utf-8") as f:
+        meta = json.load(f)
+    return {"directory": directory, "groups": len(meta["keys"]), "shorts": meta["shorts"], **files}
+
+def run_stage(stage: str, directory: str) -> dict:
+    """Child process: set the stage up, then time it and measure its memory"""
+    path = lambda name: os.path.join(directory, name)
+    out = tempfile.mkdtemp()
+    if stage == "hashtags":
+        from kpop_shorts.hashtags import main as run
+        args = argparse.Namespace(input=path("shorts.json"), output=os.path.join(out, "processed.json"))
+        operation = lambda: run(args)
+    elif stage == "split":
+        from kpop_shorts.spliter import main as run
+        args = argparse.Namespace(input=path("shorts.json"), groups=path("groups.csv"),
+                                  challenge_output=os.path.join(out, "challenge.json"),
+                                  non_challenge_output=os.path.join(out, "non-challenge.json"))
+        operation = lambda: run(args)
+    elif stage == "wiki-fix":
+        from kpop_shorts.wiki_fixer import fix_json_formatting
+        shutil.copy(path("wiki.json"), os.path.join(out, "wiki.json"))
+        operation = lambda: fix_json_formatting(os.path.join(out, "wiki.json"))
+    else:
+        from kpop_shorts.comparer import compare_group_sets, read_csv_column
+        from kpop_shorts.entities import EntityIndex
+        with open(path("keys.json"), encoding="utf-8") as f:
+            keys = set(json.load(f)["keys"])
+        if stage == "compare":
+            operation = lambda: compare_group_sets(keys, read_csv_column(path("groups.csv"), "group (english)"))
+        else:
+            operation = lambda: compare_group_sets(keys, read_csv_column(path("groups.csv"), "group (english)"),
+                                                   EntityIndex.from_csv(path("groups.csv")))
+
+    reset_peak_rss()
+    rss_before = current_rss()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        operation()
+    seconds = time.perf_counter() - start
+    peak = peak_rss()
+    shutil.rmtree(out, ignore_errors=True)
+    return {"seconds": seconds, "peak_bytes": max(peak - rss_before, 0)}
+
+def check(results: list, baseline: dict, tolerance: float, max_exponent: float) -> list:
+    """Regressions against the baseline run and superlinear growth between sizes"""
+    problems = []
+    previous = {}
+    for result in results:
+        key = f"{result['stage']}@{result['groups']}"
+        before = baseline.get(key)
+        if before and result["seconds"] > before["seconds"] * (1 + tolerance) and result["seconds"] - before["seconds"] > 0.05:
+            problems.append(f"{key}: {result['seconds']:.3f} s vs {before['seconds']:.3f} s in the baseline")
+        # Stages finishing in milliseconds are too noisy to tell growth from jitter
+        last = previous.get(result["stage"])
+        if last and result["exponent"] is not None and result["exponent"] > max_exponent and result["seconds"] > 0.05:
+            problems.append(f"{key}: time grows as size^{result['exponent']:.2f} since {last['groups']} groups")
+        previous[result["stage"]] = result
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--groups", type=int, nargs="+", default=[75, 750, 7500], help="Dataset sizes in groups")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "kpop-shorts-scaling"),
+                        help="Where the generated datasets are kept between runs")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline")
+    parser.add_argument("--max-exponent", type=float, default=1.3, help="Allowed growth of time with size")
+    parser.add_argument("--stage", help=argparse.SUPPRESS)
+    parser.add_argument("--directory", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stage:
+        print(json.dumps(run_stage(args.stage, args.directory)))
+        return
+
+    datasets = []
+    for groups in sorted(args.groups):
+        start = time.perf_counter()
+        datasets.append(prepare(args.workdir, groups, args.seed))
+        print(f"{groups} groups: {datasets[-1]['shorts']} shorts ready in {time.perf_counter() - start:.1f} s")
+
+    results = []
+    print(f"\n{'stage':<18}{'groups':>8}{'shorts':>10}{'seconds':>10}{'peak MB':>10}{'exponent':>10}")
+    for stage in args.stages:
+        previous = None
+        for dataset in datasets:
+            output = subprocess.run([sys.executable, __file__, "--stage", stage, "--directory", dataset["directory"]],
+                                    check=True, capture_output=True, text=True).stdout
+            result = {"stage": stage, "groups": dataset["groups"], "shorts": dataset["shorts"], **json.loads(output)}
+            result["exponent"] = None
+            if previous and previous["seconds"] > 0.001:
+                result["exponent"] = (math.log(result["seconds"] / previous["seconds"])
+                                      / math.log(result["shorts"] / previous["shorts"]))
+            results.append(result)
+            previous = result
+            exponent = f"{result['exponent']:.2f}" if result["exponent"] is not None else "-"
+            print(f"{stage:<18}{result['groups']:>8}{result['shorts']:>10}{result['seconds']:>10.3f}"
+                  f"{result['peak_bytes'] / 1e6:>10.1f}{exponent:>10}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = {f"{result['stage']}@{result['groups']}": result for result in json.load(f)}
+    problems = check(results, baseline, args.tolerance, args.max_exponent)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
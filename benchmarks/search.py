@@ -0,0 +1,95 @@
+"""
+Full-text search index: build time and on-disk size, incremental update
+cost, and query latency against a linear substring scan over every title.
+
+    python benchmarks/search.py [DATASET ...] [--wiki PATH] [--queries N]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kpop_shorts.model import load_dataset
+from kpop_shorts.search import SearchIndex, short_documents, wiki_documents
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+def sample_queries(titles, count: int, seed: int = 0):
+    """Two- to three-word fragments of real titles, so both engines find matches"""
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        words = rng.choice(titles).split()
+        if len(words) >= 2:
+            start = rng.randrange(len(words) - 1)
+            queries.append(" ".join(words[start:start + rng.choice([1, 2, 3])]))
+    return queries
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("datasets", nargs="*", default=[
+        os.path.join(ROOT, "data-processed", "v0-kpop-challenge-shorts.json"),
+        os.path.join(ROOT, "data-processed", "v1-kpop-challenge-shorts.json")
+    ])
+    parser.add_argument("--wiki", default=os.path.join(ROOT, "wikipedia_data", "kpop_group_info_v1.json"))
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    titles = [short.title for path in args.datasets for group in load_dataset(path).values() for short in group.shorts]
+    queries = sample_queries(titles, args.queries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        full = os.path.join(tmp, "full")
+        start = time.perf_counter()
+        index = SearchIndex(full)
+        for path in args.datasets:
+            index.add(short_documents(path))
+        index.add(wiki_documents(args.wiki))
+        build_seconds = time.perf_counter() - start
+        input_bytes = sum(os.path.getsize(path) for path in args.datasets) + os.path.getsize(args.wiki)
+        print(f"{index.total_docs} documents, built in {build_seconds:.2f} s; "
+              f"index {directory_size(full) / 1e6:.2f} MB on disk vs {input_bytes / 1e6:.2f} MB of JSON")
+
+        documents = list(short_documents(args.datasets[-1]))
+        partial = SearchIndex(os.path.join(tmp, "partial"))
+        partial.add(documents[:-200])
+        start = time.perf_counter()
+        added = partial.add(documents)
+        print(f"incremental update of {added} new shorts: {(time.perf_counter() - start) * 1000:.1f} ms")
+        partial.close()
+
+        index.close()
+        start = time.perf_counter()
+        index = SearchIndex(full)
+        print(f"open index: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, 10)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"{'bm25 index':<14} p50 {statistics.median(timings) * 1000:7.3f} ms  "
+              f"p95 {timings[int(len(timings) * 0.95)] * 1000:7.3f} ms")
+        index.close()
+
+    folded = [title.casefold() for title in titles]
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        needle = query.casefold()
+        [title for title in folded if needle in title]
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"{'linear scan':<14} p50 {statistics.median(timings) * 1000:7.3f} ms  "
+          f"p95 {timings[int(len(timings) * 0.95)] * 1000:7.3f} ms  (substring match only, unranked)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+File size and serialize / parse time of the data-processed files in each
+format the serialization layer supports.
+
+    python benchmarks/serialization.py [dataset.json ...]
+"""
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kpop_shorts import serialization
+
+DEFAULT_PATHS = [
+    "data-processed/v0-kpop-challenge-shorts.json",
+    "data-processed/v1-kpop-challenge-shorts.json"
+]
+
+def best_of(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def count_lines(data: bytes) -> int:
+    return data.count(b"\n") + 1
+
+def formats():
+    """(name, serialize, parse) triples to compare"""
+    yield ("json indent=2 (old)",
+           lambda obj: json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"),
+           lambda data: json.loads(data))
+    yield ("json compact",
+           lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+           lambda data: json.loads(data))
+    if serialization.orjson is not None:
+        orjson = serialization.orjson
+        yield ("orjson compact", lambda obj: orjson.dumps(obj), lambda data: orjson.loads(data))
+        yield ("orjson indent=2", lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2), lambda data: orjson.loads(data))
+    yield (f"{serialization.BACKEND} compact + gzip",
+           lambda obj: gzip.compress(serialization.dumps(obj), compresslevel=6),
+           lambda data: serialization.loads(gzip.decompress(data)))
+    try:
+        serialization._zstd()
+    except ImportError:
+        return
+    yield (f"{serialization.BACKEND} compact + zstd",
+           lambda obj: serialization.compress(serialization.dumps(obj), ".zst"),
+           lambda data: serialization.loads(serialization.decompress(data, ".zst")))
+
+def main(paths):
+    for path in paths:
+        with open(path, "rb") as f:
+            raw = f.read()
+        obj = json.loads(raw)
+        print(f"{path}: {len(raw) / 1e6:.2f} MB, {count_lines(raw)} lines")
+        print(f"  {'format':<26}{'size':>10}{'lines':>9}{'dump ms':>10}{'load ms':>10}")
+        for name, dump, load in formats():
+            data = dump(obj)
+            assert load(data) == obj
+            dump_time = best_of(lambda: dump(obj))
+            load_time = best_of(lambda: load(data))
+            print(f"  {name:<26}{len(data) / 1e6:>8.2f}MB{count_lines(data):>9}"
+                  f"{dump_time * 1000:>10.1f}{load_time * 1000:>10.1f}")
+        print()
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_PATHS)
@@ -0,0 +1,82 @@
+"""
+Indexed JSONL store against the JSON dataset: cost of looking up one short
+(open + get vs parsing the whole file), lookups per second on an open
+store, and saving one group's fresh shorts (append vs load + rewrite).
+
+    python benchmarks/shortstore.py [DATASET] [--lookups N]
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kpop_shorts.model import load_dataset, save_dataset
+from kpop_shorts.shortstore import ShortStore, append_dataset, build_store
+
+def median_ms(function, runs: int = 9) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dataset", nargs="?", default=os.path.join(ROOT, "data-processed", "v0-kpop-challenge-shorts.json"))
+    parser.add_argument("--lookups", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "dataset.json")
+        shutil.copy(args.dataset, source)
+        start = time.perf_counter()
+        path = build_store(source)
+        print(f"build: {(time.perf_counter() - start) * 1000:.0f} ms; "
+              f"{os.path.getsize(path) / 1e6:.2f} MB JSONL + {os.path.getsize(path + '.idx') / 1e3:.0f} kB index "
+              f"vs {os.path.getsize(source) / 1e6:.2f} MB JSON")
+
+        dataset = load_dataset(source)
+        video_ids = [short.video_id for group in dataset.values() for short in group.shorts]
+        target = random.Random(0).choice(video_ids)
+
+        def json_lookup():
+            for group in load_dataset(source).values():
+                for short in group.shorts:
+                    if short.video_id == target:
+                        return short
+
+        def store_lookup():
+            with ShortStore(path) as store:
+                return store.get(target)
+
+        print(f"one lookup, JSON load + scan  {median_ms(json_lookup):8.2f} ms")
+        print(f"one lookup, store open + get  {median_ms(store_lookup):8.2f} ms")
+
+        sample = random.Random(1).choices(video_ids, k=args.lookups)
+        with ShortStore(path) as store:
+            start = time.perf_counter()
+            for video_id in sample:
+                store.get(video_id)
+            elapsed = time.perf_counter() - start
+        print(f"open store: {args.lookups / elapsed:,.0f} lookups/s ({elapsed / args.lookups * 1e6:.1f} us each)")
+
+        name = max(dataset, key=lambda group_name: dataset[group_name].shorts_count)
+        fresh = {name: dataset[name]}
+
+        def json_save():
+            combined = {**load_dataset(source), **fresh}
+            save_dataset(combined, source)
+
+        print(f"save {fresh[name].shorts_count} shorts of {name}: JSON load + rewrite {median_ms(json_save, 5):8.2f} ms, "
+              f"store append {median_ms(lambda: append_dataset(path, fresh), 5):8.2f} ms")
+
+if __name__ == "__main__":
+    main()
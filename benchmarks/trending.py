@@ -0,0 +1,82 @@
+"""
+Per-tick cost and memory of the trending detector's NumPy ring buffers
+against a dict of per-video deques doing the same velocity/acceleration
+ranking in Python.
+
+    python benchmarks/trending.py [--videos N] [--samples N] [--ticks N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from kpop_shorts.trending import ViewRing
+
+def python_ranking(history, top: int):
+    scored = []
+    for video_id, samples in history.items():
+        if len(samples) < 2:
+            continue
+        (t1, v1, _), (t0, v0, _) = samples[-1], samples[-2]
+        hours = max(t1 - t0, 1.0) / 3600
+        velocity = (v1 - v0) / hours
+        acceleration = 0.0
+        if len(samples) >= 3:
+            tm, vm, _ = samples[-3]
+            prior_hours = max(t0 - tm, 1.0) / 3600
+            acceleration = (velocity - (v0 - vm) / prior_hours) / ((hours + prior_hours) / 2)
+        scored.append((velocity, acceleration, video_id))
+    scored.sort(reverse=True)
+    return scored[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=20000)
+    parser.add_argument("--samples", type=int, default=48)
+    parser.add_argument("--ticks", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    video_ids = [f"video{i:06d}" for i in range(args.videos)]
+    growth = rng.gamma(1.0, 200.0, args.videos)
+    views_by_tick = [(growth * (tick + 1)).astype(np.int64) for tick in range(args.ticks)]
+    likes_by_tick = [views // 20 for views in views_by_tick]
+
+    tracemalloc.start()
+    ring = ViewRing(args.videos, args.samples)
+    rows = np.array([ring.track(video_id) for video_id in video_ids], dtype=np.int64)
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        ring.record(rows, tick * 1800.0, views_by_tick[tick], likes_by_tick[tick])
+        rates = ring.rates()
+        np.argsort(-rates["velocity"], kind="stable")[:50]
+    numpy_seconds = (time.perf_counter() - start) / args.ticks
+    _, numpy_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ring, rates
+
+    tracemalloc.start()
+    history = {video_id: deque(maxlen=args.samples) for video_id in video_ids}
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        views, likes = views_by_tick[tick].tolist(), likes_by_tick[tick].tolist()
+        for i, video_id in enumerate(video_ids):
+            history[video_id].append((tick * 1800.0, views[i], likes[i]))
+        python_ranking(history, 50)
+    python_seconds = (time.perf_counter() - start) / args.ticks
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{args.videos} videos x {args.samples} samples, {args.ticks} ticks")
+    print(f"{'numpy ring buffers':<22}{numpy_seconds * 1000:8.2f} ms/tick  peak {numpy_peak / 1e6:7.1f} MB")
+    print(f"{'dict of deques':<22}{python_seconds * 1000:8.2f} ms/tick  peak {python_peak / 1e6:7.1f} MB")
+
+if __name__ == "__main__":
+    main()
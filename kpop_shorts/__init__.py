@@ -0,0 +1,3 @@
+"""
+Shared helpers used by the K-pop shorts scripts.
+"""
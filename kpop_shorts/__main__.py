@@ -0,0 +1,3 @@
+from kpop_shorts.cli import main
+
+main()
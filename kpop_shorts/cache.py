@@ -0,0 +1,91 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from kpop_shorts.metrics import REGISTRY
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS video_details (
+    video_id TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    details TEXT NOT NULL
+)
+"""
+
+class VideoDetailsCache:
+    """
+    Memo of `get_video_details` results keyed by video_id: a bounded
+    in-memory LRU in front of an optional SQLite file that persists across
+    runs (and can be shared by workers). Entries older than max_age seconds
+    are treated as misses so view/like counts are refreshed.
+    Hits and misses are counted in the run metrics.
+    """
+    def __init__(self, path: Optional[str] = None, max_entries: int = 50000, max_age: float = 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+            self._conn.execute(SCHEMA)
+            self._conn.commit()
+
+    def _remember(self, video_id: str, fetched_at: float, details: Dict[str, Any]):
+        self._memory[video_id] = (fetched_at, details)
+        self._memory.move_to_end(video_id)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Cached details if present and fresh, else None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(video_id)
+            if entry is not None:
+                if now - entry[0] <= self.max_age:
+                    self._memory.move_to_end(video_id)
+                    REGISTRY.inc("video_cache_hits")
+                    return entry[1]
+                del self._memory[video_id]
+                REGISTRY.inc("video_cache_stale")
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT fetched_at, details FROM video_details WHERE video_id = ?", (video_id,)
+                ).fetchone()
+                if row is not None and now - row[0] <= self.max_age:
+                    details = json.loads(row[1])
+                    self._remember(video_id, row[0], details)
+                    REGISTRY.inc("video_cache_hits")
+                    REGISTRY.inc("video_cache_disk_hits")
+                    return details
+                if row is not None:
+                    REGISTRY.inc("video_cache_stale")
+
+            REGISTRY.inc("video_cache_misses")
+            return None
+
+    def put(self, video_id: str, details: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            self._remember(video_id, now, details)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO video_details (video_id, fetched_at, details) VALUES (?, ?, ?)",
+                    (video_id, now, json.dumps(details, ensure_ascii=False))
+                )
+                self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,229 @@
+"""
+`kpop-shorts` command line entry point.
+
+Only argparse and the path config are imported up front. Each subcommand
+names the module that implements it, and that module (with its heavy
+dependencies: requests, bs4, pytubefix, ...) is imported only when the
+subcommand actually runs.
+"""
+import argparse
+import importlib
+import sys
+from typing import List, Optional
+
+from kpop_shorts.config import get_config
+
+def _add_observability_arguments(parser: argparse.ArgumentParser):
+    """Logging / metrics / profiling flags, handled by kpop_shorts.metrics"""
+    group = parser.add_argument_group("observability")
+    group.add_argument("--log-level", default="INFO", help="Logging level (DEBUG, INFO, WARNING, ...)")
+    group.add_argument("--log-json", action="store_true", help="Emit logs as JSON lines")
+    group.add_argument("--report", metavar="PATH", help="Write a JSON run report to PATH")
+    group.add_argument("--prometheus", metavar="PATH", help="Write metrics in Prometheus text format to PATH")
+    group.add_argument("--profile", nargs="?", const="profile", metavar="DIR",
+                       help="Profile stages with cProfile/tracemalloc and dump summaries to DIR (default: ./profile)")
+
+def _command(subparsers, name: str, module: str, help_text: str, observability: bool = False) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(name, help=help_text, description=help_text)
+    parser.set_defaults(module=module, observability=observability)
+    if observability:
+        _add_observability_arguments(parser)
+    return parser
+
+def build_parser() -> argparse.ArgumentParser:
+    config = get_config()
+    parser = argparse.ArgumentParser(prog="kpop-shorts", description="K-pop YouTube shorts pipeline")
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    fetch = _command(subparsers, "fetch", "kpop_shorts.fetcher", "Fetch K-pop group shorts from YouTube", observability=True)
+    fetch.add_argument("--mode", choices=["single", "schedule", "coordinator", "worker", "merge"], default="single",
+                       help="single: fetch everything in this process; schedule: adaptive incremental polling; "
+                            "coordinator/worker/merge: sharded crawl through a shared queue")
+    fetch.add_argument("--csv", default=config.group_updated_csv, help="Group CSV with channel IDs")
+    fetch.add_argument("--output", default=config.shorts_data, help="Output JSON file (.json, .json.gz or .json.zst), or a .jsonl store appended to")
+    fetch.add_argument("--pretty", action="store_true", help="Indent the output JSON for reading by hand")
+    fetch.add_argument("--queue", default=config.crawl_queue, help="SQLite work queue on a filesystem shared by all workers")
+    fetch.add_argument("--shard-dir", default=config.shard_dir, help="Directory the workers write their shard files to")
+    fetch.add_argument("--worker-id", help="Worker name used for leases (default: hostname-pid)")
+    fetch.add_argument("--reset", action="store_true",
+                       help="coordinator: drop the previous crawl's work items and shards before queueing, to crawl again")
+    fetch.add_argument("--lease-seconds", type=float, default=300, help="Lease length; expired leases are requeued")
+    fetch.add_argument("--schedule-state", default=config.schedule_state, help="Polling state kept between scheduled runs")
+    fetch.add_argument("--quota-budget", type=int, default=0, help="Stop scheduled polling after this many quota units (0: no limit)")
+    fetch.add_argument("--max-polls", type=int, default=0, help="Stop scheduled polling after this many channels (0: no limit)")
+    fetch.add_argument("--min-interval-hours", type=float, default=6, help="Shortest poll interval for the busiest channels")
+    fetch.add_argument("--max-interval-days", type=float, default=30, help="Longest poll interval for dormant channels")
+    fetch.add_argument("--loop", action="store_true", help="Keep polling, sleeping until the next channel is due")
+    fetch.add_argument("--video-cache", default=config.video_cache,
+                       help="On-disk video details cache shared across channels and runs ('' to keep it in memory only)")
+    fetch.add_argument("--cache-max-age-hours", type=float, default=24, help="How long cached view/like counts stay fresh")
+    fetch.add_argument("--cache-size", type=int, default=50000, help="Entries kept in the in-memory LRU")
+    fetch.add_argument("--no-video-cache", action="store_true", help="Always query the API for video details")
+    fetch.add_argument("--prefetch-pages", type=int, default=2,
+                       help="Playlist pages fetched ahead while the current page's video details are looked up (0: serial)")
+    fetch.add_argument("--requests-per-second", type=float, default=2.0,
+                       help="API request rate shared by every thread of the process (0: unlimited)")
+    fetch.add_argument("--update-search-index", action="store_true",
+                       help="Add the newly fetched shorts to the full-text search index afterwards")
+
+    handles = _command(subparsers, "resolve-handles", "kpop_shorts.handles",
+                       "Resolve YouTube handles in the group CSV to channel IDs", observability=True)
+    handles.add_argument("--input", default=config.group_csv, help="Input group CSV")
+    handles.add_argument("--output", default=config.group_updated_csv, help="Output CSV with channel IDs")
+
+    hashtags = _command(subparsers, "hashtags", "kpop_shorts.hashtags", "Merge hashtags found in titles into each short's hashtags")
+    hashtags.add_argument("--input", default=config.shorts_data, help="Fetched shorts dataset")
+    hashtags.add_argument("--output", default=config.hashtag_processed, help="Output dataset")
+
+    split = _command(subparsers, "split", "kpop_shorts.spliter", "Split shorts into challenge and non-challenge datasets")
+    split.add_argument("--input", default=config.hashtag_processed, help="Hashtag-processed shorts dataset")
+    split.add_argument("--challenge-output", default=config.challenge_shorts, help="Challenge shorts output")
+    split.add_argument("--non-challenge-output", default=config.non_challenge_shorts, help="Non-challenge shorts output")
+    split.add_argument("--groups", default=config.group_csv,
+                       help="Group CSV the groups' canonical IDs are resolved against")
+
+    synth = _command(subparsers, "synth", "kpop_shorts.synthetic",
+                     "Generate a seeded synthetic shorts dataset fitted to the sample data", observability=True)
+    synth.add_argument("--groups", type=int, default=750, help="Number of groups (the real ones first, then made-up names)")
+    synth.add_argument("--shorts-per-group", type=int,
+                       help="Shorts per group (default: drawn from the sample data's distribution)")
+    synth.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same dataset")
+    synth.add_argument("--variant-rate", type=float, default=0.0,
+                       help="Share of groups keyed by a different spelling than the group CSV")
+    synth.add_argument("--fit", nargs="+", help="Datasets to fit the distributions to (default: the v0/v1 sample data)")
+    synth.add_argument("--wiki", default=config.sample_wiki, help="Wikipedia intros to draw paragraphs from")
+    synth.add_argument("--output", default=f"{config.data_processed}/synthetic-shorts.json", help="Output dataset")
+    synth.add_argument("--csv-output", help="Also write a group CSV (kpop-group.csv layout) for the groups")
+    synth.add_argument("--wiki-output", help="Also write Wikipedia intros (kpop_group_info layout) for the groups")
+
+    resolve = _command(subparsers, "resolve", "kpop_shorts.entities",
+                       "Resolve group or idol names (any spelling or romanization) to canonical IDs")
+    resolve.add_argument("names", nargs="+", help="Names to resolve")
+    resolve.add_argument("--kind", choices=["group", "idol"], default="group", help="Resolve as group or idol names")
+    resolve.add_argument("--groups", default=config.group_csv, help="Group CSV")
+    resolve.add_argument("--idols", default=config.idol_csv, help="Idol CSV")
+
+    compare = _command(subparsers, "compare", "kpop_shorts.comparer", "Check group coverage, or diff two shorts snapshots")
+    compare.add_argument("--shorts", default=config.shorts_data, help="Shorts dataset for the coverage check")
+    compare.add_argument("--groups", default=config.group_csv, help="Group CSV for the coverage check")
+    compare.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"),
+                         help="Diff two snapshots (.json dataset or .jsonl[.gz]) on video_id")
+    compare.add_argument("--delta", default=f"{config.data_processed}/delta.jsonl.gz",
+                         help="Where to write the delta records (JSON lines, gzipped if .gz)")
+    compare.add_argument("--summary", help="Also write the diff summary statistics to this JSON file")
+
+    comments = _command(subparsers, "comments", "kpop_shorts.comments",
+                        "Harvest comment threads of shorts into an append-only store", observability=True)
+    comments.add_argument("--input", default=config.challenge_shorts, help="Shorts dataset to harvest comments for")
+    comments.add_argument("--store", default=config.comments_store,
+                          help="Comment store: SQLite file, or JSON lines if the path ends in .jsonl")
+    comments.add_argument("--group", action="append", help="Only harvest these groups (repeatable)")
+    comments.add_argument("--min-comments", type=int, default=1,
+                          help="Skip shorts whose recorded comment count is below this")
+    comments.add_argument("--max-per-video", type=int, default=500, help="Most comment threads fetched per video per run")
+    comments.add_argument("--workers", type=int, default=4, help="Videos harvested concurrently")
+    comments.add_argument("--requests-per-second", type=float, default=2.0,
+                          help="API request rate shared by all workers (0: unlimited)")
+    comments.add_argument("--no-replies", action="store_true", help="Only store top-level comments")
+
+    trending = _command(subparsers, "trending", "kpop_shorts.trending",
+                        "Watch recent shorts and rank them by view velocity", observability=True)
+    trending.add_argument("--input", default=config.shorts_data, help="Shorts dataset to pick recent uploads from (reloaded when it changes)")
+    trending.add_argument("--output", default=config.trending, help="Ranked trending list, rewritten every tick")
+    trending.add_argument("--window-days", type=float, default=14, help="Track shorts uploaded within this many days")
+    trending.add_argument("--max-videos", type=int, default=5000, help="Most shorts tracked at once (newest first)")
+    trending.add_argument("--samples", type=int, default=48, help="Samples kept per short")
+    trending.add_argument("--interval-minutes", type=float, default=30, help="Time between samples")
+    trending.add_argument("--ticks", type=int, default=0, help="Stop after this many samples (0: run until interrupted)")
+    trending.add_argument("--top", type=int, default=50, help="Length of the trending list")
+    trending.add_argument("--write-back", action="store_true",
+                          help="Append the sampled view/like counts to --input (must be a .jsonl store)")
+    trending.add_argument("--compact-every", type=int, default=48,
+                          help="With --write-back, compact the store every this many ticks (0: never)")
+    trending.add_argument("--requests-per-second", type=float, default=2.0, help="API request rate (0: unlimited)")
+
+    graph = _command(subparsers, "graph", "kpop_shorts.graph",
+                     "Build the group/idol collaboration graph from challenge shorts", observability=True)
+    graph.add_argument("--input", default=config.challenge_shorts, help="Challenge shorts dataset")
+    graph.add_argument("--groups", default=config.group_csv, help="Group CSV (names, Korean and alternative names)")
+    graph.add_argument("--idols", default=config.idol_csv, help="Idol CSV")
+    graph.add_argument("--state", default=config.collab_state,
+                       help="Where the adjacency matrices are kept between runs, so only new shorts are added")
+    graph.add_argument("--rebuild", action="store_true", help="Ignore the saved state and build from scratch")
+    graph.add_argument("--output", default=config.collab_graph, help="GraphML (.graphml) or CSV edge list (any other extension)")
+    graph.add_argument("--metrics", default=config.collab_metrics, help="Node degree/centrality/community table (JSON)")
+
+    serve = _command(subparsers, "serve", "kpop_shorts.server",
+                     "Serve read-only queries over the shorts datasets on HTTP", observability=True)
+    serve.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    serve.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    serve.add_argument("--dataset", action="append", metavar="NAME=PATH",
+                       help="Dataset to serve as ?dataset=NAME (repeatable; default: shorts, challenge and non-challenge outputs)")
+    serve.add_argument("--cache-size", type=int, default=1024, help="Responses kept in the LRU cache (0 disables it)")
+    serve.add_argument("--max-limit", type=int, default=500, help="Largest page size a client may ask for")
+    serve.add_argument("--reload-interval", type=float, default=2.0,
+                       help="Seconds between checks for changed dataset files (0: never reload)")
+
+    search = _command(subparsers, "search", "kpop_shorts.search",
+                      "Full-text BM25 search over shorts titles, hashtags and Wikipedia intros")
+    search.add_argument("query", nargs="?", help="Free text, e.g. a song title in Korean")
+    search.add_argument("--index", default=config.search_index, help="Index directory")
+    search.add_argument("--update", action="store_true", help="Index shorts and intros that are new or changed since the last update")
+    search.add_argument("--rebuild", action="store_true", help="Delete the index and build it from scratch")
+    search.add_argument("--prune", action="store_true",
+                        help="With --update, also delete indexed shorts (and intros) no longer in the inputs")
+    search.add_argument("--input", action="append", help="Dataset to index (repeatable; default: hashtag-processed shorts)")
+    search.add_argument("--wiki", default=config.wiki_info, help="Wikipedia intros to index")
+    search.add_argument("--kind", choices=["short", "wiki"], help="Only return this kind of document")
+    search.add_argument("--top", type=int, default=10, help="Number of results")
+
+    store = _command(subparsers, "store", "kpop_shorts.shortstore",
+                     "Convert datasets to indexed JSONL stores, look up single shorts, compact stores")
+    store_actions = store.add_subparsers(dest="action", metavar="ACTION", required=True)
+    store_build = store_actions.add_parser("build", help="JSON dataset -> .jsonl + .idx (or reindex a .jsonl)")
+    store_build.add_argument("targets", nargs="*", help="Files to build (default: data-processed/*shorts*.json)")
+    store_get = store_actions.add_parser("get", help="Print shorts by video_id")
+    store_get.add_argument("targets", nargs="+", metavar="video_id", help="Video IDs to look up (after `--` if one starts with -)")
+    store_get.add_argument("--dataset", default=config.shorts_store, help="Store to look video IDs up in")
+    store_append = store_actions.add_parser("append", help="Append the groups and shorts of JSON datasets to a store")
+    store_append.add_argument("targets", nargs="+", metavar="dataset", help="Datasets to append")
+    store_append.add_argument("--dataset", default=config.shorts_store, help="Store to append to (created if missing)")
+    store_compact = store_actions.add_parser("compact", help="Drop superseded lines")
+    store_compact.add_argument("targets", nargs="*", help="Stores to compact (default: data-processed/*shorts*.jsonl)")
+
+    wiki = _command(subparsers, "wiki", "kpop_shorts.wiki", "Fetch Wikipedia introductions for K-pop groups", observability=True)
+    wiki.add_argument("action", nargs="?", choices=["fetch", "fix"], default="fetch",
+                      help="fetch: download and extract the intros; fix: only repair spacing in the saved JSON")
+    wiki.add_argument("--csv", default=config.group_csv, help="Group CSV")
+    wiki.add_argument("--output-dir", default=config.wikipedia_data, help="Output directory")
+    wiki.add_argument("--fix", action="store_true", help="Repair spacing in the saved JSON after fetching")
+
+    download = _command(subparsers, "download", "kpop_shorts.downloader", "Download a YouTube video")
+    download.add_argument("url", nargs="?", help="Video URL (prompted for if omitted)")
+    download.add_argument("--output-dir", default=config.videos, help="Where to save the video")
+
+    return parser
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    command = importlib.import_module(args.module)
+
+    try:
+        if not args.observability:
+            command.main(args)
+            return
+
+        from kpop_shorts import metrics
+        metrics.setup_from_args(args)
+        try:
+            command.main(args)
+        finally:
+            # Long-running commands (trending, fetch --loop) end with Ctrl-C;
+            # their report and profiles are still written
+            metrics.finish_from_args(args)
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from kpop_shorts.config import get_config
+from kpop_shorts.log import get_logger
+from kpop_shorts.metrics import REGISTRY
+from kpop_shorts.model import load_dataset
+from kpop_shorts.serialization import dumps, read_json, write_json
+from kpop_shorts.youtube import LIMITER, api_get
+
+logger = get_logger(__name__)
+
+# Largest page commentThreads returns
+PAGE_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS comments (
+    comment_id TEXT PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    group_name TEXT,
+    parent_id TEXT,
+    author TEXT,
+    author_channel_id TEXT,
+    text TEXT,
+    likes INTEGER NOT NULL DEFAULT 0,
+    reply_count INTEGER,
+    published_at TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS comments_video ON comments (video_id, published_at);
+CREATE TABLE IF NOT EXISTS harvest_state (
+    video_id TEXT PRIMARY KEY,
+    last_seen TEXT,
+    comments INTEGER NOT NULL DEFAULT 0,
+    harvested_at REAL NOT NULL
+);
+"""
+
+COLUMNS = ("comment_id", "video_id", "group_name", "parent_id", "author", "author_channel_id",
+           "text", "likes", "reply_count", "published_at", "updated_at")
+
+def comment_record(comment: Dict[str, Any], video_id: str, group: str, reply_count: Optional[int] = None) -> Dict[str, Any]:
+    """Flatten one API comment resource into a store record"""
+    snippet = comment["snippet"]
+    return {
+        "comment_id": comment["id"],
+        "video_id": video_id,
+        "group_name": group,
+        "parent_id": snippet.get("parentId"),
+        "author": snippet.get("authorDisplayName"),
+        "author_channel_id": (snippet.get("authorChannelId") or {}).get("value"),
+        "text": snippet.get("textOriginal", snippet.get("textDisplay", "")),
+        "likes": snippet.get("likeCount", 0),
+        "reply_count": reply_count,
+        "published_at": snippet["publishedAt"],
+        "updated_at": snippet.get("updatedAt")
+    }
+
+class SqliteCommentStore:
+    """
+    Comments in a SQLite file. Comment IDs are unique, so a video that is
+    harvested again after an interrupted run doesn't duplicate rows.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def append(self, records: List[Dict[str, Any]]):
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO comments ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                [tuple(record[column] for column in COLUMNS) for record in records]
+            )
+            self._conn.commit()
+
+    def last_seen(self, video_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT last_seen FROM harvest_state WHERE video_id = ?", (video_id,)).fetchone()
+        return row[0] if row else None
+
+    def mark_done(self, video_id: str, last_seen: Optional[str], count: int):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO harvest_state (video_id, last_seen, comments, harvested_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(video_id) DO UPDATE SET last_seen = COALESCE(excluded.last_seen, last_seen), "
+                "comments = comments + excluded.comments, harvested_at = excluded.harvested_at",
+                (video_id, last_seen, count, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+class JsonlCommentStore:
+    """
+    Comments appended to a JSON lines file, one record per line, with the
+    per-video harvest state in a `<path>.state.json` sidecar. A video that was
+    interrupted mid-harvest is fetched again on the next run, so readers
+    should treat comment_id as the key.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.state_path = path + ".state.json"
+        self._lock = threading.Lock()
+        try:
+            self._state: Dict[str, Dict[str, Any]] = read_json(self.state_path)
+        except FileNotFoundError:
+            self._state = {}
+        self._file = open(path, "ab")
+
+    def append(self, records: List[Dict[str, Any]]):
+        data = b"".join(dumps(record) + b"\n" for record in records)
+        with self._lock:
+            self._file.write(data)
+            self._file.flush()
+
+    def last_seen(self, video_id: str) -> Optional[str]:
+        with self._lock:
+            return self._state.get(video_id, {}).get("last_seen")
+
+    def mark_done(self, video_id: str, last_seen: Optional[str], count: int):
+        with self._lock:
+            entry = self._state.setdefault(video_id, {"last_seen": None, "comments": 0})
+            entry["last_seen"] = last_seen or entry["last_seen"]
+            entry["comments"] += count
+            entry["harvested_at"] = time.time()
+            write_json(self._state, self.state_path)
+
+    def close(self):
+        self._file.close()
+
+def open_store(path: str):
+    """JSON lines store for .jsonl paths, SQLite otherwise"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.endswith(".jsonl"):
+        return JsonlCommentStore(path)
+    return SqliteCommentStore(path)
+
+class CommentHarvester:
+    """
+    Pages through commentThreads for a set of videos on a bounded thread
+    pool. Each page is written to the store as soon as it arrives, so memory
+    use doesn't grow with the number of comments.
+
+    Threads are requested newest first; on later runs a video's paging stops
+    at the newest comment seen last time, so only new threads cost quota.
+    Replies added to an already harvested thread are not picked up.
+    """
+    def __init__(self, store, api_key: Optional[str], max_per_video: int = 500, include_replies: bool = True):
+        self.store = store
+        self.api_key = api_key
+        self.max_per_video = max_per_video
+        self.include_replies = include_replies
+        self._stop = threading.Event()
+
+    def harvest_video(self, video_id: str, group: str) -> int:
+        """Fetch new comment threads of one video, returning how many were stored"""
+        if self._stop.is_set():
+            return 0
+
+        last_seen = self.store.last_seen(video_id)
+        newest = None
+        threads = 0
+        page_token = None
+
+        while threads < self.max_per_video:
+            params = {
+                "key": self.api_key,
+                "videoId": video_id,
+                "part": "snippet,replies" if self.include_replies else "snippet",
+                "order": "time",
+                "textFormat": "plainText",
+                "maxResults": min(PAGE_SIZE, self.max_per_video - threads)
+            }
+            if page_token:
+                params["pageToken"] = page_token
+
+            with REGISTRY.stage("comment_page") as stage:
+                data = api_get("commentThreads", params)
+
+                if "error" in data:
+                    errors = data["error"].get("errors") or [{}]
+                    reason = errors[0].get("reason", "")
+                    if reason == "commentsDisabled":
+                        REGISTRY.inc("comments_disabled")
+                        self.store.mark_done(video_id, None, 0)
+                        return 0
+                    if reason in ("quotaExceeded", "dailyLimitExceeded"):
+                        logger.error("Quota exhausted, stopping comment harvest")
+                        self._stop.set()
+                    else:
+                        logger.error(f"Error fetching comments for {video_id}: {data['error'].get('message', reason)}")
+                    # State is not updated, so the next run retries this video
+                    return threads
+
+                records = []
+                reached_seen = False
+                for item in data.get("items", []):
+                    top = item["snippet"]["topLevelComment"]
+                    published_at = top["snippet"]["publishedAt"]
+                    if last_seen and published_at <= last_seen:
+                        reached_seen = True
+                        break
+                    newest = newest or published_at
+                    records.append(comment_record(top, video_id, group, item["snippet"].get("totalReplyCount", 0)))
+                    for reply in item.get("replies", {}).get("comments", []):
+                        records.append(comment_record(reply, video_id, group))
+                    threads += 1
+                    if threads >= self.max_per_video:
+                        break
+
+                if records:
+                    self.store.append(records)
+                    stage.add_items(len(records))
+
+            page_token = data.get("nextPageToken")
+            if reached_seen or not page_token:
+                break
+
+        self.store.mark_done(video_id, newest, threads)
+        return threads
+
+    def run(self, targets: Iterable[Tuple[str, str]], workers: int = 4) -> Dict[str, int]:
+        """Harvest (video_id, group) targets with at most `workers` videos in flight"""
+        def harvest(target: Tuple[str, str]) -> int:
+            video_id, group = target
+            try:
+                return self.harvest_video(video_id, group)
+            except Exception as e:
+                logger.exception(f"Error harvesting comments for {video_id}: {e}")
+                return 0
+
+        videos = 0
+        threads = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for count in pool.map(harvest, targets):
+                videos += 1
+                threads += count
+                if videos % 100 == 0:
+                    logger.info(f"Harvested {videos} videos, {threads} new threads so far")
+        return {"videos": videos, "threads": threads}
+
+def select_targets(dataset_path: str, groups: Optional[List[str]] = None, min_comments: int = 1) -> List[Tuple[str, str]]:
+    """(video_id, group) for every short in the dataset with at least min_comments comments"""
+    dataset = load_dataset(dataset_path)
+    return [
+        (short.video_id, name)
+        for name, group in dataset.items()
+        if not groups or name in groups
+        for short in group.shorts
+        if short.comments >= min_comments
+    ]
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts comments`"""
+    targets = select_targets(args.input, args.group, args.min_comments)
+    logger.info(f"Harvesting comments for {len(targets)} shorts", extra={"store": args.store, "workers": args.workers})
+
+    LIMITER.set_rate(args.requests_per_second)
+    store = open_store(args.store)
+    harvester = CommentHarvester(store, get_config().youtube_api_key, args.max_per_video, not args.no_replies)
+    try:
+        with REGISTRY.stage("harvest_comments") as stage:
+            summary = harvester.run(targets, args.workers)
+            stage.add_items(summary["threads"])
+    finally:
+        store.close()
+    logger.info("Comment harvest finished", extra=summary)
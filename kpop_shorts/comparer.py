@@ -0,0 +1,141 @@
+import argparse
+import csv
+import json
+from typing import Set, Dict, List, Any, Optional
+
+from kpop_shorts.diff import diff_snapshots
+from kpop_shorts.entities import EntityIndex
+from kpop_shorts.model import load_dataset
+
+def read_csv_column(path: str, column: str) -> Set[str]:
+    """Read a single column of a CSV file into a set"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return {row[column] for row in csv.DictReader(f) if row.get(column)}
+
+def compare_group_sets(json_data_keys: Set[str], csv_groups: Set[str], index: Optional[EntityIndex] = None) -> Dict[str, List]:
+    """
+    Compare two sets of group names and return groups unique to each set.
+    With an entity index, names are compared by canonical group ID, so
+    "APINK" or "에이핑크" in the JSON matches "Apink" in the CSV; such pairs
+    are listed under "resolved" as [JSON name, CSV name].
+    """
+    if index is None:
+        return {
+            "only_in_json_data": sorted(json_data_keys - csv_groups),
+            "only_in_csv_data": sorted(csv_groups - json_data_keys),
+            "in_both_datasets": sorted(json_data_keys & csv_groups),
+            "resolved": []
+        }
+    
+    csv_by_id = {}
+    for name in csv_groups:
+        csv_by_id.setdefault(index.resolve_id(name) or name, name)
+    
+    only_in_json, in_both, resolved = [], set(), []
+    matched = set()
+    for name in json_data_keys:
+        entity_id = index.resolve_id(name)
+        csv_name = csv_by_id.get(entity_id) if entity_id else None
+        if csv_name is None:
+            only_in_json.append(name)
+            continue
+        matched.add(entity_id)
+        in_both.add(csv_name)
+        if name != csv_name:
+            resolved.append([name, csv_name])
+    
+    return {
+        "only_in_json_data": sorted(only_in_json),
+        "only_in_csv_data": sorted(name for entity_id, name in csv_by_id.items() if entity_id not in matched),
+        "in_both_datasets": sorted(in_both),
+        "resolved": sorted(resolved)
+    }
+
+def compare_groups(shorts_data_path: str, group_data_path: str):
+    # Load the datasets
+    csv_groups = read_csv_column(group_data_path, "group (english)")
+    
+    try:
+        json_data = load_dataset(shorts_data_path)
+    except FileNotFoundError:
+        print(f"Error: Could not find the JSON file at {shorts_data_path}")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: The file at {shorts_data_path} is not valid JSON")
+        return
+    
+    # Extract group names
+    json_groups = set(json_data.keys())
+    
+    # Compare the sets, by canonical group ID rather than exact spelling
+    comparison = compare_group_sets(json_groups, csv_groups, EntityIndex.from_csv(group_data_path))
+    
+    # Print the results
+    print(f"Total groups in JSON data: {len(json_groups)}")
+    print(f"Total groups in CSV data: {len(csv_groups)}")
+    print("\n" + "="*50)
+    
+    print("\nGroups only in JSON data (not in CSV):")
+    if comparison["only_in_json_data"]:
+        for i, group in enumerate(comparison["only_in_json_data"], 1):
+            print(f"{i}. {group}")
+    else:
+        print("None")
+    
+    if comparison["resolved"]:
+        print("\nGroups spelled differently in JSON and CSV (matched):")
+        for i, (json_name, csv_name) in enumerate(comparison["resolved"], 1):
+            print(f"{i}. {json_name} -> {csv_name}")
+    
+    print("\nGroups only in CSV data (not in JSON):")
+    if comparison["only_in_csv_data"]:
+        for i, group in enumerate(comparison["only_in_csv_data"], 1):
+            print(f"{i}. {group}")
+    else:
+        print("None")
+    
+    print(f"\nNumber of groups in both datasets: {len(comparison['in_both_datasets'])}")
+    
+    # Optional: If you want to see the list of groups in both datasets
+    print("\nGroups in both datasets:")
+    for i, group in enumerate(comparison["in_both_datasets"], 1):
+        print(f"{i}. {group}")
+    
+    # Calculate coverage
+    coverage_percentage = (len(comparison["in_both_datasets"]) / len(csv_groups)) * 100
+    print(f"\nCoverage: {coverage_percentage:.2f}% of CSV groups are in the JSON data")
+
+def print_diff_summary(summary: Dict[str, Any]):
+    print(f"Videos in old snapshot: {summary['old_videos']}")
+    print(f"Videos in new snapshot: {summary['new_videos']}")
+    print("\n" + "="*50)
+    print(f"\nAdded: {summary['added']}")
+    print(f"Removed: {summary['removed']}")
+    print(f"Changed: {summary['changed']} ({summary['renamed_titles']} renamed titles, {summary['hashtag_changes']} hashtag changes)")
+    print(f"Unchanged: {summary['unchanged']}")
+    print(f"\nTotal view delta: {summary['views_delta_total']:+}")
+    print(f"Total like delta: {summary['likes_delta_total']:+}")
+    
+    if summary["top_view_gainers"]:
+        print("\nTop view gainers:")
+        for i, gainer in enumerate(summary["top_view_gainers"], 1):
+            print(f"{i}. {gainer['video_id']} {gainer['views_delta']:+} {gainer['title']}")
+    
+    print(f"\nDelta written to {summary['delta']}")
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts compare`"""
+    if not args.diff:
+        compare_groups(args.shorts, args.groups)
+        return
+    
+    old_path, new_path = args.diff
+    try:
+        summary = diff_snapshots(old_path, new_path, args.delta, args.summary)
+    except FileNotFoundError as e:
+        print(f"Error: Could not find {e.filename}")
+        return
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in snapshot: {e}")
+        return
+    print_diff_summary(summary)
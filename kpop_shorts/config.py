@@ -0,0 +1,76 @@
+import os
+from typing import Optional
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _find_root() -> str:
+    """
+    Project root holding data-original/, data-processed/ and wikipedia_data/:
+    $KPOP_SHORTS_ROOT if set, else the checkout this package lives in, else
+    the current directory.
+    """
+    if os.getenv("KPOP_SHORTS_ROOT"):
+        return os.path.abspath(os.environ["KPOP_SHORTS_ROOT"])
+    checkout = os.path.dirname(PACKAGE_DIR)
+    if os.path.isdir(os.path.join(checkout, "data-original")):
+        return checkout
+    return os.getcwd()
+
+class Config:
+    """
+    File locations and API keys shared by every command, so the scripts no
+    longer disagree about `./data-processed` vs `../data-processed`.
+    """
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or _find_root()
+        self.data_original = os.path.join(self.root, "data-original")
+        self.data_processed = os.path.join(self.root, "data-processed")
+        self.wikipedia_data = os.path.join(self.root, "wikipedia_data")
+        self.videos = os.path.join(self.root, "videos")
+
+        # Inputs
+        self.group_csv = os.path.join(self.data_original, "kpop-group.csv")
+        self.idol_csv = os.path.join(self.data_original, "kpop-idol.csv")
+        self.group_updated_csv = os.path.join(self.data_processed, "kpop-group-updated.csv")
+        # Sample data committed with the repo, which `synth` fits its distributions to
+        self.sample_shorts = [os.path.join(self.data_processed, f"v{version}-kpop-challenge-shorts.json") for version in (0, 1)]
+        self.sample_wiki = os.path.join(self.wikipedia_data, "kpop_group_info_v0.json")
+
+        # Pipeline outputs, in the order the commands produce them
+        self.shorts_data = os.path.join(self.data_processed, "kpop_shorts_data.json")
+        self.hashtag_processed = os.path.join(self.data_processed, "kpop_shorts_data_hashtag_processed.json")
+        self.challenge_shorts = os.path.join(self.data_processed, "v2-kpop-challenge-shorts.json")
+        self.non_challenge_shorts = os.path.join(self.data_processed, "v2-kpop-non-challenge-shorts.json")
+        self.shorts_store = os.path.join(self.data_processed, "kpop_shorts_data_hashtag_processed.jsonl")
+        self.wiki_info = os.path.join(self.wikipedia_data, "kpop_group_info.json")
+        self.trending = os.path.join(self.data_processed, "trending.json")
+        self.collab_graph = os.path.join(self.data_processed, "collab-graph.graphml")
+        self.collab_metrics = os.path.join(self.data_processed, "collab-metrics.json")
+        self.comments_store = os.path.join(self.data_processed, "comments.sqlite")
+
+        # Crawl state
+        self.crawl_queue = os.path.join(self.root, "crawl-queue.sqlite")
+        self.shard_dir = os.path.join(self.root, "shards")
+        self.schedule_state = os.path.join(self.root, "schedule-state.json")
+        self.video_cache = os.path.join(self.root, "video-details-cache.sqlite")
+        self.search_index = os.path.join(self.root, "search-index")
+        self.collab_state = os.path.join(self.root, "collab-graph")
+
+        self._api_key = None
+
+    @property
+    def youtube_api_key(self) -> Optional[str]:
+        """YOUTUBE_API_KEY from the environment or the project's .env file"""
+        if self._api_key is None:
+            import dotenv
+            dotenv.load_dotenv(os.path.join(self.root, ".env"))
+            self._api_key = os.getenv("YOUTUBE_API_KEY")
+        return self._api_key
+
+_config: Optional[Config] = None
+
+def get_config() -> Config:
+    global _config
+    if _config is None:
+        _config = Config()
+    return _config
@@ -0,0 +1,200 @@
+import gzip
+import heapq
+import os
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from kpop_shorts.model import Short, load_dataset
+from kpop_shorts.serialization import dumps, loads, write_json
+from kpop_shorts.shortstore import ShortStore, index_path, is_store_path, video_hash
+
+def iter_snapshot(path: str) -> Iterator[Tuple[str, Short]]:
+    """
+    Yield (group name, short) from a snapshot file.
+    Indexed .jsonl stores yield the latest line of each short; other .jsonl /
+    .jsonl.gz files (one short per line with a "group" field) are streamed
+    line by line; JSON datasets are loaded and released group by group.
+    """
+    if is_store_path(path) and os.path.exists(index_path(path)):
+        with ShortStore(path) as store:
+            yield from store
+        return
+
+    if path.endswith((".jsonl", ".jsonl.gz")):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            for line in f:
+                record = loads(line) if line.strip() else {}
+                # Group metadata lines of a store carry no video_id
+                if "video_id" in record:
+                    yield record.pop("group", ""), Short.from_dict(record)
+        return
+
+    dataset = load_dataset(path)
+    for name in list(dataset):
+        group = dataset.pop(name)
+        for short in group.shorts:
+            yield name, short
+
+def compare_shorts(old: Short, new: Short) -> Optional[Dict[str, Any]]:
+    """Return the change record between two versions of a short, or None if unchanged"""
+    change: Dict[str, Any] = {}
+    views_delta = new.views - old.views
+    likes_delta = new.likes - old.likes
+    comments_delta = new.comments - old.comments
+    if views_delta:
+        change["views_delta"] = views_delta
+    if likes_delta:
+        change["likes_delta"] = likes_delta
+    if comments_delta:
+        change["comments_delta"] = comments_delta
+    if old.title != new.title:
+        change["title"] = [old.title, new.title]
+    if old.hashtags != new.hashtags:
+        old_tags, new_tags = set(old.hashtags), set(new.hashtags)
+        added = [tag for tag in new.hashtags if tag not in old_tags]
+        removed = [tag for tag in old.hashtags if tag not in new_tags]
+        if added:
+            change["hashtags_added"] = added
+        if removed:
+            change["hashtags_removed"] = removed
+    return change or None
+
+class SnapshotDiff:
+    """
+    Hash join of two snapshots on video_id. The old snapshot is indexed in a
+    dict; the new one is streamed past it once, so only the old side (as
+    compact Short objects) and the set of new video_ids are held in memory.
+    When the old snapshot is an indexed .jsonl store, its shorts are looked
+    up in the store instead of being loaded.
+    Delta records are handed to `emit` as they are produced.
+    """
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.stats = {
+            "old_videos": 0,
+            "new_videos": 0,
+            "added": 0,
+            "removed": 0,
+            "changed": 0,
+            "unchanged": 0,
+            "renamed_titles": 0,
+            "hashtag_changes": 0,
+            "duplicate_video_ids": 0,
+            "views_delta_total": 0,
+            "likes_delta_total": 0,
+            "comments_delta_total": 0
+        }
+        self.group_views_delta: Dict[str, int] = {}
+        self._top_gainers: List[Tuple[int, str, str]] = []
+
+    def run(self, old_path: str, new_path: str, emit) -> Dict[str, Any]:
+        if is_store_path(old_path) and os.path.exists(index_path(old_path)):
+            with ShortStore(old_path) as old:
+                return self._run_against_store(old, new_path, emit)
+
+        index: Dict[str, Tuple[str, Short]] = {}
+        for group, short in iter_snapshot(old_path):
+            if short.video_id in index:
+                self.stats["duplicate_video_ids"] += 1
+                continue
+            index[short.video_id] = (group, short)
+        self.stats["old_videos"] = len(index)
+
+        seen = set()
+        for group, short in self._iter_new(new_path, seen):
+            match = index.pop(short.video_id, None)
+            self._compare(group, short, match, emit)
+
+        for video_id, (group, short) in index.items():
+            self.stats["removed"] += 1
+            emit({"op": "removed", "video_id": video_id, "group": group})
+
+        return self.summary()
+
+    def _run_against_store(self, old: ShortStore, new_path: str, emit) -> Dict[str, Any]:
+        """
+        Same join with the old side looked up in its store one short at a
+        time, so nothing of it is held in memory but the index's mmap
+        """
+        self.stats["old_videos"] = len(old)
+        seen = set()
+        for group, short in self._iter_new(new_path, seen):
+            self._compare(group, short, old.get(short.video_id), emit)
+
+        # A hash collision could hide a removed short here; with 64-bit hashes
+        # that is not worth parsing every old line for
+        seen_hashes = {video_hash(video_id) for video_id in seen}
+        for entry_hash, offset, length in old.iter_locations():
+            if entry_hash not in seen_hashes:
+                record = old.read_at(offset, length)
+                self.stats["removed"] += 1
+                emit({"op": "removed", "video_id": record["video_id"], "group": record.get("group", "")})
+
+        return self.summary()
+
+    def _iter_new(self, new_path: str, seen: Set[str]) -> Iterator[Tuple[str, Short]]:
+        """The new snapshot's shorts, skipping (and counting) repeated video_ids"""
+        for group, short in iter_snapshot(new_path):
+            if short.video_id in seen:
+                self.stats["duplicate_video_ids"] += 1
+                continue
+            seen.add(short.video_id)
+            self.stats["new_videos"] += 1
+            yield group, short
+
+    def _compare(self, group: str, short: Short, match: Optional[Tuple[str, Short]], emit):
+        if match is None:
+            self.stats["added"] += 1
+            emit({"op": "added", "group": group, **short.to_dict()})
+            return
+
+        change = compare_shorts(match[1], short)
+        if change is None:
+            self.stats["unchanged"] += 1
+            return
+        self._record_change(group, short, change)
+        emit({"op": "changed", "video_id": short.video_id, "group": group, **change})
+
+    def _record_change(self, group: str, short: Short, change: Dict[str, Any]):
+        self.stats["changed"] += 1
+        self.stats["renamed_titles"] += "title" in change
+        self.stats["hashtag_changes"] += "hashtags_added" in change or "hashtags_removed" in change
+        views_delta = change.get("views_delta", 0)
+        self.stats["views_delta_total"] += views_delta
+        self.stats["likes_delta_total"] += change.get("likes_delta", 0)
+        self.stats["comments_delta_total"] += change.get("comments_delta", 0)
+        self.group_views_delta[group] = self.group_views_delta.get(group, 0) + views_delta
+        if views_delta > 0:
+            entry = (views_delta, short.video_id, short.title)
+            if len(self._top_gainers) < self.top:
+                heapq.heappush(self._top_gainers, entry)
+            else:
+                heapq.heappushpop(self._top_gainers, entry)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "top_view_gainers": [
+                {"video_id": video_id, "title": title, "views_delta": delta}
+                for delta, video_id, title in sorted(self._top_gainers, reverse=True)
+            ],
+            "views_delta_by_group": dict(sorted(self.group_views_delta.items(), key=lambda item: -item[1]))
+        }
+
+def diff_snapshots(old_path: str, new_path: str, delta_path: str, summary_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Diff two snapshot files, streaming the delta records to delta_path as
+    JSON lines (gzip-compressed if it ends in .gz). Returns the summary and
+    writes it to summary_path if given.
+    """
+    directory = os.path.dirname(delta_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    opener = gzip.open if delta_path.endswith(".gz") else open
+    with opener(delta_path, "wb") as f:
+        summary = SnapshotDiff().run(old_path, new_path, lambda record: f.write(dumps(record) + b"\n"))
+
+    summary = {"old": old_path, "new": new_path, "delta": delta_path, **summary}
+    if summary_path:
+        write_json(summary, summary_path, pretty=True)
+    return summary
@@ -0,0 +1,22 @@
+import argparse
+
+def download_video(url, output_path):
+    # pytubefix is only needed here, so `kpop-shorts` doesn't import it on every start
+    from pytubefix import YouTube
+    from pytubefix.cli import on_progress
+    
+    try:
+        yt = YouTube(url, on_progress_callback=on_progress)
+        print(f"Downloading: {yt.title}")
+        ys = yt.streams.get_highest_resolution()
+        downloaded_path = ys.download(output_path=output_path)
+        print(f"Video downloaded to: {downloaded_path}")
+        return downloaded_path
+    except Exception as e:
+        print(f"Error downloading video: {e}")
+        return None
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts download`"""
+    url = args.url or input("Enter the YouTube URL: ")
+    download_video(url, args.output_dir)
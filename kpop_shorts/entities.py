@@ -0,0 +1,273 @@
+import argparse
+import csv
+import math
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from kpop_shorts.config import get_config
+from kpop_shorts.log import get_logger
+from kpop_shorts.model import Dataset
+
+logger = get_logger(__name__)
+
+GROUP = "group"
+IDOL = "idol"
+
+# Wikipedia disambiguation kept in the CSV's alternative names, e.g. "Treasure_(band)"
+DISAMBIGUATION_RE = re.compile(r"[\s_]*\((?:[^()]*[\s_])?(?:group|band|duo|singer|rapper)\)$", re.IGNORECASE)
+
+# Revised Romanization of the initial, medial and final jamo of a Hangul syllable
+INITIALS = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+MEDIALS = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo", "we", "wi", "yu", "eu", "ui", "i"]
+FINALS = ["", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "l", "l", "l", "p", "l", "m", "p", "p", "t", "t", "ng", "t", "t", "k", "t", "p", "t"]
+HANGUL_FIRST, HANGUL_LAST = 0xAC00, 0xD7A3
+
+# Spellings the same Korean name is commonly romanized with, folded together:
+# Jeon/Jun, Woong/Ung, Jeongguk/Jungkook, Park/Bak, Kim/Gim, Seu-teu-rei/Stray ...
+FOLDS = [
+    (re.compile(r"eu"), ""),
+    (re.compile(r"eo"), "u"),
+    (re.compile(r"oo"), "u"),
+    (re.compile(r"ee"), "i"),
+    (re.compile(r"ei|ay|ae"), "e"),
+    (re.compile(r"sh"), "s"),
+    (re.compile(r"[kqc]"), "g"),
+    (re.compile(r"[pf]"), "b"),
+    (re.compile(r"t"), "d"),
+    (re.compile(r"r"), "l"),
+    (re.compile(r"w(?=u)"), ""),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+def name_key(name: str) -> str:
+    """Exact matching key: NFKC, disambiguation suffix dropped, casefolded, letters and digits only"""
+    name = DISAMBIGUATION_RE.sub("", unicodedata.normalize("NFKC", name).strip())
+    return "".join(c for c in name.casefold() if c.isalnum())
+
+def romanize(text: str) -> str:
+    """Hangul syllables transliterated letter by letter (no sound-change rules); other characters kept"""
+    out = []
+    for c in text:
+        code = ord(c)
+        if HANGUL_FIRST <= code <= HANGUL_LAST:
+            index = code - HANGUL_FIRST
+            out.append(INITIALS[index // 588] + MEDIALS[index % 588 // 28] + FINALS[index % 28])
+        else:
+            out.append(c)
+    return "".join(out)
+
+def phonetic_key(name: str) -> str:
+    """Romanization-insensitive key: name_key, romanized, with variant spellings folded"""
+    key = romanize(name_key(name))
+    for pattern, replacement in FOLDS:
+        key = pattern.sub(replacement, key)
+    return key
+
+def ngrams(key: str, n: int = 3) -> Set[str]:
+    padded = f"^{key}$"
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+def group_id(name: str) -> str:
+    """Canonical ID of a group: the name key of its English name in kpop-group.csv"""
+    return name_key(name)
+
+class Entity:
+    __slots__ = ("id", "kind", "name", "group_id", "aliases")
+
+    def __init__(self, entity_id: str, kind: str, name: str, group_id: Optional[str] = None):
+        self.id = entity_id
+        self.kind = kind
+        self.name = name
+        self.group_id = group_id
+        self.aliases: List[str] = []
+
+    def __repr__(self) -> str:
+        return f"Entity({self.id!r}, {self.kind})"
+
+class Match(NamedTuple):
+    entity_id: str
+    score: float
+    method: str  # "exact", "romanization" or "fuzzy"
+
+class EntityIndex:
+    """
+    Resolves free-form group and idol names (any casing, spacing,
+    punctuation, Korean or romanized) to canonical entity IDs.
+
+    Exact and romanization-insensitive keys are looked up in dicts. Anything
+    else is matched fuzzily: each alias is filed under the character
+    trigrams of its phonetic key, and a name is only scored (Dice
+    coefficient of trigram sets) against aliases found in the blocks of its
+    rarest trigrams. An alias scoring min_score must share at least
+    min_score * n / (2 - min_score) of the name's n trigrams, so it is
+    in one of the n - that + 1 rarest blocks; the common trigrams are never
+    scanned and resolving costs time in proportion to the aliases that look
+    alike, not to the size of the index.
+    """
+    def __init__(self, min_score: float = 0.6):
+        self.min_score = min_score
+        self.entities: Dict[str, Entity] = {}
+        self.comparisons = 0
+        self._exact: Dict[Tuple[str, str], Set[str]] = {}
+        self._phonetic: Dict[Tuple[str, str], Set[str]] = {}
+        self._aliases: List[Tuple[str, str, Set[str]]] = []  # (entity id, kind, trigrams)
+        self._blocks: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def add(self, entity_id: str, kind: str, name: str, aliases: Iterable[str] = (), group: Optional[str] = None) -> Entity:
+        entity = self.entities.get(entity_id)
+        if entity is None:
+            entity = self.entities[entity_id] = Entity(entity_id, kind, name, group)
+        for alias in (name, *aliases):
+            key = name_key(alias) if alias else ""
+            if not key or alias in entity.aliases:
+                continue
+            entity.aliases.append(alias)
+            self._exact.setdefault((kind, key), set()).add(entity_id)
+            phonetic = phonetic_key(alias)
+            self._phonetic.setdefault((kind, phonetic), set()).add(entity_id)
+            position = len(self._aliases)
+            grams = ngrams(phonetic)
+            self._aliases.append((entity_id, kind, grams))
+            for gram in grams:
+                self._blocks.setdefault(gram, []).append(position)
+        return entity
+
+    def _pick(self, ids: Set[str], group: Optional[str]) -> Optional[str]:
+        """The one entity among ids, preferring those of `group`; None if ambiguous"""
+        if group is not None and len(ids) > 1:
+            ids = {entity_id for entity_id in ids if self.entities[entity_id].group_id == group} or ids
+        return next(iter(ids)) if len(ids) == 1 else None
+
+    def candidates(self, name: str, kind: str = GROUP, group: Optional[str] = None, limit: int = 5) -> List[Match]:
+        """Best fuzzy matches of name scoring at least min_score (less the group bonus), best first"""
+        grams = ngrams(phonetic_key(name))
+        threshold = self.min_score - (0.1 if group is not None else 0.0)
+        overlap = math.ceil(threshold * len(grams) / (2 - threshold) - 1e-9)
+        rarest = sorted(grams, key=lambda gram: len(self._blocks.get(gram, ())))[:max(len(grams) - overlap + 1, 1)]
+        positions = {position for gram in rarest for position in self._blocks.get(gram, ())}
+
+        best: Dict[str, float] = {}
+        for position in positions:
+            entity_id, alias_kind, alias_grams = self._aliases[position]
+            if alias_kind != kind:
+                continue
+            self.comparisons += 1
+            score = 2 * len(grams & alias_grams) / (len(grams) + len(alias_grams))
+            if group is not None and self.entities[entity_id].group_id == group:
+                score = min(score + 0.1, 1.0)
+            if score > best.get(entity_id, 0.0):
+                best[entity_id] = score
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [Match(entity_id, round(score, 3), "fuzzy") for entity_id, score in ranked]
+
+    def resolve(self, name: str, kind: str = GROUP, group: Optional[str] = None) -> Optional[Match]:
+        """
+        Canonical entity for name: an exact key match, else a romanization
+        match, else the best fuzzy match scoring at least min_score that is
+        clearly ahead of the runner-up. `group` (a group ID) breaks ties
+        between idols of different groups.
+        """
+        key = name_key(name)
+        if not key:
+            return None
+        ids = self._exact.get((kind, key))
+        if ids:
+            entity_id = self._pick(ids, group)
+            return Match(entity_id, 1.0, "exact") if entity_id else None
+        ids = self._phonetic.get((kind, phonetic_key(name)))
+        if ids:
+            entity_id = self._pick(ids, group)
+            return Match(entity_id, 0.95, "romanization") if entity_id else None
+
+        matches = self.candidates(name, kind, group, limit=2)
+        if not matches or matches[0].score < self.min_score:
+            return None
+        if len(matches) > 1 and matches[1].score >= matches[0].score - 0.05:
+            logger.debug(f"Ambiguous name {name!r}", extra={"candidates": ",".join(m.entity_id for m in matches)})
+            return None
+        return matches[0]
+
+    def resolve_id(self, name: str, kind: str = GROUP, group: Optional[str] = None) -> Optional[str]:
+        match = self.resolve(name, kind, group)
+        return match.entity_id if match else None
+
+    @classmethod
+    def from_csv(cls, group_csv: str, idol_csv: Optional[str] = None, **kwargs) -> "EntityIndex":
+        """
+        Groups from kpop-group.csv (English, Korean and alternative names) and
+        optionally idols from kpop-idol.csv, each joined to its group by
+        resolving the row's group names rather than by exact string
+        """
+        index = cls(**kwargs)
+        with open(group_csv, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = row["group (english)"]
+                index.add(group_id(name), GROUP, name, (row.get("group (korean)"), row.get("group (alternative)")))
+        if idol_csv:
+            unmatched = 0
+            with open(idol_csv, encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    group = index.resolve_id(row["group (english)"]) or index.resolve_id(row.get("group (korean)") or "")
+                    if group is None:
+                        unmatched += 1
+                        continue
+                    name = row["name (english)"]
+                    index.add(f"{group}/{name_key(name)}", IDOL, name, (row.get("name (korean)"),), group)
+            if unmatched:
+                logger.warning(f"{unmatched} idols in {idol_csv} belong to no group in {group_csv}")
+        return index
+
+@lru_cache(maxsize=None)
+def group_index(group_csv: Optional[str] = None) -> Optional[EntityIndex]:
+    """
+    The index of kpop-group.csv (or group_csv) that canonical group IDs are
+    resolved against, built once per process; None if the file is missing
+    """
+    group_csv = group_csv or get_config().group_csv
+    if not os.path.exists(group_csv):
+        logger.warning(f"Group CSV {group_csv} not found, group IDs are taken from names as spelled")
+        return None
+    return EntityIndex.from_csv(group_csv)
+
+def resolve_group_id(index: Optional[EntityIndex], name: str, korean_name: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    (canonical ID, resolved?) of a group named name / korean_name. Names
+    that don't resolve get group_id(name), which is the ID they will have
+    once added to kpop-group.csv.
+    """
+    resolved = (index.resolve_id(name) or index.resolve_id(korean_name or "")) if index else None
+    return resolved or group_id(name), resolved is not None
+
+def assign_group_ids(dataset: Dataset, index: Optional[EntityIndex]) -> List[str]:
+    """
+    Fill in the group_id of every group in dataset that has none, resolving
+    its name with index. Returns the names that didn't resolve.
+    """
+    unresolved = []
+    for name, group in dataset.items():
+        if group.group_id:
+            continue
+        group.group_id, resolved = resolve_group_id(index, name, group.korean_name)
+        if not resolved:
+            unresolved.append(name)
+    return unresolved
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts resolve`"""
+    index = EntityIndex.from_csv(args.groups, args.idols)
+    for name in args.names:
+        match = index.resolve(name, args.kind)
+        if match:
+            entity = index.entities[match.entity_id]
+            print(f"{name}: {match.entity_id} ({entity.name}) [{match.method} {match.score:.2f}]")
+        else:
+            candidates = ", ".join(f"{m.entity_id} {m.score:.2f}" for m in index.candidates(name, args.kind))
+            print(f"{name}: no match" + (f" (ambiguous: {candidates})" if candidates else ""))
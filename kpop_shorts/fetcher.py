@@ -0,0 +1,619 @@
+# https://stackoverflow.com/questions/71192605/how-do-i-get-youtube-shorts-from-youtube-api-data-v3
+import os
+import argparse
+import json
+from datetime import datetime, timezone
+import time
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+import csv
+import queue
+import re
+import threading
+from kpop_shorts.cache import VideoDetailsCache
+from kpop_shorts.config import get_config
+from kpop_shorts.entities import assign_group_ids, group_index
+from kpop_shorts.log import get_logger
+from kpop_shorts.metrics import REGISTRY
+from kpop_shorts.model import Dataset, Group, Short, load_dataset, save_dataset
+from kpop_shorts.scheduler import DAY, PollScheduler
+from kpop_shorts.shortstore import append_dataset, is_store_path
+from kpop_shorts.workqueue import DONE, LEASED, PENDING, Heartbeat, WorkQueue, default_worker_id
+from kpop_shorts.youtube import LIMITER, api_get
+# from list import youtubers
+
+API_KEY = get_config().youtube_api_key
+
+logger = get_logger(__name__)
+
+# Shared memo of video details, configured from the command line in main()
+VIDEO_CACHE: Optional[VideoDetailsCache] = None
+
+# playlistItems pages requested ahead of the one being processed (0: strictly serial)
+PREFETCH_PAGES = 2
+
+def read_kpop_csv(filename="kpop-group-updated.csv"):
+    """
+    Reads data from a CSV file and returns a Python dictionary.
+
+    Args:
+        filename (str, optional): The name of the CSV file. Defaults to "kpop-group-updated.csv".
+
+    Returns:
+        dict: A dictionary where the keys are English group names and the values
+              are dictionaries containing Korean names, YouTube channel URLs, and channel IDs.
+    """
+    data_dict = {}
+    try:
+        with open(filename, 'r', encoding='utf-8') as csvfile:  # Specify encoding
+            reader = csv.reader(csvfile)
+            header = next(reader)  # Read the header row
+            for row in reader:
+                if row:  # Ensure the row is not empty
+                    english_name = row[0]
+                    korean_name = row[1]
+                    youtube_channel = row[2] if len(row) > 2 else None
+                    channel_id = row[3] if len(row) > 3 else None
+                    data_dict[english_name] = {
+                        "korean": korean_name,
+                        "youtube": youtube_channel,
+                        "channel_id": channel_id
+                    }
+    except FileNotFoundError:
+        logger.error(f"File '{filename}' not found.")
+    except Exception as e:
+        logger.exception(f"An error occurred: {e}")
+    return data_dict
+
+def extract_hashtags(description: str) -> List[str]:
+    """Extract hashtags from video description"""
+    hashtags = re.findall(r'#\w+', description)
+    return hashtags
+
+def get_shorts_playlist_id(channel_id: str) -> Optional[str]:
+    """
+    Create a shorts playlist ID from a channel ID by replacing 'UC' with 'UUSH'
+    """
+    if not channel_id or not channel_id.startswith("UC"):
+        return None
+    
+    return "UUSH" + channel_id[2:]
+
+def _published_at(item: Dict[str, Any]) -> datetime:
+    return datetime.fromisoformat(item["snippet"]["publishedAt"].replace('Z', '+00:00'))
+
+def _is_last_page(page: Dict[str, Any], min_date: datetime) -> bool:
+    """
+    Whether pagination stops after this page: on an API error, at the end of
+    the playlist, or once the page reaches videos older than min_date
+    """
+    if "error" in page or "nextPageToken" not in page:
+        return True
+    return any(_published_at(item) < min_date for item in page.get("items", []))
+
+def iter_playlist_pages(shorts_playlist_id: str, min_date: datetime, prefetch: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the playlistItems pages of a playlist, newest first, up to and
+    including the first one that reaches min_date.
+    With prefetch > 0 the pages are requested on a background thread that
+    stays at most `prefetch` pages ahead of the consumer, so the next page is
+    in flight while the caller looks up the current page's video details.
+    Whether a page is the last is decided from the page itself, so no page
+    past the date boundary is ever requested.
+    """
+    prefetch = PREFETCH_PAGES if prefetch is None else prefetch
+
+    def fetch(page_token: Optional[str]) -> Dict[str, Any]:
+        params = {
+            "key": API_KEY,
+            "playlistId": shorts_playlist_id,
+            "part": "snippet,contentDetails",
+            "maxResults": 50  # Max allowed by API
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        with REGISTRY.stage("playlist_page"):
+            return api_get("playlistItems", params)
+
+    if prefetch <= 0:
+        page_token = None
+        while True:
+            page = fetch(page_token)
+            yield page
+            if _is_last_page(page, min_date):
+                return
+            page_token = page["nextPageToken"]
+            logger.debug(f"  Fetching next page of results with token: {page_token}")
+
+    pages: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(kind: str, value: Any) -> bool:
+        """Block while the queue is full; False once the consumer has stopped"""
+        while not stop.is_set():
+            try:
+                pages.put((kind, value), timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        page_token = None
+        try:
+            while True:
+                page = fetch(page_token)
+                if not put("page", page) or _is_last_page(page, min_date):
+                    break
+                page_token = page["nextPageToken"]
+                logger.debug(f"  Prefetching next page of results with token: {page_token}")
+        except Exception as e:
+            put("error", e)
+        put("done", None)
+
+    threading.Thread(target=produce, name=f"prefetch-{shorts_playlist_id}", daemon=True).start()
+    try:
+        while True:
+            kind, value = pages.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        # Lets the producer exit if the consumer stopped before the last page
+        stop.set()
+
+def get_shorts_from_playlist(shorts_playlist_id: str, min_date: datetime = datetime(2020, 1, 1, tzinfo=timezone.utc),
+                             prefetch: Optional[int] = None) -> List[Short]:
+    """
+    Get all shorts videos from a shorts playlist and filter by date
+    Since shorts are listed from newest to oldest, we can stop when we hit videos older than min_date.
+    The next page is prefetched while the current one's details are fetched (see iter_playlist_pages).
+    """
+    shorts_videos = []
+    
+    try:
+        for playlist_data in iter_playlist_pages(shorts_playlist_id, min_date, prefetch):
+            if "error" in playlist_data:
+                error_message = playlist_data["error"].get("message", "Unknown error")
+                logger.error(f"Error fetching playlist {shorts_playlist_id}: {error_message}")
+                break
+            
+            found_old_video = False
+            for item in playlist_data.get("items", []):
+                video_id = item["contentDetails"]["videoId"]
+                published_at = _published_at(item)
+                
+                # If we've reached a video before our min_date, we can stop checking more pages
+                if published_at < min_date:
+                    found_old_video = True
+                    continue
+                    
+                # Get full video details
+                video_details = get_video_details(video_id)
+                
+                if video_details:
+                    shorts_videos.append(Short(
+                        video_id=video_id,
+                        title=item["snippet"]["title"],
+                        channel=item["snippet"]["channelTitle"],
+                        upload_time=published_at.strftime("%Y-%m-%d %H:%M:%S"),
+                        views=video_details.get("views", 0),
+                        likes=video_details.get("likes", 0),
+                        comments=video_details.get("comments", 0),
+                        hashtags=video_details.get("hashtags", [])
+                    ))
+            
+            # The page iterator ends after this page; no later page was requested
+            if found_old_video:
+                logger.info(f"  Found videos older than {min_date.strftime('%Y-%m-%d')}, stopping pagination")
+        
+    except Exception as e:
+        logger.exception(f"Error processing shorts playlist {shorts_playlist_id}: {e}")
+            
+    return shorts_videos
+
+def get_video_details(video_id: str) -> Dict[str, Any]:
+    """
+    Get detailed information about a specific video.
+    Served from VIDEO_CACHE when the video was looked up recently.
+    """
+    if VIDEO_CACHE is not None:
+        cached = VIDEO_CACHE.get(video_id)
+        if cached is not None:
+            return cached
+    
+    params = {
+        "key": API_KEY,
+        "id": video_id,
+        "part": "statistics,contentDetails,snippet"
+    }
+    
+    try:
+        with REGISTRY.stage("video_details") as stage:
+            data = api_get("videos", params)
+            if data.get("items"):
+                stage.add_items()
+        
+        if "items" not in data or len(data["items"]) == 0:
+            return {}
+        
+        video_info = data["items"][0]
+        description = video_info["snippet"].get("description", "")
+        
+        details = {
+            "views": int(video_info["statistics"].get("viewCount", 0)),
+            "likes": int(video_info["statistics"].get("likeCount", 0)),
+            "comments": int(video_info["statistics"].get("commentCount", 0)),
+            "duration": video_info["contentDetails"]["duration"],
+            "hashtags": extract_hashtags(description)
+        }
+        if VIDEO_CACHE is not None:
+            VIDEO_CACHE.put(video_id, details)
+        return details
+    except Exception as e:
+        logger.exception(f"Error getting video details for {video_id}: {e}")
+        return {}
+
+def try_alternative_shorts_methods(channel_id: str, min_date: datetime = datetime(2020, 1, 1, tzinfo=timezone.utc)) -> List[Short]:
+    """
+    Try alternative methods to get shorts if the shorts playlist doesn't work
+    """
+    # Method 1: Get uploads and filter for shorts
+    params = {
+        "key": API_KEY,
+        "id": channel_id,
+        "part": "contentDetails"
+    }
+    
+    data = api_get("channels", params)
+    
+    if "items" not in data or len(data["items"]) == 0:
+        return []
+    
+    uploads_playlist_id = data["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+    
+    # Use pagination to get all videos
+    shorts_videos = []
+    page_token = None
+    
+    while True:
+        params = {
+            "key": API_KEY,
+            "playlistId": uploads_playlist_id,
+            "part": "snippet,contentDetails",
+            "maxResults": 50  # Maximum allowed by YouTube API
+        }
+        
+        if page_token:
+            params["pageToken"] = page_token
+        
+        try:
+            with REGISTRY.stage("uploads_page"):
+                playlist_data = api_get("playlistItems", params)
+            
+            if "items" in playlist_data:
+                for item in playlist_data["items"]:
+                    video_id = item["contentDetails"]["videoId"]
+                    published_at = datetime.fromisoformat(item["snippet"]["publishedAt"].replace('Z', '+00:00'))
+                    
+                    # Skip videos before 2020/01/01
+                    if published_at < min_date:
+                        continue
+                        
+                    # Get full video details
+                    video_details = get_video_details(video_id)
+                    
+                    # Only include shorts
+                    if video_details:
+                        shorts_videos.append(Short(
+                            video_id=video_id,
+                            title=item["snippet"]["title"],
+                            channel=item["snippet"]["channelTitle"],
+                            upload_time=published_at.strftime("%Y-%m-%d %H:%M:%S"),
+                            views=video_details.get("views", 0),
+                            likes=video_details.get("likes", 0),
+                            comments=video_details.get("comments", 0),
+                            hashtags=video_details.get("hashtags", [])
+                        ))
+            
+            # Check if there are more pages
+            if "nextPageToken" in playlist_data:
+                page_token = playlist_data["nextPageToken"]
+                logger.debug(f"  Fetching next page of uploads with token: {page_token}")
+            else:
+                break
+                
+        except Exception as e:
+            logger.exception(f"Error processing uploads: {e}")
+            break
+    
+    return shorts_videos
+
+def fetch_single_group_shorts(group_name: str, group_info: Dict[str, Any], min_date: Optional[datetime] = None,
+                              group_csv: Optional[str] = None) -> Dataset:
+    """
+    Fetch shorts data for a single K-pop group and return it as {group_name: Group}.
+    Only shorts published at or after min_date (default 2020/01/01) are fetched.
+    The group_id is resolved against group_csv (default kpop-group.csv).
+    """
+    results = {}
+    min_date = min_date or datetime(2020, 1, 1, tzinfo=timezone.utc)
+    
+    channel_id = group_info.get("channel_id")
+    if not channel_id:
+        logger.warning(f"No YouTube channel ID for {group_name}, skipping")
+        return results
+        
+    logger.info(f"Fetching shorts for {group_name}")
+    
+    # First try using the shorts playlist
+    shorts_playlist_id = get_shorts_playlist_id(channel_id)
+    shorts = []
+    
+    if shorts_playlist_id:
+        logger.debug(f"  Trying shorts playlist: {shorts_playlist_id} for {group_name}")
+        shorts = get_shorts_from_playlist(shorts_playlist_id, min_date)
+    
+    # If no shorts found, try alternative methods
+    if not shorts:
+        logger.info(f"  No shorts found in shorts playlist, trying alternative methods for {group_name}")
+        # Uncomment the line below to try alternative methods
+        # shorts = try_alternative_shorts_methods(channel_id, min_date)
+    
+    if shorts:
+        results[group_name] = Group(group_name, group_info["korean"], channel_id, group_info["youtube"], shorts)
+        # Same canonical ID as `split` gives it, whatever the spelling in the updated CSV
+        assign_group_ids(results, group_index(group_csv))
+        logger.info(f"  Found {len(shorts)} shorts for {group_name}")
+    else:
+        logger.info(f"  No shorts found for {group_name}")
+        
+    return results
+
+def save_results(data: Dataset, filename: str = "kpop_shorts_data.json", pretty: bool = False):
+    """
+    Save results to a JSON file (compressed if filename ends in .gz or .zst).
+    If the file already exists, load the existing data and combine it with the new data.
+    A .jsonl store is appended to instead, without reading the rest of it.
+    """
+    if is_store_path(filename):
+        written = append_dataset(filename, data)
+        logger.info(f"Appended {written} shorts to {filename}")
+        return
+    
+    existing_data = {}
+    
+    # Try to load existing data from the file
+    try:
+        existing_data = load_dataset(filename)
+        logger.info(f"Loaded existing data from {filename} with {len(existing_data)} groups")
+    except (FileNotFoundError, json.JSONDecodeError):
+        logger.info(f"No existing data found in {filename} or file is not valid JSON. Creating new file.")
+    
+    # Merge the existing data with the new data
+    # New data will overwrite existing data for the same groups
+    combined_data = {**existing_data, **data}
+    
+    # Write the combined data back to the file
+    save_dataset(combined_data, filename, pretty)
+    
+    logger.info(f"Successfully saved combined data to {filename}")
+
+def run_single(args: argparse.Namespace):
+    """Fetch every group in the CSV in this process"""
+    # Load the K-pop group data from CSV
+    with REGISTRY.stage("read_csv") as stage:
+        kpop_data = read_kpop_csv(args.csv)
+        stage.add_items(len(kpop_data))
+    logger.info(f"Found {len(kpop_data)} K-pop groups in CSV")
+    
+    # Process each group one by one, saving after each group
+    for group_name, group_info in kpop_data.items():
+        logger.info(f"Processing group: {group_name}")
+        
+        # Fetch shorts for this specific group
+        with REGISTRY.stage("fetch_group") as stage:
+            single_group_data = fetch_single_group_shorts(group_name, group_info, group_csv=args.csv)
+            stage.add_items(sum(g.shorts_count for g in single_group_data.values()))
+        
+        # Save the data immediately after processing each group
+        if single_group_data:
+            logger.info(f"Saving shorts data for {group_name}")
+            with REGISTRY.stage("save_results"):
+                save_results(single_group_data, args.output, args.pretty)
+        else:
+            logger.info(f"No data to save for {group_name}")
+        
+        logger.info(f"Completed processing {group_name}")
+
+def run_coordinator(args: argparse.Namespace):
+    """
+    Partition the CSV's channels into work items in the shared queue. A
+    channel already in the queue is not added again, even once it is done;
+    with --reset the previous crawl's items and shard files are dropped
+    first, so every channel is fetched anew.
+    """
+    queue = WorkQueue(args.queue, args.lease_seconds)
+    kpop_data = read_kpop_csv(args.csv)
+    
+    if args.reset:
+        for result in queue.results():
+            if result["shard"] and os.path.exists(result["shard"]):
+                os.remove(result["shard"])
+        logger.info(f"Dropped {queue.reset()} work items of the previous crawl")
+    
+    added = 0
+    for group_name, group_info in kpop_data.items():
+        if not group_info.get("channel_id"):
+            logger.warning(f"No YouTube channel ID for {group_name}, not queued")
+            continue
+        if queue.enqueue(group_info["channel_id"], {"group_name": group_name, "group_info": group_info}):
+            added += 1
+    
+    counts = queue.counts()
+    logger.info(f"Queued {added} channels in {args.queue}", extra=counts)
+    if not added and counts[DONE]:
+        logger.warning("Every channel is already in the queue from an earlier crawl; pass --reset to start a new one")
+
+def run_worker(args: argparse.Namespace):
+    """
+    Claim channels from the queue until it is drained, writing one shard file
+    per channel. Leases are kept alive by heartbeats while a channel is fetched.
+    """
+    queue = WorkQueue(args.queue, args.lease_seconds)
+    worker_id = args.worker_id or default_worker_id()
+    os.makedirs(args.shard_dir, exist_ok=True)
+    logger.info(f"Worker {worker_id} started", extra={"queue": args.queue})
+    
+    while True:
+        item = queue.claim(worker_id)
+        if item is None:
+            counts = queue.counts()
+            if not counts[LEASED]:
+                break
+            # Other workers still hold leases; one may die and its item come back
+            time.sleep(min(args.lease_seconds / 3, 30))
+            continue
+        
+        group_name = item.payload["group_name"]
+        logger.info(f"Processing group: {group_name}", extra={"worker": worker_id, "attempt": item.attempts})
+        try:
+            with Heartbeat(queue, item, worker_id) as heartbeat, REGISTRY.stage("fetch_group") as stage:
+                single_group_data = fetch_single_group_shorts(group_name, item.payload["group_info"], group_csv=args.csv)
+                stage.add_items(sum(g.shorts_count for g in single_group_data.values()))
+            
+            if heartbeat.lost:
+                logger.warning(f"Lease on {group_name} expired while fetching, discarding result")
+                continue
+            
+            # A requeued item can be fetched by two workers, so each writes its
+            # own shard; only the one whose completion the queue accepts is
+            # recorded in the results and merged
+            shard_path = None
+            if single_group_data:
+                safe_name = "".join(c if c.isalnum() else "_" for c in group_name)
+                safe_worker = "".join(c if c.isalnum() else "_" for c in worker_id)
+                shard_path = os.path.join(args.shard_dir, f"{item.id:05d}-{safe_name}-{safe_worker}.json")
+                save_dataset(single_group_data, shard_path)
+            if not queue.complete(item, worker_id, {"group_name": group_name, "shard": shard_path}):
+                logger.warning(f"Lease on {group_name} was lost before completing, discarding result")
+                if shard_path:
+                    os.remove(shard_path)
+        except Exception as e:
+            status = queue.fail(item, worker_id, repr(e))
+            logger.exception(f"Failed to fetch {group_name}, item is now {status}")
+    
+    logger.info(f"Worker {worker_id} finished, queue drained", extra=queue.counts())
+
+def merge_shards(args: argparse.Namespace):
+    """Merge the shard files of completed items into the canonical dataset"""
+    queue = WorkQueue(args.queue, args.lease_seconds)
+    counts = queue.counts()
+    if counts[PENDING] or counts[LEASED]:
+        logger.warning("Queue is not drained yet, merging the completed shards only", extra=counts)
+    
+    merged: Dataset = {}
+    for result in queue.results():
+        if result["shard"]:
+            merged.update(load_dataset(result["shard"]))
+    
+    with REGISTRY.stage("save_results") as stage:
+        save_results(merged, args.output, args.pretty)
+        stage.add_items(len(merged))
+
+def run_schedule(args: argparse.Namespace):
+    """
+    Poll channels in priority order: busy channels often, dormant ones rarely.
+    Each poll only asks for shorts newer than the newest one already in the
+    dataset and merges them in. Stops when the quota budget or poll limit is
+    reached; with --loop it sleeps until the next channel is due instead.
+    """
+    kpop_data = read_kpop_csv(args.csv)
+    try:
+        dataset = load_dataset(args.output)
+    except (FileNotFoundError, json.JSONDecodeError):
+        dataset = {}
+    
+    scheduler = PollScheduler(min_interval=args.min_interval_hours * 3600, max_interval=args.max_interval_days * DAY)
+    saved_state = scheduler.load_state(args.schedule_state)
+    now = time.time()
+    for group_name, group_info in kpop_data.items():
+        if group_info.get("channel_id"):
+            scheduler.add_channel(group_name, dataset.get(group_name), now, saved_state.get(group_name))
+    
+    polls = 0
+    while True:
+        due = scheduler.pop_due(time.time())
+        logger.info(f"{len(due)} channels due")
+        
+        for i, state in enumerate(due):
+            out_of_budget = args.quota_budget and REGISTRY.totals()["quota_units"] >= args.quota_budget
+            if out_of_budget or (args.max_polls and polls >= args.max_polls):
+                logger.info("Poll budget exhausted, deferring remaining channels", extra={"deferred": len(due) - i})
+                for deferred in due[i:]:
+                    scheduler.defer(deferred)
+                scheduler.save_state(args.schedule_state)
+                return
+            
+            group_name = state.name
+            min_date = datetime.fromtimestamp(state.last_upload, tz=timezone.utc) if state.last_upload else None
+            logger.info(f"Polling {group_name}", extra={"rate_per_day": round(state.rate, 3)})
+            group = dataset.get(group_name)
+            with REGISTRY.stage("poll_channel") as stage:
+                fetched = fetch_single_group_shorts(group_name, kpop_data[group_name], min_date, args.csv)
+                if fetched:
+                    known = {short.video_id for short in group.shorts} if group else set()
+                    new_count = sum(1 for short in fetched[group_name].shorts if short.video_id not in known)
+                    stage.add_items(new_count)
+            
+            if fetched:
+                if group:
+                    group.merge_shorts(fetched[group_name].shorts)
+                else:
+                    dataset[group_name] = fetched[group_name]
+                with REGISTRY.stage("save_results"):
+                    if is_store_path(args.output):
+                        append_dataset(args.output, fetched)
+                    else:
+                        save_dataset(dataset, args.output, args.pretty)
+                logger.info(f"  {new_count} new shorts for {group_name}")
+            
+            scheduler.record_poll(group_name, dataset.get(group_name), time.time())
+            scheduler.save_state(args.schedule_state)
+            polls += 1
+        
+        wakeup = scheduler.next_wakeup()
+        if not args.loop or wakeup is None:
+            break
+        sleep_for = max(wakeup - time.time(), 0)
+        logger.info(f"Next channel due in {sleep_for / 3600:.1f}h")
+        time.sleep(sleep_for)
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts fetch`"""
+    global VIDEO_CACHE, PREFETCH_PAGES
+    PREFETCH_PAGES = args.prefetch_pages
+    LIMITER.set_rate(args.requests_per_second)
+    if not args.no_video_cache:
+        VIDEO_CACHE = VideoDetailsCache(args.video_cache or None, args.cache_size, args.cache_max_age_hours * 3600)
+    
+    try:
+        if args.mode == "schedule":
+            run_schedule(args)
+        elif args.mode == "coordinator":
+            run_coordinator(args)
+        elif args.mode == "worker":
+            run_worker(args)
+        elif args.mode == "merge":
+            merge_shards(args)
+        else:
+            run_single(args)
+        
+        if args.update_search_index and args.mode in ("single", "schedule", "merge"):
+            from kpop_shorts.search import update_index
+            update_index(get_config().search_index, [args.output])
+    finally:
+        if VIDEO_CACHE is not None:
+            VIDEO_CACHE.close()
+            VIDEO_CACHE = None
@@ -0,0 +1,392 @@
+import argparse
+import csv
+import hashlib
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+try:
+    import numpy as np
+    from scipy import sparse
+    from scipy.sparse import linalg as splinalg
+except ImportError:
+    raise ImportError("`kpop-shorts graph` requires numpy and scipy (pip install 'kpop-shorts[graph]')") from None
+
+from kpop_shorts.entities import EntityIndex, group_id, name_key
+from kpop_shorts.log import get_logger
+from kpop_shorts.metrics import REGISTRY
+from kpop_shorts.model import Short, load_dataset
+from kpop_shorts.serialization import read_json, write_json
+
+logger = get_logger(__name__)
+
+STATE_VERSION = 1
+
+class Roster:
+    """
+    Graph nodes (every group, then every idol) and the alias table mapping
+    name keys from kpop-group.csv / kpop-idol.csv to node indexes. Group
+    names win over idol names; an alias shared by idols of different groups
+    is ambiguous and not matched. Idols, and the groups shorts were fetched
+    for, are joined to group nodes through an EntityIndex, so spelling
+    differences between the CSVs and the datasets don't drop them.
+    """
+    def __init__(self, group_csv: str, idol_csv: str):
+        self.nodes: List[Dict[str, str]] = []
+        self.groups: Dict[str, Optional[int]] = {}
+        self.aliases: Dict[str, Optional[int]] = {}
+        self.node_group: List[int] = []  # group node of each node (itself for groups)
+        self.index = EntityIndex.from_csv(group_csv)
+        group_nodes: Dict[str, int] = {}  # canonical group ID -> node
+
+        with open(group_csv, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = row["group (english)"]
+                self.groups[name] = group_nodes[group_id(name)] = len(self.nodes)
+                self.node_group.append(len(self.nodes))
+                self.nodes.append({"id": f"group:{name}", "type": "group", "name": name,
+                                   "korean": row.get("group (korean)", ""), "group": name})
+                for alias in (name, row.get("group (korean)"), row.get("group (alternative)")):
+                    if alias and name_key(alias):
+                        self.aliases.setdefault(name_key(alias), self.groups[name])
+
+        idol_aliases: Dict[str, Set[int]] = {}
+        with open(idol_csv, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                resolved = self.index.resolve_id(row["group (english)"]) or self.index.resolve_id(row.get("group (korean)") or "")
+                if resolved is None:
+                    continue
+                group = self.nodes[group_nodes[resolved]]["name"]
+                index = len(self.nodes)
+                self.node_group.append(group_nodes[resolved])
+                self.nodes.append({"id": f"idol:{group}/{row['name (english)']}", "type": "idol",
+                                   "name": row["name (english)"], "korean": row.get("name (korean)", ""), "group": group})
+                for alias in (row["name (english)"], row.get("name (korean)")):
+                    if alias and name_key(alias):
+                        idol_aliases.setdefault(name_key(alias), set()).add(index)
+        for key, indexes in idol_aliases.items():
+            if key not in self.aliases:
+                self.aliases[key] = next(iter(indexes)) if len(indexes) == 1 else None
+
+        digest = hashlib.sha1()
+        for path in (group_csv, idol_csv):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        self.fingerprint = digest.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def group_node(self, name: str) -> Optional[int]:
+        """Node of the group a dataset key names, resolving spellings the CSV doesn't use"""
+        if name not in self.groups:
+            resolved = self.index.resolve_id(name)
+            self.groups[name] = self.groups[self.index.entities[resolved].name] if resolved else None
+        return self.groups[name]
+
+    def short_edges(self, owner: str, short: Short) -> List[Tuple[int, int]]:
+        """
+        Undirected co-appearance edges (i < j) of one short posted by owner:
+        every pair of groups involved, and every mentioned idol with each
+        involved group other than their own.
+        """
+        mentioned = set()
+        for tag in short.hashtags:
+            node = self.aliases.get(name_key(tag))
+            if node is not None:
+                mentioned.add(node)
+
+        owner_node = self.group_node(owner)
+        groups = {owner_node} if owner_node is not None else set()
+        groups.update(self.node_group[node] for node in mentioned)
+        if len(groups) < 2:
+            return []
+
+        edges = set()
+        ordered = sorted(groups)
+        for i, a in enumerate(ordered):
+            for b in ordered[i + 1:]:
+                edges.add((a, b))
+        for idol in mentioned:
+            if self.nodes[idol]["type"] != "idol":
+                continue
+            for group in groups:
+                if group != self.node_group[idol]:
+                    edges.add((min(idol, group), max(idol, group)))
+        return sorted(edges)
+
+class CollaborationGraph:
+    """
+    Symmetric sparse adjacency matrices over the roster's nodes: `counts`
+    (challenge shorts two nodes appear in together) and `views` (summed
+    views of those shorts). The views and edges each short contributed are
+    remembered, so `ingest()` only adds new shorts and the changes of shorts
+    seen before (view growth, or edges retracted and re-added when their
+    hashtags changed), and retracts the shorts no longer in the dataset,
+    instead of rebuilding.
+    """
+    def __init__(self, roster: Roster):
+        self.roster = roster
+        n = len(roster)
+        self.counts = sparse.csr_matrix((n, n), dtype=np.int64)
+        self.views = sparse.csr_matrix((n, n), dtype=np.int64)
+        self.ingested: Dict[str, List] = {}  # video_id -> [views, tags checksum, [[a, b], ...] edges]
+
+    def ingest(self, shorts: Iterable[Tuple[str, Short]]) -> Tuple[int, int, int]:
+        """
+        Bring the graph up to date with the whole dataset as (owner group,
+        short) pairs; shorts ingested before but missing now are retracted.
+        Returns (new, updated and removed shorts with collaborations).
+        """
+        rows: List[int] = []
+        cols: List[int] = []
+        count_deltas: List[int] = []
+        view_deltas: List[int] = []
+        added = updated = removed = 0
+        seen = set()
+
+        def add(edges: List[List[int]], count: int, views: int):
+            for a, b in edges:
+                rows.extend((a, b))
+                cols.extend((b, a))
+                count_deltas.extend((count, count))
+                view_deltas.extend((views, views))
+
+        for owner, short in shorts:
+            seen.add(short.video_id)
+            tags = zlib.crc32("\x1f".join((owner, *short.hashtags)).encode("utf-8"))
+            previous = self.ingested.get(short.video_id)
+            if previous is not None and previous[1] == tags:
+                if previous[0] != short.views:
+                    previous[0], views = short.views, short.views - previous[0]
+                    updated += bool(previous[2])
+                    add(previous[2], 0, views)
+                continue
+            edges = [[a, b] for a, b in self.roster.short_edges(owner, short)]
+            self.ingested[short.video_id] = [short.views, tags, edges]
+            if previous is None:
+                added += bool(edges)
+            else:
+                # Hashtags changed: take back what the old version contributed
+                updated += bool(previous[2] or edges)
+                add(previous[2], -1, -previous[0])
+            add(edges, 1, short.views)
+
+        for video_id in [video_id for video_id in self.ingested if video_id not in seen]:
+            views, _, edges = self.ingested.pop(video_id)
+            removed += bool(edges)
+            add(edges, -1, -views)
+
+        if rows:
+            n = len(self.roster)
+            # Duplicate coordinates are summed when converting to CSR
+            self.counts = self.counts + sparse.coo_matrix((count_deltas, (rows, cols)), shape=(n, n), dtype=np.int64).tocsr()
+            self.views = self.views + sparse.coo_matrix((view_deltas, (rows, cols)), shape=(n, n), dtype=np.int64).tocsr()
+            self.counts.eliminate_zeros()
+            self.views.eliminate_zeros()
+        return added, updated, removed
+
+    def save(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        sparse.save_npz(os.path.join(directory, "counts.npz"), self.counts)
+        sparse.save_npz(os.path.join(directory, "views.npz"), self.views)
+        write_json({
+            "version": STATE_VERSION,
+            "roster": self.roster.fingerprint,
+            "nodes": len(self.roster),
+            "ingested": self.ingested
+        }, os.path.join(directory, "state.json"))
+
+    @classmethod
+    def load(cls, directory: str, roster: Roster) -> "CollaborationGraph":
+        """Saved graph, or an empty one if there is none or it was built from different CSVs"""
+        graph = cls(roster)
+        try:
+            state = read_json(os.path.join(directory, "state.json"))
+        except FileNotFoundError:
+            return graph
+        if state.get("version") != STATE_VERSION or state.get("roster") != roster.fingerprint:
+            logger.info("Group/idol CSVs changed since the graph was built, rebuilding from scratch")
+            return graph
+        graph.counts = sparse.load_npz(os.path.join(directory, "counts.npz")).tocsr()
+        graph.views = sparse.load_npz(os.path.join(directory, "views.npz")).tocsr()
+        graph.ingested = state["ingested"]
+        return graph
+
+def eigenvector_centrality(adjacency: "sparse.csr_matrix", iterations: int = 200, tolerance: float = 1e-9) -> "np.ndarray":
+    """Power iteration on A + I (the shift keeps bipartite parts from oscillating), max-normalized"""
+    n = adjacency.shape[0]
+    x = np.ones(n) / n
+    for _ in range(iterations):
+        following = adjacency @ x + x
+        norm = np.linalg.norm(following)
+        if norm == 0:
+            return np.zeros(n)
+        following /= norm
+        if np.abs(following - x).sum() < tolerance * n:
+            x = following
+            break
+        x = following
+    return x / x.max() if x.max() > 0 else x
+
+def _leading_split(adjacency: "sparse.csr_matrix", degree: "np.ndarray", total: float, members: "np.ndarray") -> Optional["np.ndarray"]:
+    """
+    Newman's leading-eigenvector split of one community: the sign pattern of
+    the top eigenvector of its generalized modularity matrix
+    B_ij = A_ij - k_i k_j / 2m - delta_ij * sum_l B_il, applied as a sparse
+    operator (B is never formed). None if splitting doesn't raise modularity.
+    """
+    sub = adjacency[members][:, members]
+    k = degree[members]
+    correction = np.asarray(sub.sum(axis=1)).ravel() - k * k.sum() / total
+
+    def apply(x):
+        x = np.asarray(x).ravel()
+        return sub @ x - k * (k @ x) / total - correction * x
+
+    size = len(members)
+    if size <= 64:
+        # Small communities: the dense matrix is cheaper than an iterative solver
+        vector = np.linalg.eigh(np.column_stack([apply(column) for column in np.eye(size)]))[1][:, -1]
+    else:
+        operator = splinalg.LinearOperator((size, size), matvec=apply, dtype=np.float64)
+        # Rows of B sum to zero, so the start vector must not be constant; seeded for stable output
+        start = np.random.default_rng(0).random(size)
+        vector = splinalg.eigsh(operator, k=1, which="LA", v0=start)[1][:, 0]
+
+    signs = np.where(vector >= 0, 1.0, -1.0)
+    if abs(signs.sum()) == size or signs @ apply(signs) / (2 * total) <= 1e-9:
+        return None
+    return signs > 0
+
+def modularity_communities(adjacency: "sparse.csr_matrix") -> "np.ndarray":
+    """
+    Communities by repeated leading-eigenvector bisection, splitting each
+    community while that increases modularity. Nodes without edges get a
+    community of their own. Labels are numbered 0..k-1 by community size.
+    """
+    n = adjacency.shape[0]
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    total = degree.sum()
+    labels = np.arange(n)
+    connected = np.flatnonzero(degree)
+    if total:
+        labels[connected] = n
+        pending = [connected]
+        next_label = n + 1
+        while pending:
+            members = pending.pop()
+            if len(members) < 2:
+                continue
+            split = _leading_split(adjacency, degree, total, members)
+            if split is None:
+                continue
+            labels[members[~split]] = next_label
+            next_label += 1
+            pending += [members[split], members[~split]]
+
+    _, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    rank = np.empty_like(sizes)
+    rank[np.argsort(-sizes, kind="stable")] = np.arange(len(sizes))
+    return rank[inverse]
+
+def modularity(adjacency: "sparse.csr_matrix", labels: "np.ndarray") -> float:
+    """Newman modularity of a partition, via the community membership matrix"""
+    total = adjacency.sum()
+    if not total:
+        return 0.0
+    n = adjacency.shape[0]
+    membership = sparse.csr_matrix((np.ones(n), (np.arange(n), labels)), shape=(n, labels.max() + 1))
+    within = (membership.T @ adjacency @ membership).diagonal()
+    degree = membership.T @ np.asarray(adjacency.sum(axis=1)).ravel()
+    return float((within / total - (degree / total) ** 2).sum())
+
+def node_metrics(graph: CollaborationGraph) -> Dict[str, Any]:
+    """Degree, weighted degree, eigenvector centrality and community of every connected node"""
+    counts = graph.counts.astype(np.float64)
+    degree = np.diff(graph.counts.indptr)
+    strength = np.asarray(graph.counts.sum(axis=1)).ravel()
+    view_strength = np.asarray(graph.views.sum(axis=1)).ravel()
+    centrality = eigenvector_centrality(counts)
+    communities = modularity_communities(counts)
+
+    nodes = []
+    for i in np.flatnonzero(degree):
+        node = graph.roster.nodes[i]
+        nodes.append({
+            **node,
+            "degree": int(degree[i]),
+            "shorts": int(strength[i]),
+            "views": int(view_strength[i]),
+            "centrality": round(float(centrality[i]), 6),
+            "community": int(communities[i])
+        })
+    nodes.sort(key=lambda node: node["centrality"], reverse=True)
+    return {
+        "nodes": nodes,
+        "edges": int(graph.counts.nnz // 2),
+        "communities": len({node["community"] for node in nodes}),
+        "modularity": round(modularity(counts, communities), 4)
+    }
+
+def iter_edges(graph: CollaborationGraph) -> Iterable[Tuple[int, int, int, int]]:
+    """(i, j, shorts, views) for every edge with i < j"""
+    upper = sparse.triu(graph.counts, k=1).tocoo()
+    views = np.asarray(graph.views[upper.row, upper.col]).ravel()
+    for i, j, count, view_count in zip(upper.row, upper.col, upper.data, views):
+        yield int(i), int(j), int(count), int(view_count)
+
+def write_edge_list(graph: CollaborationGraph, path: str):
+    nodes = graph.roster.nodes
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["source", "target", "source_type", "target_type", "shorts", "views"])
+        for i, j, count, views in iter_edges(graph):
+            writer.writerow([nodes[i]["id"], nodes[j]["id"], nodes[i]["type"], nodes[j]["type"], count, views])
+
+def write_graphml(graph: CollaborationGraph, path: str, metrics: Dict[str, Any]):
+    """GraphML with the node metrics as attributes; nodes without edges are left out"""
+    node_keys = [("type", "string"), ("name", "string"), ("korean", "string"), ("group", "string"),
+                 ("degree", "int"), ("shorts", "int"), ("views", "long"), ("centrality", "double"), ("community", "int")]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        for key, kind in node_keys:
+            f.write(f'  <key id="{key}" for="node" attr.name="{key}" attr.type="{kind}"/>\n')
+        f.write('  <key id="e_shorts" for="edge" attr.name="shorts" attr.type="int"/>\n')
+        f.write('  <key id="e_views" for="edge" attr.name="views" attr.type="long"/>\n')
+        f.write('  <graph id="collaborations" edgedefault="undirected">\n')
+        for node in metrics["nodes"]:
+            f.write(f'    <node id={quoteattr(node["id"])}>')
+            f.write("".join(f'<data key="{key}">{escape(str(node[key]))}</data>' for key, _ in node_keys))
+            f.write("</node>\n")
+        nodes = graph.roster.nodes
+        for i, j, count, views in iter_edges(graph):
+            f.write(f'    <edge source={quoteattr(nodes[i]["id"])} target={quoteattr(nodes[j]["id"])}>'
+                    f'<data key="e_shorts">{count}</data><data key="e_views">{views}</data></edge>\n')
+        f.write("  </graph>\n</graphml>\n")
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts graph`"""
+    roster = Roster(args.groups, args.idols)
+    graph = CollaborationGraph(roster) if args.rebuild else CollaborationGraph.load(args.state, roster)
+
+    with REGISTRY.stage("graph_ingest") as stage:
+        dataset = load_dataset(args.input)
+        added, updated, removed = graph.ingest((name, short) for name, group in dataset.items() for short in group.shorts)
+        stage.add_items(added)
+    graph.save(args.state)
+    logger.info(f"Ingested {added} new collaboration shorts, {updated} with new view counts, {removed} removed",
+                extra={"nodes": len(roster), "edges": graph.counts.nnz // 2})
+
+    with REGISTRY.stage("graph_metrics"):
+        metrics = node_metrics(graph)
+    write_json(metrics, args.metrics, pretty=True)
+    logger.info("Graph metrics", extra={"communities": metrics["communities"], "modularity": metrics["modularity"]})
+
+    if args.output.endswith(".graphml"):
+        write_graphml(graph, args.output, metrics)
+    else:
+        write_edge_list(graph, args.output)
+    logger.info(f"Wrote {args.output}")
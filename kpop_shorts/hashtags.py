@@ -0,0 +1,89 @@
+import argparse
+import json
+import re
+import sys
+from typing import List
+
+from kpop_shorts.model import Dataset, load_dataset, save_dataset
+
+def extract_hashtags_from_title(title: str) -> List[str]:
+    """
+    Extract hashtags from a title string using regex
+    """
+    hashtags = re.findall(r'#\w+', title)
+    return hashtags
+
+def process_hashtags(json_data: Dataset) -> Dataset:
+    """
+    Process each short in the dataset:
+    1. Extract hashtags from the title
+    2. Add them to the existing hashtags list (avoid duplicates)
+    """
+    processed_data = json_data.copy()
+    
+    # Stats counters
+    total_groups = 0
+    total_shorts = 0
+    total_hashtags_before = 0
+    total_hashtags_after = 0
+    total_hashtags_added = 0
+    
+    for group_name, group_info in processed_data.items():
+        total_groups += 1
+        
+        for short in group_info.shorts:
+            total_shorts += 1
+                
+            # Count existing hashtags
+            total_hashtags_before += len(short.hashtags)
+            
+            # Extract hashtags from title
+            title_hashtags = extract_hashtags_from_title(short.title)
+            
+            # Add non-duplicate hashtags to the list
+            new_hashtags = []
+            for hashtag in title_hashtags:
+                if hashtag not in short.hashtags and hashtag not in new_hashtags:
+                    new_hashtags.append(hashtag)
+            if new_hashtags:
+                short.hashtags = short.hashtags + tuple(sys.intern(tag) for tag in new_hashtags)
+                total_hashtags_added += len(new_hashtags)
+                    
+            # Count hashtags after processing
+            total_hashtags_after += len(short.hashtags)
+    
+    # Print statistics
+    print(f"Processed {total_shorts} shorts across {total_groups} groups")
+    print(f"Total hashtags before: {total_hashtags_before}")
+    print(f"Total hashtags after: {total_hashtags_after}")
+    print(f"Added {total_hashtags_added} new hashtags from titles")
+    
+    return processed_data
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts hashtags`"""
+    shorts_data_path = args.input
+    output_path = args.output
+    
+    # Load the JSON data
+    print(f"Loading data from {shorts_data_path}...")
+    try:
+        json_data = load_dataset(shorts_data_path)
+    except FileNotFoundError:
+        print(f"Error: File not found at {shorts_data_path}")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: Invalid JSON in {shorts_data_path}")
+        return
+        
+    print(f"Successfully loaded data with {len(json_data)} groups")
+    
+    # Process the hashtags
+    print("Processing hashtags...")
+    processed_data = process_hashtags(json_data)
+    
+    # Save the processed data
+    print(f"Saving processed data to {output_path}...")
+    save_dataset(processed_data, output_path)
+    
+    print("Processing complete!")
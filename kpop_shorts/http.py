@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from kpop_shorts.log import get_logger
+from kpop_shorts.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+# Status codes worth retrying; anything else is returned to the caller as-is
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class RateLimiter:
+    """
+    Spaces requests at least 1 / rate seconds apart across all threads that
+    share the limiter, so a pool of workers stays under the same request rate
+    as a single sequential fetcher.
+    """
+    def __init__(self, rate: float):
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self.set_rate(rate)
+
+    def set_rate(self, rate: float):
+        """Change the rate (0: unlimited), e.g. from a command-line option"""
+        with self._lock:
+            self.interval = 1.0 / rate if rate > 0 else 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def get(url: str, params: Optional[Dict[str, Any]] = None, endpoint: Optional[str] = None,
+        quota_units: int = 0, max_retries: int = 2, backoff: float = 1.0, timeout: float = 30,
+        limiter: Optional[RateLimiter] = None) -> requests.Response:
+    """
+    `requests.get` that records latency, bytes, status and quota units for
+    `endpoint` and retries transient failures with exponential backoff.
+    Every attempt, retries included, first waits for a slot from limiter.
+    """
+    endpoint = endpoint or url
+
+    for attempt in range(max_retries + 1):
+        if limiter is not None:
+            limiter.wait()
+        start = time.perf_counter()
+        try:
+            response = requests.get(url, params=params, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            REGISTRY.record_request(endpoint, time.perf_counter() - start, error=True)
+            if attempt == max_retries:
+                raise
+            logger.warning("Request failed, retrying", extra={"endpoint": endpoint, "attempt": attempt + 1, "error": str(e)})
+        else:
+            REGISTRY.record_request(endpoint, time.perf_counter() - start, len(response.content),
+                                    response.status_code, quota_units)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+                return response
+            logger.warning("Transient HTTP status, retrying",
+                           extra={"endpoint": endpoint, "attempt": attempt + 1, "status": response.status_code})
+
+        REGISTRY.record_retry(endpoint)
+        time.sleep(backoff * (2 ** attempt))
@@ -0,0 +1,58 @@
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Format records as `time level logger message key=value ...`, or as one
+    JSON object per line when json_format is True.
+    Fields passed with `extra={...}` are appended as structured fields.
+    """
+    def __init__(self, json_format: bool = False):
+        super().__init__()
+        self.json_format = json_format
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {k: v for k, v in vars(record).items() if k not in _STANDARD_ATTRS}
+        timestamp = datetime.fromtimestamp(record.created, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+        if self.json_format:
+            entry = {
+                "ts": timestamp,
+                "level": record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage(),
+                **fields
+            }
+            if record.exc_info:
+                entry["exc"] = self.formatException(record.exc_info)
+            return json.dumps(entry, ensure_ascii=False, default=str)
+
+        line = f"{timestamp} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+def configure_logging(level: str = "INFO", json_format: bool = False, stream: Optional[object] = None):
+    """
+    Configure the root logger for a script run. Safe to call more than once.
+    """
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(StructuredFormatter(json_format))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a logger for a script or module"""
+    return logging.getLogger(name)
@@ -0,0 +1,374 @@
+import argparse
+import io
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from kpop_shorts.log import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+
+# Characters not allowed in Prometheus metric names
+INVALID_METRIC_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+def prometheus_name(name: str) -> str:
+    """A free-form counter name as a valid metric name fragment"""
+    return INVALID_METRIC_CHARS.sub("_", name)
+
+def prometheus_label(value: str) -> str:
+    """A label value escaped for the text exposition format"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Histogram:
+    """
+    Fixed-bucket histogram with count, sum, min and max
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate a quantile from the bucket upper bounds"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.max if bound == float("inf") else min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": {("+Inf" if b == float("inf") else str(b)): c for b, c in zip(self.buckets, self.counts)}
+        }
+
+class EndpointStats:
+    """Per-endpoint request statistics"""
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.quota_units = 0
+        self.status_codes: Dict[int, int] = {}
+        self.latency = Histogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "quota_units": self.quota_units,
+            "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+            "latency_seconds": self.latency.to_dict()
+        }
+
+class StageStats:
+    """Per-stage timing and output statistics"""
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.items = 0
+        self.duration = Histogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "items": self.items,
+            "seconds": self.duration.to_dict()
+        }
+
+class StageHandle:
+    """Returned by `Metrics.stage()` so the caller can report produced items"""
+    def __init__(self, stats: StageStats, lock: threading.Lock):
+        self._stats = stats
+        self._lock = lock
+
+    def add_items(self, count: int = 1):
+        with self._lock:
+            self._stats.items += count
+
+class Metrics:
+    """
+    In-process registry of request, stage and free-form counters for one run.
+    Updates are locked so worker threads can share it.
+    """
+    def __init__(self):
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, float] = {}
+        self.profiling = False
+        self._profiles: Dict[str, Any] = {}
+        self._profile_active = False
+        self._memory: Dict[str, Dict[str, Any]] = {}
+
+    def endpoint(self, name: str) -> EndpointStats:
+        if name not in self.endpoints:
+            self.endpoints[name] = EndpointStats()
+        return self.endpoints[name]
+
+    def record_request(self, endpoint: str, seconds: float, nbytes: int = 0, status: Optional[int] = None,
+                       quota_units: int = 0, error: bool = False):
+        """Record one HTTP request against an endpoint"""
+        with self._lock:
+            stats = self.endpoint(endpoint)
+            stats.requests += 1
+            stats.bytes += nbytes
+            stats.quota_units += quota_units
+            stats.latency.observe(seconds)
+            if status is not None:
+                stats.status_codes[status] = stats.status_codes.get(status, 0) + 1
+            if error or (status is not None and status >= 400):
+                stats.errors += 1
+
+    def record_retry(self, endpoint: str):
+        with self._lock:
+            self.endpoint(endpoint).retries += 1
+
+    def inc(self, name: str, value: float = 1):
+        """Increment a free-form counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageHandle]:
+        """
+        Time a pipeline stage. When profiling is enabled, the outermost active
+        stage is also run under cProfile and tracemalloc; with stages running
+        on several threads (`serve`), one of them at a time is profiled.
+        """
+        with self._lock:
+            stats = self.stages.setdefault(name, StageStats())
+            stats.calls += 1
+            claimed = self.profiling and not self._profile_active
+            if claimed:
+                self._profile_active = True
+
+        profile = None
+        if claimed:
+            # Profiling modules are imported only when --profile is used
+            import cProfile
+            import tracemalloc
+            with self._lock:
+                profile = self._profiles.setdefault(name, cProfile.Profile())
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            profile.enable()
+
+        start = time.perf_counter()
+        try:
+            yield StageHandle(stats, self._lock)
+        except BaseException:
+            with self._lock:
+                stats.errors += 1
+            raise
+        finally:
+            with self._lock:
+                stats.duration.observe(time.perf_counter() - start)
+            if profile is not None:
+                profile.disable()
+                peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+                with self._lock:
+                    self._profile_active = False
+                    if peak is not None:
+                        memory = self._memory.setdefault(name, {"peak_bytes": 0})
+                        memory["peak_bytes"] = max(memory["peak_bytes"], peak)
+
+    def enable_profiling(self):
+        """Profile stages with cProfile and track peak memory with tracemalloc"""
+        import tracemalloc
+        self.profiling = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    def totals(self) -> Dict[str, int]:
+        """Request totals across all endpoints"""
+        with self._lock:
+            return self._totals()
+
+    def _totals(self) -> Dict[str, int]:
+        return {
+            "requests": sum(e.requests for e in self.endpoints.values()),
+            "errors": sum(e.errors for e in self.endpoints.values()),
+            "retries": sum(e.retries for e in self.endpoints.values()),
+            "bytes": sum(e.bytes for e in self.endpoints.values()),
+            "quota_units": sum(e.quota_units for e in self.endpoints.values())
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """Build the JSON-serializable run report"""
+        finished_at = time.time()
+        # Worker threads may still be recording while the report is built
+        with self._lock:
+            return {
+                "started_at": datetime.fromtimestamp(self.started_at, tz=timezone.utc).isoformat(),
+                "finished_at": datetime.fromtimestamp(finished_at, tz=timezone.utc).isoformat(),
+                "duration_seconds": round(finished_at - self.started_at, 3),
+                "totals": self._totals(),
+                "endpoints": {name: stats.to_dict() for name, stats in sorted(self.endpoints.items())},
+                "stages": {name: stats.to_dict() for name, stats in self.stages.items()},
+                "counters": dict(sorted(self.counters.items())),
+                "memory": {name: dict(memory) for name, memory in self._memory.items()}
+            }
+
+    def write_json_report(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        logger.info("Wrote run report", extra={"path": path})
+
+    def to_prometheus(self, prefix: str = "kpop_shorts") -> str:
+        """Render the registry in the Prometheus text exposition format"""
+        with self._lock:
+            return self._prometheus(prefix)
+
+    def _prometheus(self, prefix: str) -> str:
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def histogram(name: str, label: str, value: str, hist: Histogram):
+            value = prometheus_label(value)
+            cumulative = 0
+            for bound, bucket_count in zip(hist.buckets, hist.counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{prefix}_{name}_bucket{{{label}="{value}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_{name}_sum{{{label}="{value}"}} {hist.total}')
+            lines.append(f'{prefix}_{name}_count{{{label}="{value}"}} {hist.count}')
+
+        endpoint_counters = [
+            ("requests_total", "requests", "HTTP requests sent"),
+            ("request_errors_total", "errors", "HTTP requests that failed or returned >= 400"),
+            ("request_retries_total", "retries", "HTTP requests retried"),
+            ("response_bytes_total", "bytes", "Response bytes received"),
+            ("quota_units_total", "quota_units", "YouTube Data API quota units spent")
+        ]
+        for name, attr, help_text in endpoint_counters:
+            metric(name, "counter", help_text)
+            for endpoint, stats in sorted(self.endpoints.items()):
+                lines.append(f'{prefix}_{name}{{endpoint="{prometheus_label(endpoint)}"}} {getattr(stats, attr)}')
+
+        metric("request_latency_seconds", "histogram", "HTTP request latency")
+        for endpoint, stats in sorted(self.endpoints.items()):
+            histogram("request_latency_seconds", "endpoint", endpoint, stats.latency)
+
+        metric("stage_items_total", "counter", "Items produced by a pipeline stage")
+        for stage, stats in self.stages.items():
+            lines.append(f'{prefix}_stage_items_total{{stage="{prometheus_label(stage)}"}} {stats.items}')
+
+        metric("stage_duration_seconds", "histogram", "Pipeline stage duration")
+        for stage, stats in self.stages.items():
+            histogram("stage_duration_seconds", "stage", stage, stats.duration)
+
+        # Counters whose names only differ in invalid characters share one metric
+        counters: Dict[str, float] = {}
+        for name, value in self.counters.items():
+            key = prometheus_name(name)
+            counters[key] = counters.get(key, 0) + value
+        for name, value in sorted(counters.items()):
+            metric(f"{name}_total", "counter", name.replace("_", " "))
+            lines.append(f"{prefix}_{name}_total {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        logger.info("Wrote Prometheus metrics", extra={"path": path})
+
+    def write_profiles(self, directory: str, top: int = 25):
+        """
+        Dump one .prof file per profiled stage plus a text summary of the
+        hottest functions and the largest allocation sites.
+        """
+        import pstats
+        import tracemalloc
+        os.makedirs(directory, exist_ok=True)
+        summary = io.StringIO()
+
+        for name, profile in self._profiles.items():
+            safe_name = "".join(c if c.isalnum() else "_" for c in name)
+            profile.dump_stats(os.path.join(directory, f"{safe_name}.prof"))
+            summary.write(f"===== stage: {name} =====\n")
+            stats = pstats.Stats(profile, stream=summary)
+            stats.sort_stats("cumulative").print_stats(top)
+
+        if tracemalloc.is_tracing():
+            summary.write("===== top allocation sites =====\n")
+            snapshot = tracemalloc.take_snapshot()
+            for stat in snapshot.statistics("lineno")[:top]:
+                summary.write(f"{stat}\n")
+
+        summary_path = os.path.join(directory, "summary.txt")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+        logger.info("Wrote profile summary", extra={"path": summary_path})
+
+    def log_summary(self):
+        with self._lock:
+            summary = {
+                "seconds": round(time.time() - self.started_at, 1),
+                **self._totals(),
+                **{f"stage_{name}_items": stats.items for name, stats in self.stages.items() if stats.items},
+                **{name: value for name, value in sorted(self.counters.items())}
+            }
+        logger.info("Run finished", extra=summary)
+
+# Process-wide registry shared by all the scripts
+REGISTRY = Metrics()
+
+def setup_from_args(args: argparse.Namespace):
+    """Configure logging and profiling from the shared observability flags"""
+    configure_logging(args.log_level, args.log_json)
+    if args.profile:
+        REGISTRY.enable_profiling()
+
+def finish_from_args(args: argparse.Namespace):
+    """Write whatever outputs the shared flags asked for"""
+    REGISTRY.log_summary()
+    if args.report:
+        REGISTRY.write_json_report(args.report)
+    if args.prometheus:
+        REGISTRY.write_prometheus(args.prometheus)
+    if args.profile:
+        REGISTRY.write_profiles(args.profile)
@@ -0,0 +1,168 @@
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from kpop_shorts.serialization import read_json, write_json
+
+SHORTS_URL = "https://www.youtube.com/shorts/{}"
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+class Short:
+    """
+    One YouTube short. Channel names and hashtags are interned so the
+    thousands of shorts that share them point at a single string object, and
+    the url is derived from video_id instead of being stored.
+    """
+    __slots__ = ("video_id", "title", "channel", "upload_time", "views", "likes", "comments", "hashtags")
+
+    def __init__(self, video_id: str, title: str, channel: str, upload_time: str,
+                 views: int = 0, likes: int = 0, comments: int = 0, hashtags: Iterable[str] = ()):
+        self.video_id = video_id
+        self.title = title
+        self.channel = _intern(channel)
+        self.upload_time = upload_time
+        self.views = views
+        self.likes = likes
+        self.comments = comments
+        self.hashtags: Tuple[str, ...] = tuple(sys.intern(tag) for tag in hashtags)
+
+    @property
+    def url(self) -> str:
+        return SHORTS_URL.format(self.video_id)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Short":
+        return cls(
+            data["video_id"],
+            data.get("title", ""),
+            data.get("channel", ""),
+            data.get("upload_time", ""),
+            data.get("views", 0),
+            data.get("likes", 0),
+            data.get("comments", 0),
+            data.get("hashtags", ())
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "video_id": self.video_id,
+            "title": self.title,
+            "channel": self.channel,
+            "upload_time": self.upload_time,
+            "views": self.views,
+            "likes": self.likes,
+            "comments": self.comments,
+            "hashtags": list(self.hashtags),
+            "url": self.url
+        }
+
+    def __repr__(self) -> str:
+        return f"Short({self.video_id!r}, {self.title!r})"
+
+class Group:
+    """
+    A K-pop group's channel and the shorts fetched for it. group_id is the
+    canonical ID shared with the other outputs (kpop_shorts/entities.py).
+    """
+    __slots__ = ("name", "korean_name", "channel_id", "channel_url", "shorts", "group_id")
+
+    def __init__(self, name: str, korean_name: str, channel_id: str, channel_url: str, shorts: Optional[List[Short]] = None,
+                 group_id: str = ""):
+        self.name = _intern(name)
+        self.group_id = _intern(group_id)
+        self.korean_name = _intern(korean_name)
+        self.channel_id = _intern(channel_id)
+        self.channel_url = _intern(channel_url)
+        self.shorts: List[Short] = shorts if shorts is not None else []
+
+    @property
+    def shorts_count(self) -> int:
+        return len(self.shorts)
+
+    def merge_shorts(self, shorts: List[Short]):
+        """
+        Add freshly fetched shorts (newest first), replacing any existing
+        short with the same video_id, so the list stays newest first.
+        """
+        fresh = {short.video_id for short in shorts}
+        self.shorts = list(shorts) + [short for short in self.shorts if short.video_id not in fresh]
+
+    def empty_copy(self) -> "Group":
+        """A group with the same channel metadata and no shorts"""
+        return Group(self.name, self.korean_name, self.channel_id, self.channel_url, group_id=self.group_id)
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "Group":
+        return cls(
+            name,
+            data.get("korean_name", ""),
+            data.get("channel_id", ""),
+            data.get("channel_url", ""),
+            [short if isinstance(short, Short) else Short.from_dict(short) for short in data.get("shorts", [])],
+            data.get("group_id", "")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"group_id": self.group_id} if self.group_id else {}
+        data.update({
+            "korean_name": self.korean_name,
+            "channel_id": self.channel_id,
+            "channel_url": self.channel_url,
+            "shorts_count": self.shorts_count,
+            "shorts": [short.to_dict() for short in self.shorts]
+        })
+        return data
+
+    def __repr__(self) -> str:
+        return f"Group({self.name!r}, shorts={self.shorts_count})"
+
+Dataset = Dict[str, Group]
+
+def dataset_from_dict(data: Dict[str, Any]) -> Dataset:
+    """
+    Convert a raw {group name: group dict} mapping. Each group's raw dict is
+    released as soon as it is converted so the two copies never coexist.
+    """
+    dataset = {}
+    for name in list(data):
+        dataset[name] = Group.from_dict(name, data.pop(name))
+    return dataset
+
+def dataset_to_dict(dataset: Dataset) -> Dict[str, Any]:
+    return {name: group.to_dict() for name, group in dataset.items()}
+
+def iter_shorts(dataset: Dataset) -> Iterator[Tuple[Group, Short]]:
+    """Yield (group, short) for every short in the dataset"""
+    for group in dataset.values():
+        for short in group.shorts:
+            yield group, short
+
+def _short_hook(obj: Dict[str, Any]) -> Any:
+    # Called by the stdlib JSON decoder for every object, innermost first, so
+    # each short is converted as soon as it is parsed instead of after the whole file
+    return Short.from_dict(obj) if "video_id" in obj else obj
+
+def load_dataset(path: str) -> Dataset:
+    """
+    Load a shorts dataset file ({group name: {..., "shorts": [...]}}).
+    .json.gz and .json.zst files are decompressed transparently; .jsonl
+    files are read as indexed stores (kpop_shorts/shortstore.py).
+    Raises FileNotFoundError / json.JSONDecodeError like json.load.
+    """
+    if path.endswith(".jsonl"):
+        from kpop_shorts.shortstore import read_store
+        return read_store(path)
+    return dataset_from_dict(read_json(path, object_hook=_short_hook))
+
+def save_dataset(dataset: Dataset, path: str, pretty: bool = False):
+    """
+    Write a shorts dataset file in the same layout load_dataset reads.
+    Compact unless pretty is set; compressed if path ends in .gz or .zst;
+    a .jsonl path is rewritten as an indexed store.
+    """
+    if path.endswith(".jsonl"):
+        from kpop_shorts.shortstore import write_store
+        write_store(dataset, path)
+        return
+    write_json(dataset_to_dict(dataset), path, pretty)
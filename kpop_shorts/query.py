@@ -0,0 +1,177 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from kpop_shorts.model import Dataset, Short
+
+SORT_FIELDS = ("views", "likes", "comments", "upload_time")
+
+# Sorts after every character of an upload_time, so `to + DATE_END` is an
+# inclusive upper bound for a date or datetime prefix
+DATE_END = "~"
+
+def normalize_hashtag(tag: str) -> str:
+    tag = tag.strip().lower()
+    return tag if tag.startswith("#") else "#" + tag
+
+class QueryError(ValueError):
+    """Invalid query parameters; reported to the client as 400"""
+
+class Query:
+    """Filters, sort order and page of one shorts query"""
+    __slots__ = ("group", "channel_id", "hashtags", "date_from", "date_to", "sort", "descending", "offset", "limit")
+
+    def __init__(self, group: Optional[str] = None, channel_id: Optional[str] = None, hashtags: Tuple[str, ...] = (),
+                 date_from: Optional[str] = None, date_to: Optional[str] = None, sort: str = "views",
+                 descending: bool = True, offset: int = 0, limit: int = 20):
+        self.group = group
+        self.channel_id = channel_id
+        self.hashtags = tuple(normalize_hashtag(tag) for tag in hashtags)
+        self.date_from = date_from
+        self.date_to = date_to
+        self.sort = sort
+        self.descending = descending
+        self.offset = offset
+        self.limit = limit
+
+    @classmethod
+    def from_params(cls, params: Dict[str, List[str]], max_limit: int = 500) -> "Query":
+        """Build from parsed query string parameters (`urllib.parse.parse_qs` output)"""
+        def one(name: str) -> Optional[str]:
+            values = params.get(name)
+            return values[-1] if values else None
+
+        def integer(name: str, default: int) -> int:
+            value = one(name)
+            if value is None:
+                return default
+            try:
+                number = int(value)
+            except ValueError:
+                raise QueryError(f"{name} must be an integer") from None
+            if number < 0:
+                raise QueryError(f"{name} must not be negative")
+            return number
+
+        sort = one("sort") or "-views"
+        descending = sort.startswith("-")
+        sort = sort.lstrip("-")
+        if sort not in SORT_FIELDS:
+            raise QueryError(f"sort must be one of {', '.join(SORT_FIELDS)} (prefix with - for descending)")
+
+        return cls(
+            group=one("group"),
+            channel_id=one("channel_id"),
+            hashtags=tuple(params.get("hashtag", ())),
+            date_from=one("from"),
+            date_to=one("to"),
+            sort=sort,
+            descending=descending,
+            offset=integer("offset", 0),
+            limit=min(integer("limit", 20), max_limit)
+        )
+
+class ShortsIndex:
+    """
+    In-memory indexes over one dataset: short positions by video_id, posting
+    lists by group, channel_id and hashtag, upload_time in sorted order for date
+    ranges, and every short pre-sorted by each sort field so unfiltered
+    queries are a slice.
+    """
+    def __init__(self, dataset: Dataset):
+        self.shorts: List[Short] = []
+        self.short_groups: List[str] = []
+        self.by_video_id: Dict[str, int] = {}
+        self.by_group: Dict[str, List[int]] = {}
+        self.by_channel_id: Dict[str, List[int]] = {}
+        self.by_hashtag: Dict[str, List[int]] = {}
+        self.groups: Dict[str, Dict[str, Any]] = {}
+
+        for name, group in dataset.items():
+            positions = self.by_group.setdefault(name, [])
+            channel_positions = self.by_channel_id.setdefault(group.channel_id, []) if group.channel_id else None
+            for short in group.shorts:
+                position = len(self.shorts)
+                self.by_video_id[short.video_id] = position
+                self.shorts.append(short)
+                self.short_groups.append(name)
+                positions.append(position)
+                if channel_positions is not None:
+                    channel_positions.append(position)
+                for tag in {tag.lower() for tag in short.hashtags}:
+                    self.by_hashtag.setdefault(tag, []).append(position)
+            self.groups[name] = {
+                "name": name,
+                "korean_name": group.korean_name,
+                "channel_id": group.channel_id,
+                "channel_url": group.channel_url,
+                "shorts_count": len(positions)
+            }
+
+        by_upload = sorted(range(len(self.shorts)), key=lambda i: self.shorts[i].upload_time)
+        self.upload_keys = [self.shorts[i].upload_time for i in by_upload]
+        self.upload_positions = by_upload
+        # Descending order of each field; ascending is the reverse
+        self.sorted_by = {
+            field: sorted(range(len(self.shorts)), key=lambda i, f=field: getattr(self.shorts[i], f), reverse=True)
+            for field in SORT_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self.shorts)
+
+    def _candidates(self, query: Query) -> Optional[List[int]]:
+        """Positions matching every filter, or None when the query has no filters"""
+        postings = []
+        if query.group is not None:
+            postings.append(self.by_group.get(query.group, []))
+        if query.channel_id is not None:
+            postings.append(self.by_channel_id.get(query.channel_id, []))
+        for tag in query.hashtags:
+            postings.append(self.by_hashtag.get(tag, []))
+        if query.date_from or query.date_to:
+            start = bisect_left(self.upload_keys, query.date_from) if query.date_from else 0
+            end = bisect_right(self.upload_keys, query.date_to + DATE_END) if query.date_to else len(self.upload_keys)
+            postings.append(self.upload_positions[start:end])
+
+        if not postings:
+            return None
+        # Intersect starting from the shortest posting list
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for positions in postings[1:]:
+            if not matches:
+                break
+            matches.intersection_update(positions)
+        return list(matches)
+
+    def get(self, video_id: str) -> Optional[Tuple[str, Short]]:
+        position = self.by_video_id.get(video_id)
+        return None if position is None else (self.short_groups[position], self.shorts[position])
+
+    def search(self, query: Query) -> Tuple[int, List[Tuple[str, Short]]]:
+        """(total matches, the requested page of (group name, short))"""
+        candidates = self._candidates(query)
+        end = query.offset + query.limit
+
+        if candidates is None:
+            order = self.sorted_by[query.sort]
+            total = len(order)
+            if query.descending:
+                page = order[query.offset:end]
+            else:
+                page = order[max(total - end, 0):max(total - query.offset, 0)][::-1]
+        else:
+            total = len(candidates)
+
+            def key(i: int):
+                # Ties broken by position so pages are stable across requests
+                return getattr(self.shorts[i], query.sort), -i
+
+            if end * 4 < total:
+                select = heapq.nlargest if query.descending else heapq.nsmallest
+                page = select(end, candidates, key=key)[query.offset:]
+            else:
+                page = sorted(candidates, key=key, reverse=query.descending)[query.offset:end]
+
+        return total, [(self.short_groups[i], self.shorts[i]) for i in page]
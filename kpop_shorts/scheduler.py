@@ -0,0 +1,134 @@
+import heapq
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kpop_shorts.model import Group
+from kpop_shorts.serialization import read_json, write_json
+
+DAY = 86400.0
+UPLOAD_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def parse_upload_time(value: str) -> float:
+    """Epoch seconds of a short's upload_time (stored as UTC)"""
+    return datetime.strptime(value, UPLOAD_TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+
+class ChannelState:
+    """Polling state of one channel"""
+    __slots__ = ("name", "rate", "last_polled", "last_upload", "next_due")
+
+    def __init__(self, name: str, rate: float, last_polled: Optional[float] = None,
+                 last_upload: Optional[float] = None, next_due: float = 0.0):
+        self.name = name
+        self.rate = rate                # estimated uploads per day
+        self.last_polled = last_polled
+        self.last_upload = last_upload  # newest upload time we know about
+        self.next_due = next_due
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        return {
+            "rate": self.rate,
+            "last_polled": self.last_polled,
+            "last_upload": self.last_upload,
+            "next_due": self.next_due
+        }
+
+    def __repr__(self) -> str:
+        return f"ChannelState({self.name!r}, rate={self.rate:.3f}/day)"
+
+class PollScheduler:
+    """
+    Decides which channels to poll next. Each channel's upload rate is
+    estimated from the upload times in the dataset (smoothed towards a prior
+    so a channel with little history is neither ignored nor hammered), and
+    its poll interval is the time expected to produce `target_new_per_poll`
+    new shorts, clamped to [min_interval, max_interval]. Channels live in a
+    heap ordered by next-due time; among the channels that are due, the ones
+    with the most expected new shorts are polled first so a limited budget
+    goes where the new shorts are.
+    """
+    def __init__(self, min_interval: float = 6 * 3600, max_interval: float = 30 * DAY,
+                 target_new_per_poll: float = 1.0, window_days: float = 180,
+                 prior_uploads: float = 1.0, prior_days: float = 60):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new_per_poll = target_new_per_poll
+        self.window_days = window_days
+        self.prior_uploads = prior_uploads
+        self.prior_days = prior_days
+        self.channels: Dict[str, ChannelState] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def estimate_rate(self, upload_times: Iterable[float], now: float) -> float:
+        """Smoothed uploads per day over the trailing window"""
+        since = now - self.window_days * DAY
+        recent = sum(1 for t in upload_times if t >= since)
+        return (recent + self.prior_uploads) / (self.window_days + self.prior_days)
+
+    def interval(self, rate: float) -> float:
+        seconds = self.target_new_per_poll / rate * DAY if rate > 0 else self.max_interval
+        return min(max(seconds, self.min_interval), self.max_interval)
+
+    def expected_new(self, state: ChannelState, now: float) -> float:
+        """Expected number of unseen shorts if the channel were polled now"""
+        since = state.last_polled if state.last_polled is not None else now - self.window_days * DAY
+        return state.rate * max(now - since, 0) / DAY
+
+    def add_channel(self, name: str, group: Optional[Group], now: float, saved: Optional[Dict] = None):
+        """
+        Register a channel. History comes from its group in the dataset (if
+        any); previously saved polling state is reused when available.
+        """
+        upload_times = [parse_upload_time(s.upload_time) for s in group.shorts] if group else []
+        state = ChannelState(name, self.estimate_rate(upload_times, now),
+                             last_upload=max(upload_times) if upload_times else None)
+        if saved:
+            state.last_polled = saved.get("last_polled")
+            state.next_due = saved.get("next_due") or 0.0
+            if saved.get("last_upload") and (state.last_upload is None or saved["last_upload"] > state.last_upload):
+                state.last_upload = saved["last_upload"]
+        # Channels never polled are due immediately
+        self.channels[name] = state
+        heapq.heappush(self._heap, (state.next_due, name))
+
+    def pop_due(self, now: float) -> List[ChannelState]:
+        """Remove and return every due channel, highest expected yield first"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            next_due, name = heapq.heappop(self._heap)
+            state = self.channels[name]
+            if state.next_due != next_due:
+                continue  # stale heap entry left behind by a reschedule
+            due.append(state)
+        due.sort(key=lambda state: self.expected_new(state, now), reverse=True)
+        return due
+
+    def defer(self, state: ChannelState):
+        """Put a popped channel back without polling it (e.g. budget ran out)"""
+        heapq.heappush(self._heap, (state.next_due, state.name))
+
+    def record_poll(self, name: str, group: Optional[Group], now: float):
+        """Re-estimate a channel's rate from its updated history and reschedule it"""
+        state = self.channels[name]
+        upload_times = [parse_upload_time(s.upload_time) for s in group.shorts] if group else []
+        state.rate = self.estimate_rate(upload_times, now)
+        if upload_times:
+            state.last_upload = max(upload_times)
+        state.last_polled = now
+        state.next_due = now + self.interval(state.rate)
+        heapq.heappush(self._heap, (state.next_due, name))
+
+    def next_wakeup(self) -> Optional[float]:
+        """When the earliest channel becomes due, or None if nothing is scheduled"""
+        while self._heap and self.channels[self._heap[0][1]].next_due != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def load_state(self, path: str) -> Dict[str, Dict]:
+        """Saved per-channel state from a previous run ({} if there is none)"""
+        if not os.path.exists(path):
+            return {}
+        return read_json(path).get("channels", {})
+
+    def save_state(self, path: str):
+        write_json({"channels": {name: state.to_dict() for name, state in self.channels.items()}}, path, pretty=True)
@@ -0,0 +1,409 @@
+import argparse
+import heapq
+import math
+import mmap
+import os
+import re
+import shutil
+import unicodedata
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent updates of one index are then not serialized
+    fcntl = None
+
+from kpop_shorts.config import get_config
+from kpop_shorts.log import get_logger
+from kpop_shorts.metrics import REGISTRY
+from kpop_shorts.model import load_dataset
+from kpop_shorts.serialization import read_json, write_json
+
+logger = get_logger(__name__)
+
+FORMAT_VERSION = 2
+MANIFEST = "manifest.json"
+# Merge everything into one segment once incremental updates leave more than this
+MAX_SEGMENTS = 8
+# ... or once this share of the indexed documents has been superseded or removed
+MAX_DELETED_RATIO = 0.3
+
+# Scripts written without spaces between words: Hangul (jamo, compatibility
+# jamo, syllables), kana and CJK ideographs. Runs of these are indexed as
+# overlapping character bigrams so any part of an unspaced phrase matches.
+_CJK = "\u1100-\u11ff\u3130-\u318f\uac00-\ud7af\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff"
+CJK_RE = re.compile(f"[{_CJK}]")
+TOKEN_RE = re.compile(f"[{_CJK}]+|[^\\W_{_CJK}]+")
+
+def tokenize(text: str) -> List[str]:
+    """
+    NFKC-normalized, casefolded tokens: whole words for space-delimited
+    scripts, character bigrams (or the single character) for Hangul/CJK runs.
+    """
+    tokens = []
+    for run in TOKEN_RE.findall(unicodedata.normalize("NFKC", text).casefold()):
+        if len(run) > 1 and CJK_RE.match(run):
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+def encode_postings(postings: Iterable[Tuple[int, int]]) -> bytes:
+    """(doc id, term frequency) pairs in ascending doc order as varint doc-id deltas and frequencies"""
+    out = bytearray()
+    previous = 0
+    for doc, tf in postings:
+        for value in (doc - previous, tf):
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        previous = doc
+    return bytes(out)
+
+def decode_postings(data: bytes) -> List[Tuple[int, int]]:
+    """Inverse of encode_postings()"""
+    values = []
+    value = shift = 0
+    for byte in data:
+        if byte < 0x80:
+            values.append(value | (byte << shift))
+            value = shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+    return list(zip(accumulate(values[0::2]), values[1::2]))
+
+class Segment:
+    """
+    One immutable slice of the index on disk:
+      docs.json     doc records (id, kind, group, title, url, length, hash) in doc id order
+      lexicon.json  term -> [byte offset, byte length, document frequency]
+      postings.bin  concatenated encode_postings() blocks, memory-mapped
+    Doc ids are global: a segment's docs follow those of the segments listed
+    before it in the manifest.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.docs: List[Dict[str, Any]] = read_json(os.path.join(directory, "docs.json"))
+        self.lexicon: Dict[str, List[int]] = read_json(os.path.join(directory, "lexicon.json"))
+        self._file = open(os.path.join(directory, "postings.bin"), "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._postings = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def postings(self, term: str) -> List[Tuple[int, int]]:
+        entry = self.lexicon.get(term)
+        if entry is None:
+            return []
+        offset, length, _ = entry
+        return decode_postings(self._postings[offset:offset + length])
+
+    def df(self, term: str) -> int:
+        entry = self.lexicon.get(term)
+        return entry[2] if entry else 0
+
+    def close(self):
+        if isinstance(self._postings, mmap.mmap):
+            self._postings.close()
+        self._file.close()
+
+def write_segment(directory: str, docs: List[Dict[str, Any]], terms: Dict[str, List[Tuple[int, int]]]):
+    """Write a segment from doc records and term -> [(global doc id, tf), ...] postings"""
+    os.makedirs(directory, exist_ok=True)
+    lexicon = {}
+    with open(os.path.join(directory, "postings.bin"), "wb") as f:
+        offset = 0
+        for term in sorted(terms):
+            block = encode_postings(terms[term])
+            f.write(block)
+            lexicon[term] = [offset, len(block), len(terms[term])]
+            offset += len(block)
+    write_json(docs, os.path.join(directory, "docs.json"))
+    write_json(lexicon, os.path.join(directory, "lexicon.json"))
+
+def document_hash(doc: Dict[str, Any], text: str) -> int:
+    """Checksum of everything indexed or shown for a document, to tell when it must be re-indexed"""
+    fields = (doc["kind"], doc["group"], doc["title"], doc.get("url") or "", text)
+    return zlib.crc32("\x1f".join(fields).encode("utf-8"))
+
+def short_documents(dataset_path: str) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """(doc record, indexed text) for each short: title plus hashtags"""
+    for group_name, group in load_dataset(dataset_path).items():
+        for short in group.shorts:
+            doc = {"id": f"short:{short.video_id}", "kind": "short", "group": group_name, "title": short.title, "url": short.url}
+            yield doc, " ".join((short.title, *short.hashtags))
+
+def wiki_documents(info_path: str) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """(doc record, indexed text) for each group's Wikipedia introduction"""
+    for group_name, entry in read_json(info_path).items():
+        paragraphs = entry.get("info") or []
+        if not paragraphs:
+            continue
+        text = " ".join(paragraphs)
+        doc = {"id": f"wiki:{group_name}", "kind": "wiki", "group": group_name, "title": text[:120], "url": entry.get("url")}
+        yield doc, f"{group_name} {text}"
+
+class SearchIndex:
+    """
+    BM25 search over shorts titles/hashtags and Wikipedia intros, stored as
+    a list of segments in a directory. `add()` writes only the documents not
+    yet indexed, or whose text changed since, as a new segment, so updating
+    after a fetch costs time in proportion to the new shorts. Superseded and
+    removed documents stay in their segment but are listed as deleted in the
+    manifest and skipped by `search()`; `merge()` drops them for good, and
+    runs once there are more than MAX_SEGMENTS segments or too many deleted
+    documents. Until then they still count towards the BM25 statistics.
+    Nothing here is locked; concurrent writers go through `update_index()`.
+    """
+    def __init__(self, directory: str, k1: float = 1.2, b: float = 0.75):
+        self.directory = directory
+        self.k1 = k1
+        self.b = b
+        self.segments: List[Segment] = []
+        self.docs: List[Dict[str, Any]] = []
+        self.total_docs = 0
+        self.total_length = 0
+        self._norms: List[float] = []
+        self.deleted: Set[int] = set()
+        self._manifest: Dict[str, Any] = {"version": FORMAT_VERSION, "segments": [], "next_segment": 0, "deleted": []}
+        manifest_path = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest_path):
+            self._manifest = read_json(manifest_path)
+            if self._manifest.get("version") != FORMAT_VERSION:
+                raise ValueError(f"{directory} was written by an incompatible version; rebuild it with --rebuild")
+        self._open_segments()
+
+    def _open_segments(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+        self.docs = []
+        self.total_docs = 0
+        self.total_length = 0
+        for entry in self._manifest["segments"]:
+            segment = Segment(os.path.join(self.directory, entry["name"]))
+            self.segments.append(segment)
+            self.docs.extend(segment.docs)
+            self.total_docs += entry["docs"]
+            self.total_length += entry["length"]
+        self.deleted = set(self._manifest["deleted"])
+
+        # BM25 length normalization of every document, computed once per open
+        average_length = self.total_length / self.total_docs if self.total_docs else 1.0
+        self._norms = [self.k1 * (1 - self.b + self.b * doc["length"] / average_length) for doc in self.docs]
+
+    def _commit(self, segments: List[Dict[str, Any]], deleted: Set[int]):
+        """Point the manifest at `segments` and delete directories no longer listed"""
+        self._manifest["segments"] = segments
+        self._manifest["deleted"] = sorted(deleted)
+        write_json(self._manifest, os.path.join(self.directory, MANIFEST), pretty=True)
+        self._open_segments()
+        listed = {entry["name"] for entry in segments}
+        for name in os.listdir(self.directory):
+            if name.startswith("seg-") and name not in listed:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _new_segment_name(self) -> str:
+        name = f"seg-{self._manifest['next_segment']:05d}"
+        self._manifest["next_segment"] += 1
+        return name
+
+    def live_docs(self) -> Dict[str, int]:
+        """Document id -> global doc id of its current (not deleted) version"""
+        return {doc["id"]: doc_id for doc_id, doc in enumerate(self.docs) if doc_id not in self.deleted}
+
+    def indexed_ids(self) -> Set[str]:
+        return set(self.live_docs())
+
+    def _needs_merge(self) -> bool:
+        return len(self.segments) > MAX_SEGMENTS or len(self.deleted) > MAX_DELETED_RATIO * self.total_docs
+
+    def add(self, documents: Iterable[Tuple[Dict[str, Any], str]]) -> int:
+        """
+        Index the documents whose id isn't in the index yet or whose text,
+        group or title changed, deleting the version they replace; returns
+        how many were added
+        """
+        live = self.live_docs()
+        seen: Set[str] = set()
+        deleted = set(self.deleted)
+        docs: List[Dict[str, Any]] = []
+        terms: Dict[str, List[Tuple[int, int]]] = {}
+        length = 0
+        for doc, text in documents:
+            if doc["id"] in seen:
+                continue
+            seen.add(doc["id"])
+            text_hash = document_hash(doc, text)
+            previous = live.get(doc["id"])
+            if previous is not None:
+                if self.docs[previous].get("hash") == text_hash:
+                    continue
+                deleted.add(previous)
+            tokens = tokenize(text)
+            doc_id = self.total_docs + len(docs)
+            doc["length"] = len(tokens)
+            doc["hash"] = text_hash
+            docs.append(doc)
+            length += len(tokens)
+            for term, tf in Counter(tokens).items():
+                terms.setdefault(term, []).append((doc_id, tf))
+
+        if not docs:
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+        name = self._new_segment_name()
+        write_segment(os.path.join(self.directory, name), docs, terms)
+        self._commit(self._manifest["segments"] + [{"name": name, "docs": len(docs), "length": length}], deleted)
+        if self._needs_merge():
+            self.merge()
+        return len(docs)
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Delete the documents with these ids; returns how many were indexed"""
+        live = self.live_docs()
+        removed = {live[id_] for id_ in ids if id_ in live}
+        if not removed:
+            return 0
+        self._commit(self._manifest["segments"], self.deleted | removed)
+        if self._needs_merge():
+            self.merge()
+        return len(removed)
+
+    def merge(self):
+        """
+        Rewrite all segments as one without the deleted documents; postings
+        stay in doc order since doc ids are global and only shift down
+        """
+        renumbered: Dict[int, int] = {}
+        docs: List[Dict[str, Any]] = []
+        for doc_id, doc in enumerate(self.docs):
+            if doc_id not in self.deleted:
+                renumbered[doc_id] = len(docs)
+                docs.append(doc)
+        terms: Dict[str, List[Tuple[int, int]]] = {}
+        for segment in self.segments:
+            for term in segment.lexicon:
+                postings = [(renumbered[doc_id], tf) for doc_id, tf in segment.postings(term) if doc_id in renumbered]
+                if postings:
+                    terms.setdefault(term, []).extend(postings)
+        name = self._new_segment_name()
+        write_segment(os.path.join(self.directory, name), docs, terms)
+        self._commit([{"name": name, "docs": len(docs), "length": sum(doc["length"] for doc in docs)}], set())
+
+    def search(self, query: str, top: int = 10, kind: Optional[str] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """The `top` best (score, doc record) matches for query, best first"""
+        if not self.total_docs:
+            return []
+        scores: Dict[int, float] = {}
+        norms = self._norms
+        k1_plus_1 = self.k1 + 1
+
+        for term in set(tokenize(query)):
+            df = sum(segment.df(term) for segment in self.segments)
+            if not df:
+                continue
+            idf = math.log(1 + (self.total_docs - df + 0.5) / (df + 0.5))
+            for segment in self.segments:
+                for doc_id, tf in segment.postings(term):
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * k1_plus_1 / (tf + norms[doc_id])
+
+        if self.deleted:
+            scores = {doc_id: score for doc_id, score in scores.items() if doc_id not in self.deleted}
+        if kind is not None:
+            scores = {doc_id: score for doc_id, score in scores.items() if self.docs[doc_id]["kind"] == kind}
+        best = heapq.nlargest(top, scores.items(), key=lambda item: item[1])
+        return [(score, self.docs[doc_id]) for doc_id, score in best]
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+@contextmanager
+def _locked(directory: str) -> Iterator[None]:
+    """
+    Exclusive lock on the index directory (created if missing), so
+    concurrent updates don't write segments or the manifest over each other
+    """
+    os.makedirs(directory, exist_ok=True)
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)  # Released when fd is closed
+        yield
+    finally:
+        os.close(fd)
+
+def _tracked(documents: Iterable[Tuple[Dict[str, Any], str]], seen: Set[str]) -> Iterator[Tuple[Dict[str, Any], str]]:
+    for doc, text in documents:
+        seen.add(doc["id"])
+        yield doc, text
+
+def update_index(directory: str, dataset_paths: Iterable[str], wiki_path: Optional[str] = None,
+                 rebuild: bool = False, prune: bool = False) -> int:
+    """
+    Add new and changed shorts (and wiki intros) from the given files to the
+    index in directory. With prune, indexed shorts missing from all the
+    datasets (and intros missing from wiki_path, if given) are deleted.
+    Holds the directory lock throughout, so concurrent updates run one after
+    the other and each starts from the manifest the previous one wrote.
+    """
+    added = removed = 0
+    seen: Set[str] = set()
+    with _locked(directory):
+        if rebuild:
+            # Emptied rather than deleted, so the directory lock stays valid
+            for name in os.listdir(directory):
+                if name == MANIFEST:
+                    os.remove(os.path.join(directory, name))
+                elif name.startswith("seg-"):
+                    shutil.rmtree(os.path.join(directory, name))
+        index = SearchIndex(directory)
+        try:
+            with REGISTRY.stage("search_index") as stage:
+                complete = True
+                for path in dataset_paths:
+                    if os.path.exists(path):
+                        added += index.add(_tracked(short_documents(path), seen))
+                    else:
+                        complete = False
+                        logger.warning(f"Dataset {path} not found, not indexed")
+                kinds = {"short"} if complete else set()
+                if wiki_path:
+                    if os.path.exists(wiki_path):
+                        added += index.add(_tracked(wiki_documents(wiki_path), seen))
+                        kinds.add("wiki")
+                    else:
+                        logger.warning(f"Wikipedia data {wiki_path} not found, not indexed")
+                if prune:
+                    if not complete:
+                        logger.warning("Not pruning shorts from the index since a dataset is missing")
+                    removed = index.remove(doc["id"] for doc_id, doc in enumerate(index.docs)
+                                           if doc["kind"] in kinds and doc["id"] not in seen and doc_id not in index.deleted)
+                stage.add_items(added + removed)
+            logger.info(f"Indexed {added} new or changed documents, removed {removed}",
+                        extra={"documents": index.total_docs - len(index.deleted), "segments": len(index.segments)})
+        finally:
+            index.close()
+    return added
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts search`"""
+    if args.update or args.rebuild:
+        update_index(args.index, args.input or [get_config().hashtag_processed], args.wiki, args.rebuild, args.prune)
+    if not args.query:
+        return
+
+    index = SearchIndex(args.index)
+    try:
+        with REGISTRY.stage("search_query"):
+            results = index.search(args.query, args.top, args.kind)
+    finally:
+        index.close()
+    for rank, (score, doc) in enumerate(results, 1):
+        print(f"{rank:>3}. {score:6.2f}  [{doc['kind']}] {doc['group']}: {doc['title']}  {doc['url'] or ''}")
@@ -0,0 +1,82 @@
+import gzip
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is the fallback
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes. Compact by default; pretty uses a 2-space
+    indent and is meant for files people read by hand.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def loads(data: bytes, object_hook: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Any:
+    """
+    Parse JSON bytes. object_hook is only honoured by the stdlib backend;
+    callers must accept plain dicts when orjson is in use.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data, object_hook=object_hook)
+
+def _zstd():
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Reading or writing .zst files requires the 'zstandard' package") from None
+    return zstandard
+
+def compress(data: bytes, path: str) -> bytes:
+    """Compress data according to the file extension (.gz, .zst or none)"""
+    if path.endswith(".gz"):
+        return gzip.compress(data, compresslevel=6)
+    if path.endswith(".zst"):
+        return _zstd().compress(data, level=10)
+    return data
+
+def decompress(data: bytes, path: str) -> bytes:
+    """Inverse of compress()"""
+    if path.endswith(".gz"):
+        return gzip.decompress(data)
+    if path.endswith(".zst"):
+        return _zstd().decompress(data)
+    return data
+
+def read_json(path: str, object_hook: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Any:
+    """
+    Read a .json, .json.gz or .json.zst file.
+    Raises FileNotFoundError / json.JSONDecodeError like json.load.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return loads(decompress(data, path), object_hook)
+
+def write_json(obj: Any, path: str, pretty: bool = False):
+    """
+    Write obj to path, compressing based on the extension. The file is
+    written to a temporary name first so readers never see a partial file.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    data = compress(dumps(obj, pretty), path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
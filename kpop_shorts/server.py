@@ -0,0 +1,286 @@
+import argparse
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from kpop_shorts.config import get_config
+from kpop_shorts.log import get_logger
+from kpop_shorts.metrics import REGISTRY
+from kpop_shorts.model import load_dataset
+from kpop_shorts.query import Query, QueryError, ShortsIndex
+from kpop_shorts.serialization import dumps
+from kpop_shorts.shortstore import ShortStore, is_store_path
+
+logger = get_logger(__name__)
+
+ROUTES = ("/shorts", "/short", "/groups", "/datasets", "/health")
+
+class ResponseCache:
+    """LRU of encoded response bodies keyed by normalized request"""
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Tuple, body: bytes):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class QueryService:
+    """
+    Named datasets with their indexes, reloaded in the background when a
+    file's mtime changes. A reload builds the new index before swapping it
+    in, so requests keep being served from the old one meanwhile, and clears
+    the response cache. Datasets stored as indexed .jsonl files also answer
+    single-short lookups straight from the store; a replaced store is
+    closed once the last request reading it is done.
+    """
+    def __init__(self, paths: Dict[str, str], cache_size: int = 1024, max_limit: int = 500):
+        self.paths = paths
+        self.max_limit = max_limit
+        self.cache = ResponseCache(cache_size)
+        self.indexes: Dict[str, ShortsIndex] = {}
+        self.stores: Dict[str, ShortStore] = {}
+        self.loaded_at: Dict[str, float] = {}
+        self.generation = 0
+        self._mtimes: Dict[str, float] = {}
+        self._stop = threading.Event()
+        # Stores replaced by a reload are closed once no request is reading them
+        self._store_lock = threading.Lock()
+        self._store_users: Dict[ShortStore, int] = {}
+        self._retired: List[ShortStore] = []
+
+    def reload_changed(self) -> bool:
+        """Rebuild the index of every dataset whose file changed; True if any did"""
+        changed = False
+        for name, path in self.paths.items():
+            try:
+                mtime = os.path.getmtime(path)
+            except FileNotFoundError:
+                if name not in self._mtimes:
+                    logger.warning(f"Dataset {name} not found at {path}, will load it when it appears")
+                    self._mtimes[name] = 0.0
+                continue
+            if mtime == self._mtimes.get(name):
+                continue
+            store = None
+            try:
+                if is_store_path(path):
+                    store = ShortStore(path)
+                with REGISTRY.stage("build_index") as stage:
+                    index = ShortsIndex(load_dataset(path))
+                    stage.add_items(len(index))
+            except Exception as e:
+                # Most likely caught mid-write; try again on the next check
+                logger.warning(f"Could not load dataset {name} from {path}: {e}")
+                if store is not None:
+                    store.close()
+                continue
+            if store is not None:
+                self._swap_store(name, store)
+            indexes = dict(self.indexes)
+            indexes[name] = index
+            self.indexes = indexes
+            self.loaded_at[name] = time.time()
+            self._mtimes[name] = mtime
+            changed = True
+            logger.info(f"Loaded dataset {name}", extra={"path": path, "shorts": len(index)})
+        if changed:
+            self.generation += 1
+            self.cache.clear()
+        return changed
+
+    def _swap_store(self, name: str, store: Optional[ShortStore]):
+        """Serve `name` from store; the replaced one is closed once no request is reading it"""
+        with self._store_lock:
+            stores = dict(self.stores)
+            old = stores.pop(name, None)
+            if store is not None:
+                stores[name] = store
+            self.stores = stores
+            if old is not None:
+                self._retired.append(old)
+            self._close_retired()
+
+    def _close_retired(self):
+        """Close the retired stores no request holds; call with _store_lock held"""
+        for store in [store for store in self._retired if store not in self._store_users]:
+            store.close()
+            self._retired.remove(store)
+
+    @contextmanager
+    def _acquire_store(self, name: str) -> Iterator[Optional[ShortStore]]:
+        with self._store_lock:
+            store = self.stores.get(name)
+            if store is not None:
+                self._store_users[store] = self._store_users.get(store, 0) + 1
+        try:
+            yield store
+        finally:
+            if store is not None:
+                with self._store_lock:
+                    self._store_users[store] -= 1
+                    if not self._store_users[store]:
+                        del self._store_users[store]
+                        self._close_retired()
+
+    def watch(self, interval: float):
+        """Check the dataset files for changes every `interval` seconds on a daemon thread"""
+        def run():
+            while not self._stop.wait(interval):
+                self.reload_changed()
+        threading.Thread(target=run, name="dataset-watcher", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        for name in list(self.stores):
+            self._swap_store(name, None)
+
+    def handle(self, path: str, query_string: str) -> Tuple[int, bytes]:
+        """(status, JSON body) for a GET request"""
+        params = parse_qs(query_string)
+        if path == "/health":
+            return 200, dumps({"status": "ok"})
+        if path == "/datasets":
+            return 200, dumps({
+                name: {"shorts": len(index), "groups": len(index.groups), "loaded_at": self.loaded_at[name]}
+                for name, index in self.indexes.items()
+            })
+        if path == "/short":
+            return self.get_short(params)
+        if path not in ("/shorts", "/groups"):
+            return 404, dumps({"error": f"unknown path {path}"})
+
+        # The generation makes entries built from a replaced index unreachable
+        key = (self.generation, path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        body = self.cache.get(key)
+        if body is not None:
+            REGISTRY.inc("query_cache_hits")
+            return 200, body
+        REGISTRY.inc("query_cache_misses")
+
+        dataset = params.get("dataset", ["shorts"])[-1]
+        index = self.indexes.get(dataset)
+        if index is None:
+            return 404, dumps({"error": f"unknown dataset {dataset}", "datasets": sorted(self.indexes)})
+
+        if path == "/groups":
+            body = dumps({"dataset": dataset, "groups": list(index.groups.values())})
+        else:
+            try:
+                query = Query.from_params(params, self.max_limit)
+            except QueryError as e:
+                return 400, dumps({"error": str(e)})
+            total, page = index.search(query)
+            body = dumps({
+                "dataset": dataset,
+                "total": total,
+                "offset": query.offset,
+                "limit": query.limit,
+                "items": [{"group": group, **short.to_dict()} for group, short in page]
+            })
+        self.cache.put(key, body)
+        return 200, body
+
+    def get_short(self, params: Dict[str, List[str]]) -> Tuple[int, bytes]:
+        """One short by video_id; not cached, as a lookup costs about as much as a cache hit"""
+        dataset = params.get("dataset", ["shorts"])[-1]
+        video_id = params.get("video_id", [None])[-1]
+        if not video_id:
+            return 400, dumps({"error": "video_id is required"})
+        with self._acquire_store(dataset) as store:
+            source = store or self.indexes.get(dataset)
+            if source is None:
+                return 404, dumps({"error": f"unknown dataset {dataset}", "datasets": sorted(self.indexes)})
+            found = source.get(video_id)
+        if found is None:
+            return 404, dumps({"error": f"video {video_id} not in {dataset}"})
+        group, short = found
+        return 200, dumps({"dataset": dataset, "group": group, **short.to_dict()})
+
+def make_handler(service: QueryService):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so load from one client doesn't pay a TCP handshake per request
+        protocol_version = "HTTP/1.1"
+        # Headers and body are separate writes; with Nagle on, each response
+        # would wait out the client's delayed ACK (~40 ms)
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            stage_name = f"serve{url.path}" if url.path in ROUTES else "serve_other"
+            with REGISTRY.stage(stage_name) as stage:
+                try:
+                    status, body = service.handle(url.path, url.query)
+                except Exception:
+                    logger.exception(f"Error handling {self.path}")
+                    status, body = 500, dumps({"error": "internal error"})
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                stage.add_items()
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return Handler
+
+def parse_dataset_args(values) -> Dict[str, str]:
+    """NAME=PATH pairs from --dataset"""
+    paths = {}
+    for value in values:
+        name, sep, path = value.partition("=")
+        if not sep or not name or not path:
+            raise SystemExit(f"--dataset expects NAME=PATH, got {value!r}")
+        paths[name] = path
+    return paths
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts serve`"""
+    if args.dataset:
+        paths = parse_dataset_args(args.dataset)
+    else:
+        config = get_config()
+        paths = {
+            "shorts": config.hashtag_processed,
+            "challenge": config.challenge_shorts,
+            "non-challenge": config.non_challenge_shorts
+        }
+    service = QueryService(paths, args.cache_size, args.max_limit)
+    service.reload_changed()
+    if args.reload_interval > 0:
+        service.watch(args.reload_interval)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    server.daemon_threads = True
+    logger.info(f"Serving on http://{args.host}:{server.server_port}", extra={"datasets": ",".join(service.indexes)})
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        service.stop()
+        server.server_close()
@@ -0,0 +1,431 @@
+import argparse
+import glob
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends from concurrent processes are then not serialized
+    fcntl = None
+
+from kpop_shorts.config import get_config
+from kpop_shorts.log import get_logger
+from kpop_shorts.metrics import REGISTRY
+from kpop_shorts.model import Dataset, Group, Short, load_dataset
+from kpop_shorts.serialization import dumps, loads
+
+logger = get_logger(__name__)
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"KPSIDX\x00\x01"
+# magic, bytes of the JSONL file covered by the index, number of entries
+HEADER = struct.Struct("<8sQQ")
+# video_id hash, byte offset of the line, byte length of the line
+ENTRY = struct.Struct("<QQI")
+
+Location = Tuple[int, int]
+
+def is_store_path(path: str) -> bool:
+    return path.endswith(".jsonl")
+
+def index_path(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+def video_hash(video_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(video_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+def short_record(group_name: str, short: Short) -> Dict[str, Any]:
+    record = {"group": group_name, **short.to_dict()}
+    del record["url"]  # derived from video_id
+    return record
+
+def group_record(group: Group) -> Dict[str, Any]:
+    return {"group": group.name, "group_id": group.group_id, "korean_name": group.korean_name,
+            "channel_id": group.channel_id, "channel_url": group.channel_url}
+
+def dataset_records(dataset: Dataset) -> Iterator[Dict[str, Any]]:
+    """Each group's metadata line followed by one line per short"""
+    for name, group in dataset.items():
+        yield group_record(group)
+        for short in group.shorts:
+            yield short_record(name, short)
+
+def iter_lines(data, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """(byte offset, line including its newline) of each complete line from start"""
+    end = len(data)
+    while start < end:
+        newline = data.find(b"\n", start)
+        if newline < 0:
+            return  # Partial last line of an append still being written
+        yield start, data[start:newline + 1]
+        start = newline + 1
+
+def write_index(path: str, entries: List[Tuple[int, int, int]], data_size: int):
+    """Write the sorted (hash, offset, length) entries as path's index, atomically"""
+    tmp_path = index_path(path) + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(INDEX_MAGIC, data_size, len(entries)))
+        f.write(b"".join(ENTRY.pack(*entry) for entry in entries))
+    os.replace(tmp_path, index_path(path))
+
+class ShortStore:
+    """
+    Read side of a JSONL dataset: one JSON object per line, either a short
+    (with its "group") or a group's channel metadata (no "video_id"). Lines
+    are only ever appended; the latest line of a video_id wins.
+
+    The sidecar `<path>.idx` holds (blake2b-64 of video_id, offset, length)
+    entries sorted by hash. Both files are memory-mapped, so `get()` is a
+    binary search plus one line parse. Lines appended after the index was
+    written (e.g. by a writer that died) are found by scanning just that tail
+    when the store is opened.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+
+        self._index_file = None
+        self._index = b""
+        self._count = 0
+        indexed_size = 0
+        if os.path.exists(index_path(path)):
+            self._index_file = open(index_path(path), "rb")
+            if os.fstat(self._index_file.fileno()).st_size >= HEADER.size:
+                self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, indexed_size, self._count = HEADER.unpack_from(self._index, 0)
+                if magic != INDEX_MAGIC or indexed_size > self.size:
+                    # Written by another version, or for a file since rewritten
+                    logger.warning(f"Ignoring stale index of {path}; rebuild it with `kpop-shorts store build {path}`")
+                    indexed_size = self._count = 0
+
+        self._tail: Dict[str, Location] = {}
+        for offset, line in iter_lines(self._data, indexed_size):
+            record = loads(line)
+            if "video_id" in record:
+                self._tail[record["video_id"]] = (offset, len(line))
+        self._tail_hashes = {video_hash(video_id) for video_id in self._tail}
+        if self._tail:
+            logger.debug(f"{len(self._tail)} shorts of {path} not in its index yet")
+        self._length = self._count + sum(1 for video_id in self._tail if self._indexed(video_id) is None)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, video_id: str) -> bool:
+        return self._locate(video_id) is not None
+
+    def _entry(self, position: int) -> Tuple[int, int, int]:
+        return ENTRY.unpack_from(self._index, HEADER.size + position * ENTRY.size)
+
+    def _read(self, location: Location) -> Dict[str, Any]:
+        offset, length = location
+        return loads(self._data[offset:offset + length])
+
+    def _indexed(self, video_id: str) -> Optional[Location]:
+        """Location of video_id in the index, by binary search on its hash"""
+        target = video_hash(video_id)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry(middle)[0] < target:
+                low = middle + 1
+            else:
+                high = middle
+        # Equal hashes sit together; normally this run is a single entry
+        best = None
+        while low < self._count:
+            entry_hash, offset, length = self._entry(low)
+            if entry_hash != target:
+                break
+            if (best is None or offset > best[0]) and self._read((offset, length)).get("video_id") == video_id:
+                best = (offset, length)
+            low += 1
+        return best
+
+    def _locate(self, video_id: str) -> Optional[Location]:
+        location = self._tail.get(video_id)
+        return location if location is not None else self._indexed(video_id)
+
+    def get_record(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """The latest line of video_id as a dict (with its "group"), or None"""
+        location = self._locate(video_id)
+        return self._read(location) if location is not None else None
+
+    def get(self, video_id: str) -> Optional[Tuple[str, Short]]:
+        """(group name, short) of video_id, or None"""
+        record = self.get_record(video_id)
+        if record is None:
+            return None
+        return record.pop("group", ""), Short.from_dict(record)
+
+    def iter_locations(self) -> Iterator[Tuple[int, int, int]]:
+        """(hash, offset, length) of the latest line of every short, in no particular order"""
+        for position in range(self._count):
+            entry = self._entry(position)
+            if entry[0] in self._tail_hashes and self._read(entry[1:]).get("video_id") in self._tail:
+                continue  # Superseded by a line in the tail
+            yield entry
+        for video_id, (offset, length) in self._tail.items():
+            yield video_hash(video_id), offset, length
+
+    def __iter__(self) -> Iterator[Tuple[str, Short]]:
+        """(group name, short) of every short, parsing one line at a time"""
+        for _, offset, length in self.iter_locations():
+            record = self._read((offset, length))
+            yield record.pop("group", ""), Short.from_dict(record)
+
+    def read_at(self, offset: int, length: int) -> Dict[str, Any]:
+        return self._read((offset, length))
+
+    def lines_end(self) -> int:
+        """Byte offset just after the last complete line"""
+        if not self.size or self._data[self.size - 1:self.size] == b"\n":
+            return self.size
+        return self._data.rfind(b"\n") + 1
+
+    def merged_entries(self, appended: Dict[str, Location]) -> List[Tuple[int, int, int]]:
+        """Sorted index entries after the tail and `appended` locations replace older lines"""
+        overrides = {**self._tail, **appended}
+        hashes = {video_hash(video_id): video_id for video_id in overrides}
+        entries = []
+        for position in range(self._count):
+            entry = self._entry(position)
+            video_id = hashes.get(entry[0])
+            if video_id is not None and self._read(entry[1:]).get("video_id") == video_id:
+                continue
+            entries.append(entry)
+        entries.extend((video_hash(video_id), offset, length) for video_id, (offset, length) in overrides.items())
+        entries.sort()
+        return entries
+
+    def close(self):
+        for handle in (self._data, self._index):
+            if isinstance(handle, mmap.mmap):
+                handle.close()
+        self._file.close()
+        if self._index_file is not None:
+            self._index_file.close()
+
+    def __enter__(self) -> "ShortStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+@contextmanager
+def _locked(path: str) -> Iterator[Any]:
+    """
+    The JSONL file at path opened for appending (created if missing) under
+    an exclusive lock, held until the block exits. Rewrites replace the file,
+    so a writer that was waiting on the old one retries on the new file.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    while True:
+        f = open(path, "ab")
+        try:
+            if fcntl is None:
+                break
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Released when the file is closed
+            try:
+                if os.stat(path).st_ino == os.fstat(f.fileno()).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+        except BaseException:
+            f.close()
+            raise
+        f.close()
+    with f:
+        yield f
+
+@contextmanager
+def _append_handle(path: str) -> Iterator[Tuple[Any, ShortStore]]:
+    """
+    The JSONL file opened for appending under an exclusive lock, and the
+    store as it is on disk once the lock is held
+    """
+    with _locked(path) as f:
+        store = ShortStore(path)
+        try:
+            yield f, store
+        finally:
+            store.close()
+
+def _append_records(f, store: ShortStore, records: Iterable[Dict[str, Any]]) -> int:
+    """Append records after the store's end and bring the index up to date; returns shorts written"""
+    offset = store.lines_end()
+    if offset != store.size:
+        # A writer died mid-line; the fragment would otherwise run into the first new record
+        logger.warning(f"Dropping {store.size - offset} bytes of a partial line at the end of {store.path}")
+        f.truncate(offset)
+    appended: Dict[str, Location] = {}
+    lines = []
+    for record in records:
+        line = dumps(record) + b"\n"
+        lines.append(line)
+        if "video_id" in record:
+            appended[record["video_id"]] = (offset, len(line))
+        offset += len(line)
+    f.write(b"".join(lines))
+    f.flush()
+    write_index(store.path, store.merged_entries(appended), offset)
+    return len(appended)
+
+def append_dataset(path: str, dataset: Dataset) -> int:
+    """
+    Append every group and short of dataset to the store at path (created
+    if missing). A short already in the store is replaced by its new line;
+    nothing is ever removed. Returns the number of shorts written.
+    """
+    with _append_handle(path) as (f, store):
+        return _append_records(f, store, dataset_records(dataset))
+
+def update_stats(path: str, stats: Dict[str, Dict[str, int]]) -> int:
+    """
+    Append new versions of the shorts in `stats` ({video_id: {"views": ...,
+    "likes": ...}}) whose counts changed. Each short is read on its own, so
+    the rest of the store is never parsed. Returns how many were rewritten.
+    """
+    with _append_handle(path) as (f, store):
+        records = []
+        for video_id, fields in stats.items():
+            record = store.get_record(video_id)
+            if record is None or all(record.get(name) == value for name, value in fields.items()):
+                continue
+            record.update(fields)
+            records.append(record)
+        return _append_records(f, store, records) if records else 0
+
+def write_store(dataset: Dataset, path: str):
+    """
+    Write dataset as a new store at path, replacing any existing one. The
+    old index is removed first, so a concurrent reader sees either the old
+    store or a new JSONL file without an index (and scans it), never an
+    index that doesn't match its file. Appends wait until it is done.
+    """
+    with _locked(path):
+        _write_store(dataset, path)
+
+def _write_store(dataset: Dataset, path: str):
+    tmp_path = path + ".tmp"
+    locations: Dict[str, Location] = {}
+    offset = 0
+    with open(tmp_path, "wb") as f:
+        for record in dataset_records(dataset):
+            line = dumps(record) + b"\n"
+            f.write(line)
+            if "video_id" in record:
+                locations[record["video_id"]] = (offset, len(line))
+            offset += len(line)
+    if os.path.exists(index_path(path)):
+        os.remove(index_path(path))
+    os.replace(tmp_path, path)
+    write_index(path, sorted((video_hash(video_id), o, length) for video_id, (o, length) in locations.items()), offset)
+
+def read_store(path: str) -> Dataset:
+    """
+    Load a whole store as a dataset: the latest line of each short and of
+    each group's metadata, groups in order of first appearance, shorts
+    newest first.
+    """
+    metadata: Dict[str, Dict[str, Any]] = {}
+    shorts: Dict[str, Dict[str, Short]] = {}
+    owner: Dict[str, str] = {}
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if not line.endswith(b"\n"):
+                logger.warning(f"Ignoring a partial line at the end of {path}")
+                break
+            record = loads(line)
+            name = record.pop("group", "")
+            group_shorts = shorts.setdefault(name, {})
+            if "video_id" not in record:
+                metadata[name] = record
+                continue
+            video_id = record["video_id"]
+            previous = owner.get(video_id)
+            if previous is not None and previous != name:
+                del shorts[previous][video_id]
+            owner[video_id] = name
+            group_shorts[video_id] = Short.from_dict(record)
+
+    dataset = {}
+    for name, group_shorts in shorts.items():
+        meta = metadata.get(name, {})
+        dataset[name] = Group(name, meta.get("korean_name", ""), meta.get("channel_id", ""), meta.get("channel_url", ""),
+                              sorted(group_shorts.values(), key=lambda short: short.upload_time, reverse=True),
+                              meta.get("group_id", ""))
+    return dataset
+
+def build_store(source: str, path: Optional[str] = None) -> str:
+    """
+    Convert a JSON dataset to a store next to it (same name, .jsonl), or
+    rebuild the index of an existing .jsonl file. Returns the store path.
+    """
+    if is_store_path(source):
+        if not os.path.exists(source):
+            raise FileNotFoundError(source)
+        with _append_handle(source) as (_, store):
+            write_index(source, store.merged_entries({}), store.lines_end())
+        return source
+    path = path or (source[:-len(".json")] if source.endswith(".json") else source) + ".jsonl"
+    write_store(load_dataset(source), path)
+    return path
+
+def compact_store(path: str) -> int:
+    """Rewrite a store keeping only the latest line of each short; returns bytes saved"""
+    with _locked(path):
+        before = os.path.getsize(path)
+        _write_store(read_store(path), path)
+        return before - os.path.getsize(path)
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts store`"""
+    config = get_config()
+    if args.action == "get":
+        with ShortStore(args.dataset) as store:
+            with REGISTRY.stage("store_get"):
+                records = [(video_id, store.get_record(video_id)) for video_id in args.targets]
+        try:
+            for video_id, record in records:
+                if record is None:
+                    print(f"{video_id}: not found in {args.dataset}")
+                else:
+                    print(dumps({**record, "url": Short.from_dict(record).url}, pretty=True).decode("utf-8"))
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Output piped into e.g. `head`, which stopped reading
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+
+    if args.action == "append":
+        for target in args.targets:
+            with REGISTRY.stage("store_append") as stage:
+                written = append_dataset(args.dataset, load_dataset(target))
+                stage.add_items(written)
+            print(f"Appended {written} shorts from {target} to {args.dataset}")
+        return
+
+    pattern = "*shorts*.jsonl" if args.action == "compact" else "*shorts*.json"
+    targets = args.targets or sorted(glob.glob(os.path.join(config.data_processed, pattern)))
+    for target in targets:
+        if args.action == "compact":
+            saved = compact_store(target)
+            print(f"Compacted {target}, {saved / 1e6:.2f} MB saved")
+            continue
+        with REGISTRY.stage("store_build") as stage:
+            path = build_store(target)
+            with ShortStore(path) as store:
+                stage.add_items(len(store))
+                print(f"Built {path} ({len(store)} shorts)")
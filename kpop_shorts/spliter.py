@@ -0,0 +1,57 @@
+import argparse
+from typing import Sequence
+from kpop_shorts.entities import assign_group_ids, group_index
+from kpop_shorts.model import load_dataset, save_dataset
+
+def is_challenge_short(hashtags: Sequence[str]) -> bool:
+    for hashtag in hashtags:
+        if "challenge" in hashtag.lower():
+            return True
+    return False
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts split`"""
+    shorts_data_path = args.input
+    challenge_output_path = args.challenge_output
+    non_challenge_output_path = args.non_challenge_output
+    
+    # Load the datasets
+    json_data = load_dataset(shorts_data_path)
+    
+    # Datasets written before groups carried an ID get it from the group CSV
+    unresolved = assign_group_ids(json_data, group_index(args.groups))
+    if unresolved:
+        print(f"Groups not found in {args.groups}: {', '.join(unresolved)}")
+    
+    # Initialize output dictionaries
+    challenge_shorts = {}
+    non_challenge_shorts = {}
+    
+    # Process each group and its shorts
+    for group, group_data in json_data.items():
+        challenge_shorts[group] = group_data.empty_copy()
+        non_challenge_shorts[group] = group_data.empty_copy()
+        
+        for short in group_data.shorts:
+            if is_challenge_short(short.hashtags):
+                challenge_shorts[group].shorts.append(short)
+            else:
+                non_challenge_shorts[group].shorts.append(short)
+    
+    # Filter out groups with no shorts in respective categories
+    challenge_shorts = {k: v for k, v in challenge_shorts.items() if v.shorts_count > 0}
+    non_challenge_shorts = {k: v for k, v in non_challenge_shorts.items() if v.shorts_count > 0}
+    
+    # Write output files
+    save_dataset(challenge_shorts, challenge_output_path)
+    save_dataset(non_challenge_shorts, non_challenge_output_path)
+    
+    print(f"Challenge shorts saved to {challenge_output_path}")
+    print(f"Non-challenge shorts saved to {non_challenge_output_path}")
+    
+    # Print some statistics
+    total_challenge = sum(data.shorts_count for data in challenge_shorts.values())
+    total_non_challenge = sum(data.shorts_count for data in non_challenge_shorts.values())
+    
+    print(f"Total challenge shorts (有 hashtag 包含 challenge): {total_challenge}")
+    print(f"Total non-challenge shorts (沒有 hashtag 包含 challenge): {total_non_challenge}")
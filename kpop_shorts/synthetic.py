@@ -0,0 +1,301 @@
+import argparse
+import bisect
+import csv
+import math
+import random
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from kpop_shorts.config import get_config
+from kpop_shorts.entities import group_id, name_key
+from kpop_shorts.log import get_logger
+from kpop_shorts.model import Dataset, Group, Short, load_dataset, save_dataset
+from kpop_shorts.serialization import read_json, write_json
+
+logger = get_logger(__name__)
+
+HASHTAG_RE = re.compile(r"#\w+")
+HANGUL_RE = re.compile("[가-힣]")
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+SEPARATORS = {"|", "-", "/", "｜"}
+ID_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+
+# Building blocks of made-up group names once the real ones run out
+NAME_SYLLABLES = ["a", "ae", "bi", "cha", "da", "el", "eon", "ga", "ha", "i", "jin", "ka", "kei", "la", "lu", "mi",
+                  "mo", "na", "neo", "o", "ra", "ri", "sa", "se", "so", "ta", "te", "u", "ve", "vi", "won", "ya", "yu", "ze"]
+NAME_SUFFIXES = ["", "", "", "X", "Z", "Q", "IX", "2", "7", "UP", "ONE"]
+
+class Weighted:
+    """Values drawn with the frequencies they were observed with"""
+    def __init__(self, counts: Counter):
+        self.values = list(counts)
+        self.cumulative = list(accumulate(counts[value] for value in self.values))
+
+    def __bool__(self) -> bool:
+        return bool(self.values)
+
+    def sample(self, rng: random.Random) -> Any:
+        return self.values[bisect.bisect_right(self.cumulative, rng.random() * self.cumulative[-1])]
+
+class Profile:
+    """
+    Distributions fitted from real shorts datasets, which `Generator`
+    samples from: shorts per group, title words (Korean and English kept
+    apart, since titles are written mostly in one or the other), topic
+    hashtags and how many a short carries, how often a group tags itself
+    and other groups (collaborations), how often a hashtag shows up in the
+    title, engagement numbers and upload times, plus Wikipedia paragraphs
+    for the intro files.
+    """
+    def __init__(self):
+        self.shorts_per_group: Counter = Counter()
+        self.korean_title_rate = 0.0
+        self.title_words: Dict[bool, Counter] = {True: Counter(), False: Counter()}  # Korean title? -> word counts
+        self.title_lengths: Counter = Counter()
+        self.topic_tags: Counter = Counter()
+        self.topic_tag_counts: Counter = Counter()
+        self.collab_counts: Counter = Counter()
+        self.own_tag_rate = 0.0
+        self.korean_tag_rate = 0.0
+        self.tag_in_title_rate = 0.0
+        self.group_popularity: Counter = Counter()  # times a group is tagged by another group
+        self.engagement: List[Tuple[int, int, int]] = []
+        self.upload_range: Tuple[datetime, datetime] = (datetime(2024, 1, 1), datetime(2025, 1, 1))
+        self.groups: List[Tuple[str, str]] = []  # (english, korean) of the real groups
+        self.paragraphs: List[Tuple[str, str]] = []  # (group name, paragraph)
+
+    @classmethod
+    def fit(cls, dataset_paths: Iterable[str], wiki_path: Optional[str] = None) -> "Profile":
+        profile = cls()
+        datasets = [load_dataset(path) for path in dataset_paths]
+        korean_names: Dict[str, str] = {}
+        for dataset in datasets:
+            for name, group in dataset.items():
+                korean_names.setdefault(name, group.korean_name)
+        profile.groups = list(korean_names.items())
+        group_keys = {name_key(alias): name for name, korean in profile.groups for alias in (name, korean) if alias}
+
+        shorts = korean_titles = tags = tags_in_title = own = korean_own = 0
+        earliest = latest = None
+        for dataset in datasets:
+            for name, group in dataset.items():
+                profile.shorts_per_group[group.shorts_count] += 1
+                for short in group.shorts:
+                    shorts += 1
+                    korean = bool(HANGUL_RE.search(short.title))
+                    korean_titles += korean
+                    words = [word for word in HASHTAG_RE.sub(" ", short.title).split() if word not in SEPARATORS]
+                    profile.title_words[korean].update(words)
+                    profile.title_lengths[len(words)] += 1
+
+                    topics = collabs = 0
+                    tagged_self = False
+                    for tag in short.hashtags:
+                        tags += 1
+                        tags_in_title += tag in short.title
+                        tagged = group_keys.get(name_key(tag))
+                        if tagged == name:
+                            if not tagged_self:
+                                tagged_self = True
+                                own += 1
+                                korean_own += bool(HANGUL_RE.search(tag))
+                        elif tagged is not None:
+                            collabs += 1
+                            profile.group_popularity[tagged] += 1
+                        else:
+                            topics += 1
+                            profile.topic_tags[tag] += 1
+                    profile.topic_tag_counts[topics] += 1
+                    profile.collab_counts[collabs] += 1
+                    profile.engagement.append((short.views, short.likes, short.comments))
+
+                    try:
+                        uploaded = datetime.strptime(short.upload_time, TIME_FORMAT)
+                    except ValueError:
+                        continue
+                    earliest = min(earliest or uploaded, uploaded)
+                    latest = max(latest or uploaded, uploaded)
+
+        if not shorts:
+            raise ValueError("No shorts to fit a profile from")
+        profile.korean_title_rate = korean_titles / shorts
+        profile.tag_in_title_rate = tags_in_title / tags if tags else 0.0
+        profile.own_tag_rate = own / shorts
+        profile.korean_tag_rate = korean_own / own if own else 0.0
+        if earliest is not None:
+            profile.upload_range = (earliest, latest)
+
+        if wiki_path:
+            for name, entry in read_json(wiki_path).items():
+                profile.paragraphs.extend((name, paragraph) for paragraph in entry.get("info") or [])
+        logger.info(f"Fitted a profile from {shorts} shorts", extra={"groups": len(profile.groups), "topic_tags": len(profile.topic_tags)})
+        return profile
+
+def _video_id(rng: random.Random) -> str:
+    return "".join(rng.choice(ID_ALPHABET) for _ in range(11))
+
+def _made_up_group(rng: random.Random, taken: set) -> Tuple[str, str]:
+    """A new (English, Korean) group name that collides with no name_key taken so far"""
+    while True:
+        name = "".join(rng.choice(NAME_SYLLABLES) for _ in range(rng.randint(2, 4))) + rng.choice(NAME_SUFFIXES)
+        name = name.upper() if rng.random() < 0.6 else name.capitalize()
+        if name_key(name) not in taken:
+            taken.add(name_key(name))
+            korean = "".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(2, 4)))
+            return name, korean
+
+def _tag(name: str) -> str:
+    return "#" + re.sub(r"\W", "", name)
+
+def _variant(name: str, rng: random.Random) -> str:
+    """Another spelling of a group name: case or spacing, as channel titles differ from the CSV"""
+    if rng.random() < 0.5:
+        return name.upper() if name != name.upper() else name.capitalize()
+    middle = max(1, len(name) // 2)
+    return f"{name[:middle]} {name[middle:]}"
+
+class Generator:
+    """
+    Seeded synthetic datasets in the repo's formats. The same profile,
+    seed and sizes always give the same output. The real groups come
+    first; beyond them groups get made-up names, and borrow the popularity
+    of a random real group for how often others tag them.
+    """
+    def __init__(self, profile: Profile, seed: int = 0):
+        self.profile = profile
+        self.seed = seed
+        self.weights = {
+            "shorts": Weighted(profile.shorts_per_group),
+            "title_length": Weighted(profile.title_lengths),
+            "topic_count": Weighted(profile.topic_tag_counts),
+            "collab_count": Weighted(profile.collab_counts),
+            "topic": Weighted(profile.topic_tags),
+            True: Weighted(profile.title_words[True]),
+            False: Weighted(profile.title_words[False]),
+        }
+
+    def group_names(self, count: int) -> List[Tuple[str, str]]:
+        rng = random.Random(f"{self.seed}:groups")
+        names = list(self.profile.groups[:count])
+        taken = {name_key(name) for name, _ in names}
+        while len(names) < count:
+            names.append(_made_up_group(rng, taken))
+        return names
+
+    def _title(self, rng: random.Random, korean: bool, title_tags: Sequence[str]) -> str:
+        words = self.weights[korean] or self.weights[not korean]
+        parts = [words.sample(rng) for _ in range(self.weights["title_length"].sample(rng))] if words else []
+        if title_tags:
+            parts.append("|")
+            parts.extend(title_tags)
+        return " ".join(parts)
+
+    def _short(self, rng: random.Random, own_tags: Tuple[str, str], partners: Weighted, channel: str) -> Short:
+        profile = self.profile
+        tags = [self.weights["topic"].sample(rng) for _ in range(self.weights["topic_count"].sample(rng))] if self.weights["topic"] else []
+        if rng.random() < profile.own_tag_rate:
+            tags.append(own_tags[1] if rng.random() < profile.korean_tag_rate else own_tags[0])
+        for _ in range(self.weights["collab_count"].sample(rng)):
+            partner = partners.sample(rng)
+            if partner not in own_tags:
+                tags.append(partner)
+        tags = list(dict.fromkeys(tags))
+
+        # A hashtag is in the title, the description, or both; `kpop-shorts
+        # hashtags` merges the title ones in, so a fetched short lists only
+        # the description ones
+        title_tags, description_tags = [], []
+        for tag in tags:
+            if rng.random() < profile.tag_in_title_rate:
+                title_tags.append(tag)
+                if rng.random() < 0.5:
+                    description_tags.append(tag)
+            else:
+                description_tags.append(tag)
+
+        start, end = profile.upload_range
+        uploaded = start + timedelta(seconds=rng.randrange(max(int((end - start).total_seconds()), 1)))
+        views, likes, comments = rng.choice(profile.engagement) if profile.engagement else (0, 0, 0)
+        scale = math.exp(rng.gauss(0, 0.3))
+        return Short(
+            _video_id(rng),
+            self._title(rng, rng.random() < profile.korean_title_rate, title_tags),
+            channel,
+            uploaded.strftime(TIME_FORMAT),
+            int(views * scale),
+            int(likes * scale),
+            int(comments * scale),
+            description_tags
+        )
+
+    def dataset(self, groups: int, shorts_per_group: Optional[int] = None, variant_rate: float = 0.0) -> Dataset:
+        """
+        `groups` groups of shorts as fetched (title hashtags not merged in
+        yet), with shorts_per_group shorts each or as many as a real group
+        of the profile has. A variant_rate share of the groups is keyed by
+        a different spelling than the group CSV uses.
+        """
+        names = self.group_names(groups)
+        real = {name for name, _ in self.profile.groups}
+        observed = list(self.profile.group_popularity.values()) or [1]
+        popularity = Counter()
+        rng = random.Random(f"{self.seed}:popularity")
+        for name, korean in names:
+            weight = self.profile.group_popularity.get(name, 1) if name in real else rng.choice(observed)
+            popularity[_tag(name)] += weight
+            if korean:
+                popularity[_tag(korean)] += weight * self.profile.korean_tag_rate
+
+        partners = Weighted(popularity)
+        dataset: Dataset = {}
+        for position, (name, korean) in enumerate(names):
+            rng = random.Random(f"{self.seed}:group:{position}")
+            count = shorts_per_group if shorts_per_group is not None else self.weights["shorts"].sample(rng)
+            own_tags = (_tag(name), _tag(korean or name))
+            key = _variant(name, rng) if rng.random() < variant_rate else name
+            group = Group(key, korean, "UC" + "".join(rng.choice(ID_ALPHABET) for _ in range(22)), f"@{name}",
+                          group_id=group_id(name))
+            group.shorts = [self._short(rng, own_tags, partners, name) for _ in range(count)]
+            dataset[key] = group
+        return dataset
+
+    def group_csv(self, groups: int, path: str, extra: float = 0.1):
+        """A kpop-group.csv for the dataset's groups, plus an `extra` share of groups with no shorts"""
+        names = self.group_names(groups + int(groups * extra))
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["group (english)", "group (korean)", "YouTube Channel", "group (alternative)"])
+            for name, korean in names:
+                writer.writerow([name, korean, f"@{name}", ""])
+
+    def wiki(self, groups: int) -> Dict[str, Any]:
+        """Wikipedia intros in the kpop_group_info format, spacing glitches included, from the profile's paragraphs"""
+        rng = random.Random(f"{self.seed}:wiki")
+        info = {}
+        for name, _ in self.group_names(groups):
+            paragraphs = []
+            for _ in range(rng.randint(1, 3)):
+                if not self.profile.paragraphs:
+                    break
+                source, paragraph = rng.choice(self.profile.paragraphs)
+                paragraphs.append(paragraph.replace(source, name))
+            info[name] = {"info": paragraphs, "name_used": "english", "url": f"https://en.wikipedia.org/wiki/{name}"}
+        return info
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts synth`"""
+    config = get_config()
+    profile = Profile.fit(args.fit or config.sample_shorts, args.wiki)
+    generator = Generator(profile, args.seed)
+    dataset = generator.dataset(args.groups, args.shorts_per_group, args.variant_rate)
+    save_dataset(dataset, args.output)
+    print(f"Wrote {sum(group.shorts_count for group in dataset.values())} shorts of {len(dataset)} groups to {args.output}")
+    if args.csv_output:
+        generator.group_csv(args.groups, args.csv_output)
+        print(f"Wrote the group CSV to {args.csv_output}")
+    if args.wiki_output:
+        write_json(generator.wiki(args.groups), args.wiki_output, pretty=True)
+        print(f"Wrote Wikipedia intros to {args.wiki_output}")
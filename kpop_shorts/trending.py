@@ -0,0 +1,251 @@
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("`kpop-shorts trending` requires numpy (pip install 'kpop-shorts[trending]')") from None
+
+from kpop_shorts.config import get_config
+from kpop_shorts.log import get_logger
+from kpop_shorts.metrics import REGISTRY
+from kpop_shorts.model import Dataset, load_dataset
+from kpop_shorts.scheduler import DAY, parse_upload_time
+from kpop_shorts.serialization import write_json
+from kpop_shorts.shortstore import compact_store, is_store_path, update_stats
+from kpop_shorts.youtube import LIMITER, api_get
+
+logger = get_logger(__name__)
+
+# Most IDs one videos.list call accepts
+VIDEOS_PER_CALL = 50
+HOUR = 3600.0
+
+class ViewRing:
+    """
+    Fixed-size ring buffers of (timestamp, views, likes) samples, one row per
+    tracked video, stored as 2-D NumPy arrays. Rows of videos that stop being
+    tracked are reused, so memory is max_videos * capacity * 24 bytes however
+    long the watcher runs.
+    """
+    def __init__(self, max_videos: int = 5000, capacity: int = 48):
+        self.max_videos = max_videos
+        self.capacity = capacity
+        self.times = np.zeros((max_videos, capacity), dtype=np.float64)
+        self.views = np.zeros((max_videos, capacity), dtype=np.int64)
+        self.likes = np.zeros((max_videos, capacity), dtype=np.int64)
+        self.head = np.zeros(max_videos, dtype=np.int32)   # next write position per row
+        self.count = np.zeros(max_videos, dtype=np.int32)  # samples held per row
+        self.video_ids: List[Optional[str]] = [None] * max_videos
+        self.rows: Dict[str, int] = {}
+        self._free = list(range(max_videos - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def track(self, video_id: str) -> Optional[int]:
+        """Row of video_id, allocating one if needed; None when every row is taken"""
+        row = self.rows.get(video_id)
+        if row is None and self._free:
+            row = self._free.pop()
+            self.rows[video_id] = row
+            self.video_ids[row] = video_id
+            self.head[row] = 0
+            self.count[row] = 0
+        return row
+
+    def untrack(self, video_id: str):
+        row = self.rows.pop(video_id, None)
+        if row is not None:
+            self.video_ids[row] = None
+            self.count[row] = 0
+            self._free.append(row)
+
+    def record(self, rows: "np.ndarray", timestamp: float, views: "np.ndarray", likes: "np.ndarray"):
+        """Append one sample to each of `rows`, overwriting their oldest sample when full"""
+        position = self.head[rows]
+        self.times[rows, position] = timestamp
+        self.views[rows, position] = views
+        self.likes[rows, position] = likes
+        self.head[rows] = (position + 1) % self.capacity
+        self.count[rows] = np.minimum(self.count[rows] + 1, self.capacity)
+
+    def _sample(self, rows: "np.ndarray", back: int):
+        """(times, views, likes) of the sample `back` steps before the latest one"""
+        position = (self.head[rows] - 1 - back) % self.capacity
+        return self.times[rows, position], self.views[rows, position], self.likes[rows, position]
+
+    def rates(self) -> Dict[str, "np.ndarray"]:
+        """
+        Velocity (views and likes per hour over the latest interval) and
+        acceleration (change in view velocity per hour, from the two latest
+        intervals) of every row with at least two samples, computed for all
+        rows at once.
+        """
+        rows = np.flatnonzero(self.count >= 2)
+        t1, v1, l1 = self._sample(rows, 0)
+        t0, v0, l0 = self._sample(rows, 1)
+        tm, vm, _ = self._sample(rows, 2)
+
+        hours = np.maximum(t1 - t0, 1.0) / HOUR
+        velocity = (v1 - v0) / hours
+        likes_velocity = (l1 - l0) / hours
+
+        prior_hours = np.maximum(t0 - tm, 1.0) / HOUR
+        prior_velocity = (v0 - vm) / prior_hours
+        acceleration = np.where(self.count[rows] >= 3, (velocity - prior_velocity) / ((hours + prior_hours) / 2), 0.0)
+
+        return {
+            "rows": rows,
+            "views": v1,
+            "velocity": velocity,
+            "likes_velocity": likes_velocity,
+            "acceleration": acceleration
+        }
+
+class TrendingWatcher:
+    """
+    Samples view and like counts of shorts uploaded within the last
+    window_days, 50 videos per videos.list call, and ranks them by how fast
+    their views are growing.
+    """
+    def __init__(self, ring: ViewRing, api_key: Optional[str], window_days: float = 14):
+        self.ring = ring
+        self.api_key = api_key
+        self.window = window_days * DAY
+        self.meta: Dict[str, Dict[str, Any]] = {}
+
+    def refresh_candidates(self, dataset: Dataset, now: float):
+        """Track the newest shorts inside the window, dropping those that aged out"""
+        recent = []
+        for name, group in dataset.items():
+            for short in group.shorts:
+                uploaded = parse_upload_time(short.upload_time)
+                if now - uploaded <= self.window:
+                    recent.append((uploaded, name, short))
+        recent.sort(key=lambda entry: entry[0], reverse=True)
+        if len(recent) > self.ring.max_videos:
+            REGISTRY.inc("trending_untracked", len(recent) - self.ring.max_videos)
+            recent = recent[:self.ring.max_videos]
+
+        keep = {short.video_id for _, _, short in recent}
+        for video_id in [video_id for video_id in self.ring.rows if video_id not in keep]:
+            self.ring.untrack(video_id)
+            self.meta.pop(video_id, None)
+
+        for _, name, short in recent:
+            self.ring.track(short.video_id)
+            self.meta[short.video_id] = {"group": name, "title": short.title, "upload_time": short.upload_time}
+
+    def sample(self):
+        """Fetch current statistics of every tracked video into the ring"""
+        video_ids = list(self.ring.rows)
+        for start in range(0, len(video_ids), VIDEOS_PER_CALL):
+            batch = video_ids[start:start + VIDEOS_PER_CALL]
+            params = {
+                "key": self.api_key,
+                "id": ",".join(batch),
+                "part": "statistics",
+                "maxResults": VIDEOS_PER_CALL
+            }
+            with REGISTRY.stage("trending_sample") as stage:
+                data = api_get("videos", params)
+                if "error" in data:
+                    logger.error(f"Error sampling video statistics: {data['error'].get('message', 'Unknown error')}")
+                    return
+                timestamp = time.time()
+
+                items = data.get("items", [])
+                rows = np.fromiter((self.ring.rows[item["id"]] for item in items), dtype=np.int64, count=len(items))
+                views = np.fromiter((int(item["statistics"].get("viewCount", 0)) for item in items), dtype=np.int64, count=len(items))
+                likes = np.fromiter((int(item["statistics"].get("likeCount", 0)) for item in items), dtype=np.int64, count=len(items))
+                self.ring.record(rows, timestamp, views, likes)
+                stage.add_items(len(items))
+
+            # Deleted or private videos are missing from the response
+            returned = {item["id"] for item in items}
+            for video_id in batch:
+                if video_id not in returned:
+                    self.ring.untrack(video_id)
+                    self.meta.pop(video_id, None)
+
+    def latest_stats(self) -> Dict[str, Dict[str, int]]:
+        """Latest sampled {"views", "likes"} of every tracked video with a sample"""
+        rows = np.flatnonzero(self.ring.count >= 1)
+        _, views, likes = self.ring._sample(rows, 0)
+        return {
+            self.ring.video_ids[row]: {"views": int(v), "likes": int(l)}
+            for row, v, l in zip(rows.tolist(), views.tolist(), likes.tolist())
+        }
+
+    def ranking(self, top: int = 50) -> List[Dict[str, Any]]:
+        """Tracked videos with the highest view velocity, fastest first"""
+        rates = self.ring.rates()
+        order = np.argsort(-rates["velocity"], kind="stable")[:top]
+        trending = []
+        for i in order:
+            video_id = self.ring.video_ids[rates["rows"][i]]
+            trending.append({
+                "video_id": video_id,
+                **self.meta.get(video_id, {}),
+                "views": int(rates["views"][i]),
+                "views_per_hour": round(float(rates["velocity"][i]), 1),
+                "likes_per_hour": round(float(rates["likes_velocity"][i]), 1),
+                "acceleration": round(float(rates["acceleration"][i]), 1)
+            })
+        return trending
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts trending`"""
+    if args.write_back and not is_store_path(args.input):
+        raise SystemExit("--write-back needs a .jsonl store as --input (see `kpop-shorts store build`)")
+    ring = ViewRing(args.max_videos, args.samples)
+    LIMITER.set_rate(args.requests_per_second)
+    watcher = TrendingWatcher(ring, get_config().youtube_api_key, args.window_days)
+
+    dataset = None
+    dataset_mtime = None
+    tracked = None
+    tick = 0
+    while True:
+        # The file is only re-read when something changed it, but the window
+        # moves with the clock, so the candidates are refreshed every tick
+        mtime = os.path.getmtime(args.input)
+        if mtime != dataset_mtime:
+            dataset = load_dataset(args.input)
+            dataset_mtime = mtime
+        watcher.refresh_candidates(dataset, time.time())
+        if len(ring) != tracked:
+            tracked = len(ring)
+            logger.info(f"Tracking {tracked} shorts uploaded in the last {args.window_days:g} days")
+
+        with REGISTRY.stage("trending_tick"):
+            watcher.sample()
+            trending = watcher.ranking(args.top)
+        if args.write_back:
+            changed_by_others = os.path.getmtime(args.input) != dataset_mtime
+            with REGISTRY.stage("trending_write_back") as stage:
+                stage.add_items(update_stats(args.input, watcher.latest_stats()))
+                # Every write-back appends a line per changed short
+                if args.compact_every and (tick + 1) % args.compact_every == 0:
+                    compact_store(args.input)
+            # Our own writes aren't a reason to re-read the file; someone else's are
+            if not changed_by_others:
+                dataset_mtime = os.path.getmtime(args.input)
+        write_json({
+            "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            "tracked": len(ring),
+            "trending": trending
+        }, args.output, pretty=True)
+
+        for rank, entry in enumerate(trending[:5], 1):
+            logger.info(f"#{rank} {entry['video_id']} {entry.get('group', '')}",
+                        extra={"views_per_hour": entry["views_per_hour"], "acceleration": entry["acceleration"]})
+
+        tick += 1
+        if args.ticks and tick >= args.ticks:
+            break
+        time.sleep(args.interval_minutes * 60)
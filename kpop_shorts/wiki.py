@@ -0,0 +1,194 @@
+import csv
+import argparse
+import time
+import os
+import json
+
+from kpop_shorts.entities import group_index, resolve_group_id
+from kpop_shorts.log import get_logger
+from kpop_shorts.metrics import REGISTRY
+from kpop_shorts.serialization import write_json
+
+logger = get_logger(__name__)
+
+INFO_FILENAME = "kpop_group_info.json"
+
+def read_kpop_groups(csv_path):
+    """Read the K-pop group names from CSV file."""
+    groups = []
+    index = group_index(csv_path)
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            group_data = {
+                'group_id': resolve_group_id(index, row['group (english)'], row['group (korean)'])[0],
+                'english': row['group (english)'],
+                'korean': row['group (korean)'],
+                'alternative': row.get('group (alternative)', '')  # Get alternative name if exists
+            }
+            groups.append(group_data)
+    return groups
+
+def fetch_wikipedia_content(group_name_english, group_name_alternative, group_name_korean):
+    """Fetch the Wikipedia page for a given group name, trying English first, 
+    then alternative (if available), then Korean."""
+    # Imported here so `kpop-shorts wiki fix` works without the network stack
+    import requests
+    from kpop_shorts import http
+    
+    # Try with English name first
+    url_name = group_name_english.replace(' ', '_')
+    url = f"https://en.wikipedia.org/wiki/{url_name}"
+    
+    try:
+        response = http.get(url, endpoint="wikipedia")
+        # If the page exists, return the content
+        if response.status_code == 200:
+            return response.text, 'english', url
+        
+        # If English name fails and alternative name exists, try with alternative name
+        if group_name_alternative:
+            url_name_alt = group_name_alternative.replace(' ', '_')
+            url_alt = f"https://en.wikipedia.org/wiki/{url_name_alt}"
+            
+            response_alt = http.get(url_alt, endpoint="wikipedia")
+            if response_alt.status_code == 200:
+                return response_alt.text, 'alternative', url_alt
+        
+        # If both English and alternative (if available) fail, try with Korean name
+        url_name_korean = group_name_korean.replace(' ', '_')
+        url_korean = f"https://en.wikipedia.org/wiki/{url_name_korean}"
+        
+        response_korean = http.get(url_korean, endpoint="wikipedia")
+        if response_korean.status_code == 200:
+            return response_korean.text, 'korean', url_korean
+        
+        # If all fail, raise the exception for the English URL
+        response.raise_for_status()
+        
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error fetching {url} or alternatives: {e}")
+        return None, None, None
+
+def extract_group_info(html_content, group_name):
+    """Extract the group information from Wikipedia HTML content.
+    Gets all text between the infobox and the table of contents."""
+    if not html_content:
+        return None
+    
+    # bs4 is only needed here, so `kpop-shorts` doesn't pay for it on every start
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_content, 'html.parser')
+    
+    # Find the main content div
+    content_div = soup.find('div', {'id': 'mw-content-text'})
+    
+    if not content_div:
+        return None
+    
+    # Find first article content div
+    article_div = content_div.find('div', {'class': 'mw-parser-output'})
+    if not article_div:
+        return None
+    
+    # Find the infobox table
+    infobox = article_div.find('table', {'class': 'infobox'})
+    if not infobox:
+        # If no infobox, just return the first paragraphs
+        paragraphs = article_div.find_all('p', limit=3)
+        return [p.get_text(strip=True) for p in paragraphs if p.text.strip()]
+    
+    # Find the table of contents or the first heading (which usually comes after intro)
+    toc = article_div.find('meta', {'property': 'mw:PageProp/toc'})
+    first_heading = article_div.find('h2')
+    
+    # All elements between infobox and TOC/first heading are part of the introduction
+    intro_elements = []
+    current = infobox.find_next_sibling()
+    
+    end_element = toc if toc else first_heading
+    
+    while current and current != end_element:
+        # Only collect paragraph elements
+        if current.name == 'p' and current.text.strip():
+            intro_elements.append(current.get_text(strip=True))
+        current = current.next_sibling
+    
+    # If we didn't find any paragraphs, look for paragraphs that might be after a hatnote or other elements
+    if not intro_elements:
+        # Try to find the first few paragraphs in the article
+        for p in article_div.find_all('p'):
+            if p.text.strip():
+                intro_elements.append(p.get_text(strip=True))
+                if len(intro_elements) >= 3:  # Limit to 3 paragraphs
+                    break
+    
+    return intro_elements
+
+def fetch_all(args: argparse.Namespace):
+    # Create output directory if it doesn't exist
+    output_dir = args.output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    
+    groups = read_kpop_groups(args.csv)
+    
+    results = {}
+    stats = {'english': 0, 'alternative': 0, 'korean': 0, 'failed': 0}
+    
+    for group in groups:
+        english_name = group['english']
+        alternative_name = group['alternative']
+        korean_name = group['korean']
+        
+        logger.info(f"Fetching info for {english_name}...")
+        if alternative_name:
+            logger.info(f"  Alternative name: {alternative_name}")
+            
+        with REGISTRY.stage("fetch_page"):
+            html_content, used_name, url_used = fetch_wikipedia_content(english_name, alternative_name, korean_name)
+        
+        if html_content:
+            with REGISTRY.stage("extract_info") as stage:
+                group_info = extract_group_info(html_content, english_name)
+                stage.add_items(len(group_info or []))
+            results[english_name] = {
+                'group_id': group['group_id'],
+                'info': group_info,
+                'name_used': used_name,
+                'url': url_used
+            }
+            
+            # Update stats
+            stats[used_name] += 1
+            
+            # Save the raw HTML for debugging/reference
+            with open(f"{output_dir}/{english_name.replace(' ', '_')}_wiki.html", 'w', encoding='utf-8') as f:
+                f.write(html_content)
+        else:
+            # Update failed stats
+            stats['failed'] += 1
+            results[english_name] = {
+                'group_id': group['group_id'],
+                'info': None,
+                'name_used': None,
+                'url': None
+            }
+        
+        # Be respectful to Wikipedia's servers
+        time.sleep(1)
+    
+    # Save all the extracted info to a JSON file
+    # Kept indented: this file is read and hand-checked by people
+    write_json(results, os.path.join(output_dir, INFO_FILENAME), pretty=True)
+    
+    logger.info(f"Completed! Data saved to {output_dir}")
+    logger.info(f"Stats: {stats['english']} found with English name, {stats['alternative']} with alternative name, {stats['korean']} with Korean name, {stats['failed']} failed")
+
+def main(args: argparse.Namespace):
+    """Entry point of `kpop-shorts wiki`"""
+    if args.action == "fetch":
+        fetch_all(args)
+    
+    if args.action == "fix" or args.fix:
+        from kpop_shorts.wiki_fixer import fix_json_formatting
+        logger.info(fix_json_formatting(os.path.join(args.output_dir, INFO_FILENAME)))
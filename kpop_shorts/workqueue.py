@@ -0,0 +1,236 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from kpop_shorts.log import get_logger
+
+logger = get_logger(__name__)
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    heartbeat_at REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS work_items_status ON work_items (status, id);
+"""
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class WorkItem:
+    """A claimed unit of work"""
+    __slots__ = ("id", "key", "payload", "attempts")
+
+    def __init__(self, id: int, key: str, payload: Dict[str, Any], attempts: int):
+        self.id = id
+        self.key = key
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        return f"WorkItem({self.id}, {self.key!r}, attempts={self.attempts})"
+
+class WorkQueue:
+    """
+    Leased work queue in a SQLite file. Several processes (on one machine, or
+    on several machines sharing a filesystem with working POSIX locks) can
+    claim items concurrently. A claim is a lease that the holder extends with
+    heartbeats; items whose lease expires are handed out again, so a dead
+    worker never loses work, until an item has used up max_attempts.
+    """
+    def __init__(self, path: str, lease_seconds: float = 300, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived autocommit connection per operation keeps the queue
+        # usable from the heartbeat thread as well as the worker loop
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 60000")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, key: str, payload: Dict[str, Any]) -> bool:
+        """Add an item; returns False if an item with this key already exists"""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO work_items (key, payload, updated_at) VALUES (?, ?, ?)",
+                (key, json.dumps(payload, ensure_ascii=False), time.time())
+            )
+            return cursor.rowcount == 1
+
+    def reset(self) -> int:
+        """
+        Drop every item, finished or not, to start a new crawl; returns how
+        many were dropped. Workers still holding a lease lose it, so their
+        heartbeats and completions are rejected.
+        """
+        with self._connection() as conn:
+            return conn.execute("DELETE FROM work_items").rowcount
+
+    def requeue_expired(self) -> int:
+        """Return items with expired leases to the pending state"""
+        with self._connection() as conn:
+            return self._requeue_expired(conn, time.time())
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        """
+        Expired leases go back to pending, or to failed once max_attempts is
+        reached (like fail()), so an item that kills its worker every time
+        isn't handed out forever. Returns how many were requeued.
+        """
+        cursor = conn.execute(
+            "UPDATE work_items SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, "lease expired", now, LEASED, now, self.max_attempts)
+        )
+        if cursor.rowcount:
+            logger.warning("Expired leases out of attempts, marked failed", extra={"count": cursor.rowcount})
+        cursor = conn.execute(
+            "UPDATE work_items SET status = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (PENDING, now, LEASED, now)
+        )
+        if cursor.rowcount:
+            logger.warning("Requeued expired leases", extra={"count": cursor.rowcount})
+        return cursor.rowcount
+
+    def claim(self, worker_id: str) -> Optional[WorkItem]:
+        """Lease the oldest pending item to worker_id, or return None if there is none"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT id, key, payload, attempts FROM work_items WHERE status = ? ORDER BY id LIMIT 1",
+                (PENDING,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE work_items SET status = ?, lease_owner = ?, lease_expires = ?, heartbeat_at = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (LEASED, worker_id, now + self.lease_seconds, now, now, row[0])
+            )
+            conn.execute("COMMIT")
+            return WorkItem(row[0], row[1], json.loads(row[2]), row[3] + 1)
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, item: WorkItem, worker_id: str) -> bool:
+        """Extend the lease; returns False if the lease was lost to another worker"""
+        now = time.time()
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE work_items SET lease_expires = ?, heartbeat_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (now + self.lease_seconds, now, now, item.id, LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, item: WorkItem, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Mark an item done; returns False if the lease had already been lost"""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE work_items SET status = ?, result = ?, error = NULL, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (DONE, json.dumps(result, ensure_ascii=False), time.time(), item.id, LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, item: WorkItem, worker_id: str, error: str) -> str:
+        """
+        Release a failed item: back to pending until max_attempts is reached,
+        then failed. Returns the new status.
+        """
+        status = FAILED if item.attempts >= self.max_attempts else PENDING
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE work_items SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (status, error, time.time(), item.id, LEASED, worker_id)
+            )
+        return status
+
+    def counts(self) -> Dict[str, int]:
+        with self._connection() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM work_items GROUP BY status").fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Results of completed items, in enqueue order"""
+        with self._connection() as conn:
+            rows = conn.execute("SELECT result FROM work_items WHERE status = ? ORDER BY id", (DONE,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+class Heartbeat:
+    """
+    Context manager that keeps an item's lease alive from a background thread
+    while the caller works on it.
+    """
+    def __init__(self, queue: WorkQueue, item: WorkItem, worker_id: str, interval: Optional[float] = None):
+        self.queue = queue
+        self.item = item
+        self.worker_id = worker_id
+        self.interval = interval or max(queue.lease_seconds / 3, 1)
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.item, self.worker_id):
+                    self.lost = True
+                    logger.warning("Lost lease", extra={"item": self.item.key, "worker": self.worker_id})
+                    return
+            except sqlite3.Error as e:
+                logger.warning(f"Heartbeat failed: {e}", extra={"item": self.item.key})
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,31 @@
+import os
+from typing import Any, Dict
+
+from kpop_shorts import http
+
+# Overridable so the commands can be pointed at a local stand-in API
+API_BASE_URL = os.getenv("YOUTUBE_API_BASE_URL", "https://www.googleapis.com/youtube/v3")
+
+# Quota cost per call, from https://developers.google.com/youtube/v3/determine_quota_cost
+QUOTA_COSTS = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "playlistItems": 1,
+    "commentThreads": 1
+}
+
+# Default API request rate
+REQUESTS_PER_SECOND = 2.0
+
+# Paces every API call of the process, whichever command or thread makes it;
+# commands set its rate from --requests-per-second
+LIMITER = http.RateLimiter(REQUESTS_PER_SECOND)
+
+def api_get(resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Call a YouTube Data API v3 list endpoint and return the decoded JSON body
+    """
+    response = http.get(f"{API_BASE_URL}/{resource}", params=params, endpoint=resource,
+                        quota_units=QUOTA_COSTS.get(resource, 1), limiter=LIMITER)
+    return response.json()
@@ -0,0 +1,25 @@
+import pytest
+
+from kpop_shorts.config import get_config
+from kpop_shorts.model import save_dataset
+from kpop_shorts.synthetic import Generator, Profile
+
+GROUPS = 40
+SHORTS_PER_GROUP = 15
+
+@pytest.fixture(scope="session")
+def generator() -> Generator:
+    """Seeded generator fitted to the sample datasets in data-processed/"""
+    config = get_config()
+    return Generator(Profile.fit(config.sample_shorts, config.sample_wiki), seed=7)
+
+@pytest.fixture
+def dataset(generator):
+    """A fresh copy of the same synthetic dataset for every test, free to modify"""
+    return generator.dataset(GROUPS, SHORTS_PER_GROUP)
+
+@pytest.fixture
+def dataset_path(dataset, tmp_path) -> str:
+    path = str(tmp_path / "shorts.json")
+    save_dataset(dataset, path)
+    return path
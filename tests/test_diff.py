@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from kpop_shorts.diff import diff_snapshots
+from kpop_shorts.model import Short, save_dataset
+from kpop_shorts.shortstore import build_store
+
+@pytest.fixture
+def snapshots(dataset, dataset_path, tmp_path):
+    """The dataset as an old snapshot, and a new one with known changes"""
+    groups = list(dataset.values())
+    removed = groups[0].shorts.pop(0)
+    added = Short("zzzzzzzzzz1", "brand new short", groups[1].name, "2025-03-01 12:00:00", 10, 1, 0, ["#new"])
+    groups[1].shorts.append(added)
+    grown = groups[2].shorts[0]
+    grown.views += 1000
+    renamed = groups[3].shorts[0]
+    renamed.title = "a different title"
+    retagged = groups[4].shorts[0]
+    retagged.hashtags = list(retagged.hashtags) + ["#extra"]
+    new_path = str(tmp_path / "new.json")
+    save_dataset(dataset, new_path)
+    return dataset_path, new_path, {"removed": removed, "added": added, "grown": grown,
+                                    "renamed": renamed, "retagged": retagged}
+
+def read_delta(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def check(summary, delta, changes):
+    assert (summary["added"], summary["removed"], summary["changed"]) == (1, 1, 3)
+    assert summary["views_delta_total"] == 1000
+    assert summary["renamed_titles"] == 1 and summary["hashtag_changes"] == 1
+    assert summary["top_view_gainers"][0]["video_id"] == changes["grown"].video_id
+    by_op = {}
+    for record in delta:
+        by_op.setdefault(record["op"], set()).add(record["video_id"])
+    assert by_op["added"] == {changes["added"].video_id}
+    assert by_op["removed"] == {changes["removed"].video_id}
+    assert by_op["changed"] == {changes[name].video_id for name in ("grown", "renamed", "retagged")}
+
+def test_diff_of_json_snapshots(snapshots, tmp_path):
+    old_path, new_path, changes = snapshots
+    delta_path = str(tmp_path / "delta.jsonl")
+    summary = diff_snapshots(old_path, new_path, delta_path)
+    check(summary, read_delta(delta_path), changes)
+    assert summary["unchanged"] == summary["new_videos"] - 4
+
+def test_diff_against_an_indexed_store_matches(snapshots, tmp_path):
+    old_path, new_path, changes = snapshots
+    delta_path = str(tmp_path / "delta.jsonl")
+    summary = diff_snapshots(build_store(old_path), new_path, delta_path)
+    check(summary, read_delta(delta_path), changes)
+
+def test_identical_snapshots_have_no_delta(dataset_path, tmp_path):
+    delta_path = str(tmp_path / "delta.jsonl")
+    summary = diff_snapshots(dataset_path, dataset_path, delta_path)
+    assert summary["added"] == summary["removed"] == summary["changed"] == 0
+    assert read_delta(delta_path) == []
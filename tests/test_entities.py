@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from kpop_shorts.entities import GROUP, EntityIndex, assign_group_ids, group_id, ngrams, phonetic_key
+
+GROUPS = 300
+
+@pytest.fixture(scope="module")
+def names(generator):
+    return generator.group_names(GROUPS)
+
+@pytest.fixture(scope="module")
+def index(generator, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("entities") / "kpop-group.csv")
+    generator.group_csv(GROUPS, path, extra=0)
+    return EntityIndex.from_csv(path)
+
+def typo(name: str, rng: random.Random) -> str:
+    position = rng.randrange(1, len(name) - 1)
+    return name[:position] + name[position + 1:]
+
+def test_exact_and_spelling_variants_resolve(index, names):
+    for name, korean in names:
+        assert index.resolve_id(name) == group_id(name)
+        assert index.resolve_id(f" {name.upper()} ") == group_id(name)
+        if korean:
+            assert index.resolve_id(korean) == group_id(name)
+
+def test_unknown_names_do_not_resolve(index):
+    assert index.resolve("zzqqxxvvww") is None
+    assert index.resolve("") is None
+
+def test_fuzzy_matches_are_rarely_wrong(index, names):
+    rng = random.Random(0)
+    queries = [(name, typo(name, rng)) for name, _ in names if len(name) >= 6]
+    results = [(name, index.resolve_id(query)) for name, query in queries]
+    right = sum(1 for name, match in results if match == group_id(name))
+    wrong = sum(1 for name, match in results if match not in (None, group_id(name)))
+    assert right >= 0.6 * len(queries)
+    assert wrong <= 0.02 * len(queries)
+
+def test_blocking_finds_every_alias_above_the_threshold(index, names):
+    """Scanning only the rarest trigram blocks must not lose a match that comparing with every alias finds"""
+    rng = random.Random(1)
+    for name, _ in rng.sample(names, 60):
+        query = typo(name, rng) if len(name) >= 4 else name
+        grams = ngrams(phonetic_key(query))
+        expected = set()
+        for entity_id, kind, alias_grams in index._aliases:
+            if kind == GROUP and 2 * len(grams & alias_grams) / (len(grams) + len(alias_grams)) >= index.min_score:
+                expected.add(entity_id)
+        found = {match.entity_id for match in index.candidates(query, limit=len(index))}
+        assert expected <= found
+
+def test_assign_group_ids_resolves_variant_keys(generator, index):
+    dataset = generator.dataset(60, 1, variant_rate=1.0)
+    expected = {key: group.group_id for key, group in dataset.items()}
+    for group in dataset.values():
+        group.group_id = ""
+    unresolved = assign_group_ids(dataset, index)
+    resolved = {key: group.group_id for key, group in dataset.items() if key not in unresolved}
+    assert len(resolved) >= 0.9 * len(dataset)
+    assert all(group_id == expected[key] for key, group_id in resolved.items())
@@ -0,0 +1,91 @@
+import json
+import os
+from collections import Counter
+
+import pytest
+
+from kpop_shorts.metrics import REGISTRY
+from kpop_shorts.model import save_dataset
+from kpop_shorts.query import Query, QueryError, ShortsIndex, normalize_hashtag
+from kpop_shorts.server import QueryService
+
+def brute_force(dataset, query: Query):
+    """Every short matching query, sorted like ShortsIndex.search (ties by dataset order)"""
+    matches = []
+    for name, group in dataset.items():
+        for short in group.shorts:
+            tags = {normalize_hashtag(tag) for tag in short.hashtags}
+            if query.group is not None and name != query.group:
+                continue
+            if query.channel_id is not None and group.channel_id != query.channel_id:
+                continue
+            if not set(query.hashtags) <= tags:
+                continue
+            if query.date_from and short.upload_time < query.date_from:
+                continue
+            if query.date_to and short.upload_time[:len(query.date_to)] > query.date_to:
+                continue
+            matches.append((len(matches), name, short))
+    matches.sort(key=lambda m: (getattr(m[2], query.sort), -m[0]), reverse=query.descending)
+    return [short.video_id for _, _, short in matches]
+
+def common_hashtag(dataset) -> str:
+    counts = Counter(tag.lower() for group in dataset.values() for short in group.shorts for tag in short.hashtags)
+    return counts.most_common(1)[0][0]
+
+def test_search_matches_brute_force(dataset):
+    index = ShortsIndex(dataset)
+    name, group = list(dataset.items())[3]
+    tag = common_hashtag(dataset)
+    queries = [
+        Query(limit=50),
+        Query(sort="upload_time", descending=False, offset=10, limit=25),
+        Query(group=name, sort="likes"),
+        Query(channel_id=group.channel_id, limit=100),
+        Query(hashtags=(tag,), sort="comments", limit=1000),
+        Query(hashtags=(tag,), date_from="2023-01-01", date_to="2024-06", limit=1000),
+        Query(group=name, hashtags=(tag,), descending=False),
+    ]
+    for query in queries:
+        expected = brute_force(dataset, query)
+        total, page = index.search(query)
+        assert total == len(expected)
+        assert [short.video_id for _, short in page] == expected[query.offset:query.offset + query.limit]
+
+def test_query_params_are_validated():
+    query = Query.from_params({"sort": ["likes"], "hashtag": ["KPop"], "limit": ["900"]}, max_limit=500)
+    assert (query.sort, query.descending, query.hashtags, query.limit) == ("likes", False, ("#kpop",), 500)
+    with pytest.raises(QueryError):
+        Query.from_params({"sort": ["title"]})
+    with pytest.raises(QueryError):
+        Query.from_params({"offset": ["-1"]})
+
+def test_cached_responses_are_dropped_on_reload(dataset, dataset_path):
+    service = QueryService({"shorts": dataset_path})
+    assert service.reload_changed()
+    hits = REGISTRY.counters.get("query_cache_hits", 0)
+
+    status, first = service.handle("/shorts", "sort=-views&limit=5")
+    assert status == 200
+    assert service.handle("/shorts", "limit=5&sort=-views") == (200, first)
+    assert REGISTRY.counters["query_cache_hits"] == hits + 1
+
+    top = list(dataset.values())[0].shorts[0]
+    top.views = 10 ** 12
+    save_dataset(dataset, dataset_path)
+    stat = os.stat(dataset_path)
+    os.utime(dataset_path, (stat.st_atime, stat.st_mtime + 10))
+    assert service.reload_changed()
+    status, body = service.handle("/shorts", "sort=-views&limit=5")
+    assert json.loads(body)["items"][0]["video_id"] == top.video_id
+    service.stop()
+
+def test_single_short_lookup(dataset, dataset_path):
+    service = QueryService({"shorts": dataset_path})
+    service.reload_changed()
+    short = list(dataset.values())[1].shorts[2]
+    status, body = service.handle("/short", f"video_id={short.video_id}")
+    assert status == 200 and json.loads(body)["title"] == short.title
+    assert service.handle("/short", "video_id=missing")[0] == 404
+    assert service.handle("/short", "")[0] == 400
+    service.stop()
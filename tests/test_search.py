@@ -0,0 +1,86 @@
+import pytest
+
+from kpop_shorts.model import save_dataset
+from kpop_shorts.search import SearchIndex, decode_postings, encode_postings, tokenize, update_index
+
+@pytest.fixture
+def index_dir(dataset_path, tmp_path) -> str:
+    directory = str(tmp_path / "index")
+    update_index(directory, [dataset_path])
+    return directory
+
+def search(directory, query, **kwargs):
+    index = SearchIndex(directory)
+    try:
+        return [doc for _, doc in index.search(query, **kwargs)]
+    finally:
+        index.close()
+
+def test_tokenize_splits_hangul_into_bigrams():
+    assert tokenize("사랑해 Love-Dive") == ["사랑", "랑해", "love", "dive"]
+
+def test_postings_round_trip():
+    postings = [(0, 1), (3, 2), (130, 1), (70000, 300)]
+    assert decode_postings(encode_postings(postings)) == postings
+
+def test_unique_title_ranks_first(dataset, dataset_path, tmp_path):
+    name, group = list(dataset.items())[5]
+    target = group.shorts[3]
+    target.title = "zebracorn moonwalk challenge"
+    save_dataset(dataset, dataset_path)
+    directory = str(tmp_path / "index")
+    update_index(directory, [dataset_path])
+
+    results = search(directory, "zebracorn moonwalk")
+    assert results[0]["id"] == f"short:{target.video_id}"
+    assert results[0]["group"] == name
+    assert len(results) == 1
+    assert search(directory, "zebracorn", kind="wiki") == []
+
+def test_more_matching_terms_rank_higher(dataset, dataset_path, tmp_path):
+    shorts = list(dataset.values())[0].shorts
+    shorts[0].title = "quokka"
+    shorts[1].title = "quokka wombat"
+    save_dataset(dataset, dataset_path)
+    directory = str(tmp_path / "index")
+    update_index(directory, [dataset_path])
+    ranked = [doc["id"] for doc in search(directory, "quokka wombat")]
+    assert ranked[:2] == [f"short:{shorts[1].video_id}", f"short:{shorts[0].video_id}"]
+
+def test_changed_moved_and_removed_shorts_are_reindexed(dataset, dataset_path, index_dir):
+    groups = list(dataset.values())
+    retitled = groups[0].shorts[0]
+    retitled.title = "platypus encore"
+    moved = groups[1].shorts.pop(0)
+    groups[2].shorts.append(moved)
+    removed = groups[3].shorts.pop(0)
+    save_dataset(dataset, dataset_path)
+
+    assert update_index(index_dir, [dataset_path], prune=True) == 2
+    assert [doc["id"] for doc in search(index_dir, "platypus encore")] == [f"short:{retitled.video_id}"]
+    index = SearchIndex(index_dir)
+    try:
+        live = index.live_docs()
+        assert index.docs[live[f"short:{moved.video_id}"]]["group"] == groups[2].name
+        assert f"short:{removed.video_id}" not in live
+        assert len(live) == sum(group.shorts_count for group in groups)
+    finally:
+        index.close()
+
+def test_unchanged_update_adds_nothing(dataset_path, index_dir):
+    assert update_index(index_dir, [dataset_path]) == 0
+
+def test_merge_keeps_results(dataset, dataset_path, index_dir):
+    shorts = list(dataset.values())[0].shorts
+    shorts[0].title = "axolotl"
+    save_dataset(dataset, dataset_path)
+    update_index(index_dir, [dataset_path])
+    before = [doc["id"] for doc in search(index_dir, "axolotl")]
+
+    index = SearchIndex(index_dir)
+    try:
+        index.merge()
+        assert len(index.segments) == 1 and not index.deleted
+    finally:
+        index.close()
+    assert [doc["id"] for doc in search(index_dir, "axolotl")] == before == [f"short:{shorts[0].video_id}"]
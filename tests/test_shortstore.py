@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from kpop_shorts.model import Group
+from kpop_shorts.shortstore import ShortStore, append_dataset, compact_store, index_path, read_store, update_stats, write_store
+
+@pytest.fixture
+def store_path(dataset, tmp_path) -> str:
+    path = str(tmp_path / "shorts.jsonl")
+    write_store(dataset, path)
+    return path
+
+def all_shorts(dataset):
+    return {short.video_id: (name, short) for name, group in dataset.items() for short in group.shorts}
+
+def test_get_finds_every_short(dataset, store_path):
+    expected = all_shorts(dataset)
+    with ShortStore(store_path) as store:
+        assert len(store) == len(expected)
+        for video_id, (name, short) in expected.items():
+            group, found = store.get(video_id)
+            assert group == name
+            assert found.to_dict() == short.to_dict()
+        assert store.get("not-a-video") is None
+
+def test_appended_versions_replace_older_lines(dataset, store_path):
+    name, group = next(iter(dataset.items()))
+    changed = group.shorts[0]
+    changed.views += 5
+    append_dataset(store_path, {name: Group(name, group.korean_name, group.channel_id, group.channel_url, [changed])})
+    assert update_stats(store_path, {group.shorts[1].video_id: {"likes": 12345}}) == 1
+
+    with ShortStore(store_path) as store:
+        assert len(store) == len(all_shorts(dataset))
+        assert store.get(changed.video_id)[1].views == changed.views
+        assert store.get(group.shorts[1].video_id)[1].likes == 12345
+
+def test_lines_appended_after_the_index_are_found(dataset, store_path):
+    name, group = next(iter(dataset.items()))
+    with open(index_path(store_path), "rb") as f:
+        stale_index = f.read()
+    changed = group.shorts[0]
+    changed.title = "retitled"
+    append_dataset(store_path, {name: group})
+    # As if the appending writer died before rewriting the index
+    with open(index_path(store_path), "wb") as f:
+        f.write(stale_index)
+
+    with ShortStore(store_path) as store:
+        assert store.get(changed.video_id)[1].title == "retitled"
+        assert len(store) == len(all_shorts(dataset))
+
+def test_partial_last_line_is_dropped_before_appending(dataset, store_path):
+    with open(store_path, "ab") as f:
+        f.write(b'{"group": "x", "video_id": "cut-off')
+    name, group = next(iter(dataset.items()))
+    append_dataset(store_path, {name: group})
+    with ShortStore(store_path) as store:
+        assert len(store) == len(all_shorts(dataset))
+    assert set(all_shorts(read_store(store_path))) == set(all_shorts(dataset))
+
+def test_compact_keeps_only_the_latest_lines(dataset, store_path):
+    for _ in range(3):
+        append_dataset(store_path, dataset)
+    before = os.path.getsize(store_path)
+    saved = compact_store(store_path)
+    assert saved > 0 and os.path.getsize(store_path) == before - saved
+
+    compacted = read_store(store_path)
+    assert list(compacted) == list(dataset)
+    assert {video_id: short.to_dict() for video_id, (_, short) in all_shorts(compacted).items()} == \
+           {video_id: short.to_dict() for video_id, (_, short) in all_shorts(dataset).items()}
+    with ShortStore(store_path) as store:
+        assert len(store) == len(all_shorts(dataset))
@@ -1,20 +1,11 @@
-from pytubefix import YouTube
-from pytubefix.cli import on_progress
+"""
+Same as `kpop-shorts download`; kept so `python utils/yt-downloader.py` keeps working.
+"""
 import os
+import sys
 
-def download_video(url, output_path):
-    try:
-        yt = YouTube(url, on_progress_callback=on_progress)
-        print(f"Downloading: {yt.title}")
-        ys = yt.streams.get_highest_resolution()
-        downloaded_path = ys.download(output_path=output_path)
-        print(f"Video downloaded to: {downloaded_path}")
-        return downloaded_path
-    except Exception as e:
-        print(f"Error downloading video: {e}")
-        return None
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kpop_shorts.cli import main
 
 if __name__ == "__main__":
-    url = input("Enter the YouTube URL: ")
-    download_video(url, "videos")
-    
\ No newline at end of file
+    main(["download", *sys.argv[1:]])